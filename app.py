@@ -1,17 +1,319 @@
 # Inicio para usar Flask y manejar sesiones
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+import hashlib
+import inspect
+import json
+import os
+import time
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g, make_response
 from functools import wraps  # Para crear decoradores
+from markupsafe import Markup
 from src.viewmodel.auth_viewmodel import UsuarioAuthViewModel 
 from src.services.firebase_global import firebase_global  # Asegurarse de que este objeto ya tenga db inicializado
 from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
 from src.viewmodel.grupos_viewmodel import GruposViewModel
 from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.perfil_viewmodel import PerfilViewModel
+from src.services.barrido_eventos import BarredorEventos
+from src.services.busqueda import IndiceBusqueda
+from src.services.directorio_nombres import DirectorioNombres
+from src.services.fragmentos import CacheFragmentos
+from src.services.metricas import MetricasFirebase, RegistroMetricas, prefijo_ruta
+from src.services.limitador import LimiteConcurrencia, LimitadorTasa, regla_desde_entorno
+from src.services.lecturas_redundantes import DetectorLecturas
+from src.services.unidad_trabajo import UnidadDeTrabajo
+from src.services.versiones import leer_versiones, versiones_grupos_async
+from src.utils.estaticos import registrar_estaticos
+from src.model.grupo import CATEGORIAS
 
-usuario_vm = UsuarioViewModel()  # Inicializamos el ViewModel para manejar usuarios
-auth_vm = UsuarioAuthViewModel()
-grupos_vm = GruposViewModel()
 app = Flask(__name__)
 app.secret_key = "supersecretkey"  # Necesario para manejar sesiones
+# CSS e imágenes con huella (static/dist/, generado con construir_estaticos.py) y caché de un año
+registrar_estaticos(app)
+
+# El directorio de nombres guarda su mapa entre requests, por eso es uno solo para toda la app
+directorio_nombres = DirectorioNombres(firebase_global)
+# Índice de búsqueda de grupos; se actualiza solo con las escrituras de firebase_global
+indice_grupos = IndiceBusqueda(firebase_global)
+# Perfiles ya armados en memoria; se invalidan solos con las escrituras que los afectan
+perfiles_vm = PerfilViewModel(firebase_global, ttl=float(os.getenv("PERFIL_TTL", "300") or 300))
+# HTML de tarjetas de grupo y filas de evento ya renderizado, por versión de los datos y rol
+fragmentos = CacheFragmentos(ttl=float(os.getenv("FRAGMENTOS_TTL", "600") or 600))
+
+
+# =============================
+# Métricas (se exponen en /metrics)
+# =============================
+# Un solo registro para todos los hilos del proceso
+metricas = RegistroMetricas()
+metricas.describir("http_solicitudes_segundos", "histogram", "Latencia de los requests por endpoint, método y código.")
+metricas.describir("http_solicitudes_en_curso", "gauge", "Requests que se están atendiendo en este momento.")
+# Cada llamada a Firebase: latencia por operación y prefijo de ruta. Los bytes leídos o escritos
+# cuestan serializar cada valor, así que solo se miden con METRICAS_BYTES=1
+firebase_global.observar_llamadas(MetricasFirebase(metricas), medir_bytes=os.getenv("METRICAS_BYTES") == "1")
+
+
+# Se registra antes que la admisión: los requests rechazados con 429/503 también se miden
+@app.before_request
+def medir_inicio():
+    g.inicio_request = time.perf_counter()
+    metricas.incrementar("http_solicitudes_en_curso")
+
+
+@app.after_request
+def medir_codigo(respuesta):
+    g.codigo_respuesta = respuesta.status_code
+    return respuesta
+
+
+@app.teardown_request
+def medir_fin(error=None):
+    inicio = g.pop("inicio_request", None)
+    if inicio is None:
+        return
+    metricas.incrementar("http_solicitudes_en_curso", valor=-1)
+    metricas.observar("http_solicitudes_segundos", time.perf_counter() - inicio, {
+        "endpoint": request.endpoint or "sin_ruta",
+        "metodo": request.method,
+        "codigo": str(g.get("codigo_respuesta", 500)),
+    })
+
+
+# =============================
+# Detector de lecturas redundantes (desarrollo / canary)
+# =============================
+# DETECTAR_LECTURAS=1 registra las llamadas a Firebase de cada request y deja en el log
+# (logger 'lecturas_redundantes', una línea JSON por aviso) las lecturas repetidas, las
+# ráfagas N+1 y los requests que superan su presupuesto. En canary, DETECTAR_LECTURAS=0.05
+# vigila solo ese porcentaje de los requests.
+_muestreo_detector = float(os.getenv("DETECTAR_LECTURAS", "0") or 0)
+detector_lecturas = DetectorLecturas(
+    umbral_hermanas=int(os.getenv("DETECTOR_UMBRAL_HERMANAS", "5") or 5), muestreo=_muestreo_detector,
+) if _muestreo_detector > 0 else None
+if detector_lecturas:
+    firebase_global.observar_llamadas(detector_lecturas)
+
+# Presupuesto de llamadas al backend por endpoint; los que no están usan PRESUPUESTO_LLAMADAS.
+# /eventos y /perfil leen una ruta por grupo del usuario, por eso tienen más margen.
+PRESUPUESTOS_LLAMADAS = {
+    "clubes": 6,
+    "grupo_detalle": 8,
+    "eventos": 25,
+    "perfil": 15,
+}
+_presupuesto_por_defecto = int(os.getenv("PRESUPUESTO_LLAMADAS", "20") or 0) or None
+
+
+@app.before_request
+def vigilar_lecturas():
+    if detector_lecturas and request.endpoint not in ("static", "metrics"):
+        presupuesto = PRESUPUESTOS_LLAMADAS.get(request.endpoint, _presupuesto_por_defecto)
+        g.vigilancia_lecturas = detector_lecturas.iniciar(
+            f"{request.method} {request.endpoint or request.path}", presupuesto)
+
+
+@app.teardown_request
+def reportar_lecturas(error=None):
+    vigilancia = g.pop("vigilancia_lecturas", None)
+    if vigilancia:
+        detector_lecturas.terminar(*vigilancia)
+
+
+# =============================
+# Control de admisión
+# =============================
+# Límite de tasa por cubetas de tokens, por IP y por correo de la sesión.
+# Reglas configurables como "capacidad/segundos" (LIMITE_AUTH=10/60); "0" desactiva la regla.
+REGLAS_LIMITE = {
+    "auth": regla_desde_entorno("LIMITE_AUTH", "10/60"),
+    "escritura": regla_desde_entorno("LIMITE_ESCRITURA", "30/60"),
+}
+# Endpoint -> regla. Solo se limitan los POST (mostrar el formulario no cuesta lecturas)
+LIMITES_POR_RUTA = {
+    "registro_usuario": "auth",
+    "inicio_sesion": "auth",
+    "crear_club": "escritura",
+    "unirme_club": "escritura",
+    "crear_evento": "escritura",
+}
+limitador_tasa = LimitadorTasa()
+
+# Tope de requests atendidos a la vez: lo que no cabe se rechaza con 503 antes de llegar a Firebase
+_concurrencia_maxima = int(os.getenv("CONCURRENCIA_MAXIMA", "50") or 0)
+limite_concurrencia = LimiteConcurrencia(
+    _concurrencia_maxima, espera=float(os.getenv("CONCURRENCIA_ESPERA_MS", "100") or 0) / 1000,
+) if _concurrencia_maxima > 0 else None
+
+
+@app.before_request
+def admitir_request():
+    if request.endpoint in ("static", "metrics"):
+        return None
+
+    if limite_concurrencia is not None:
+        if not limite_concurrencia.entrar():
+            return "El servidor está ocupado, intenta de nuevo en un momento.", 503, {"Retry-After": "1"}
+        g.admitido = True
+
+    nombre_regla = LIMITES_POR_RUTA.get(request.endpoint)
+    regla = REGLAS_LIMITE.get(nombre_regla)
+    if regla and request.method == "POST":
+        claves = [f"ip:{request.remote_addr}"]
+        correo = correo_actual()
+        if correo:
+            claves.append(f"correo:{correo}")
+        permitido, reintentar_en = limitador_tasa.permitir(nombre_regla, claves, *regla)
+        if not permitido:
+            return ("Demasiadas solicitudes, intenta de nuevo más tarde.", 429,
+                    {"Retry-After": str(reintentar_en)})
+    return None
+
+
+@app.teardown_request
+def liberar_admision(error=None):
+    if g.pop("admitido", False):
+        limite_concurrencia.salir()
+
+
+# =============================
+# Unidad de trabajo por request
+# =============================
+# Cada request usa su propia UnidadDeTrabajo: una ruta se lee una sola vez aunque la pidan
+# varios ViewModels, y todas las escrituras salen juntas en una actualización multi-ruta.
+@app.before_request
+def abrir_unidad_trabajo():
+    g.unidad_trabajo = UnidadDeTrabajo(firebase_global)
+
+
+@app.after_request
+def confirmar_unidad_trabajo(respuesta):
+    # Respaldo para lo que una ruta no confirmó con confirmar_cambios(): se confirma antes
+    # de enviar la respuesta, así la siguiente página ya ve los cambios
+    unidad = g.pop("unidad_trabajo", None)
+    if unidad is None or respuesta.status_code >= 500:
+        return respuesta
+    try:
+        unidad.confirmar()
+    except Exception:
+        # Sin esto el usuario vería el mensaje de éxito de la ruta seguido de un 500
+        app.logger.exception("No se pudieron guardar los cambios de %s", request.path)
+        mensaje = "No se pudieron guardar los cambios. Intenta de nuevo."
+        if respuesta.is_json:
+            return app.make_response(({"success": False, "mensaje": mensaje}, 503))
+        flash(mensaje, "danger")
+        return redirect(request.referrer or url_for("index"))
+    return respuesta
+
+
+@app.teardown_request
+def cerrar_unidad_trabajo(error=None):
+    # Si el request falló antes de after_request, lo pendiente se descarta
+    unidad = g.pop("unidad_trabajo", None)
+    if unidad is not None:
+        unidad.descartar()
+
+
+def servicio_actual():
+    """Servicio de datos del request en curso (o el global fuera de un request)."""
+    return g.get("unidad_trabajo") or firebase_global
+
+
+def confirmar_cambios():
+    """
+    Envía ya las escrituras pendientes del request. Las rutas que escriben lo llaman dentro
+    de su try, antes del mensaje de éxito, para que un fallo de Firebase caiga en su except.
+    """
+    unidad = g.get("unidad_trabajo")
+    if unidad is not None:
+        unidad.confirmar()
+
+
+# =============================
+# GET condicional (ETag)
+# =============================
+# Cambia en cada arranque: un despliegue con plantillas nuevas no devuelve 304 con HTML viejo
+VERSION_APP = os.getenv("VERSION_APP") or str(time.time_ns())
+
+
+def etag_pagina(*versiones):
+    """ETag de una página: sellos de versión de sus datos + quién la ve + la URL pedida."""
+    base = json.dumps([VERSION_APP, request.full_path, correo_actual(), *versiones], default=str)
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+def no_modificado(etag):
+    """
+    Respuesta 304 si el navegador ya tiene esta versión de la página, sin leer datos ni
+    renderizar. Si hay mensajes flash pendientes se renderiza igual para mostrarlos.
+    """
+    if session.get("_flashes") or not request.if_none_match.contains(etag):
+        return None
+    respuesta = app.response_class(status=304)
+    respuesta.set_etag(etag)
+    return respuesta
+
+
+def con_etag(html, etag):
+    respuesta = make_response(html)
+    respuesta.set_etag(etag)
+    # El navegador puede guardar la página, pero debe revalidarla siempre con If-None-Match
+    respuesta.headers["Cache-Control"] = "private, no-cache"
+    return respuesta
+
+
+# =============================
+# Fragmentos en caché
+# =============================
+@app.template_global()
+def tarjeta_grupo(grupo, rol, seccion, version=None):
+    # La tarjeta solo depende del resumen del grupo (su sello de versión), del rol de quien mira
+    # (organizador, miembro o externo, según su índice de membresías) y de la sección de la página
+    plantilla = app.jinja_env.get_template("fragmentos/tarjeta_grupo.html")
+    return Markup(fragmentos.obtener(
+        f"grupo-{seccion}", grupo.get("id_grupo"), rol, version,
+        lambda: plantilla.render(g=grupo, rol=rol, seccion=seccion),
+    ))
+
+
+@app.template_global()
+def fila_evento(evento, version=None):
+    # La fila es igual para todos los usuarios: no depende del rol. Crear o borrar un evento
+    # y renombrar el grupo cambian el sello del grupo, que es la versión de la fila
+    plantilla = app.jinja_env.get_template("fragmentos/fila_evento.html")
+    return Markup(fragmentos.obtener(
+        "evento", evento.get("id"), "todos", version,
+        lambda: plantilla.render(e=evento),
+    ))
+
+
+def usuario_vm():
+    return UsuarioViewModel(servicio_actual())
+
+
+def auth_vm():
+    return UsuarioAuthViewModel(servicio_actual())
+
+
+def grupos_vm():
+    return GruposViewModel(servicio_actual(), directorio_nombres, indice_grupos)
+
+
+def eventos_vm():
+    return EventosViewModel(servicio_actual(), directorio_nombres)
+
+
+# Grupos por página en /clubes
+TAMANO_PAGINA_CLUBES = int(os.getenv("TAMANO_PAGINA_CLUBES", "12") or 12)
+# Máximo de resultados de una búsqueda en /clubes?q=
+LIMITE_BUSQUEDA_CLUBES = 30
+
+# Barrido de eventos vencidos en segundo plano (BARRIDO_EVENTOS_SEGUNDOS > 0 lo activa).
+# También puede ejecutarse aparte con: python mantenimiento.py barrer-eventos --intervalo 300
+barredor_eventos = BarredorEventos(
+    EventosViewModel(firebase_global),
+    intervalo=float(os.getenv("BARRIDO_EVENTOS_SEGUNDOS", "0") or 0),
+)
+if barredor_eventos.intervalo > 0:
+    barredor_eventos.iniciar()
 
 # =============================
 # Función común para iniciar sesión en Flask
@@ -39,6 +341,16 @@ def login_requerido(f):
     Verifica si el usuario tiene sesión activa.
     Si no, lo redirige a la página de inicio de sesión.
     """
+    # Las vistas async (que esperan varias lecturas a la vez) necesitan un decorador async
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def decorador_async(*args, **kwargs):
+            if "usuario" not in session:
+                flash("Debes iniciar sesión para acceder a esta página", "warning")
+                return redirect(url_for("inicio_sesion"))
+            return await f(*args, **kwargs)
+        return decorador_async
+
     @wraps(f)
     def decorador(*args, **kwargs):
         if "usuario" not in session:
@@ -71,8 +383,13 @@ def registro_usuario():
         password = request.form["password"]
         carrera = request.form["carrera"]
 
-        resultado = auth_vm.registrar_usuario(nombre, correo, password, carrera)
+        resultado = auth_vm().registrar_usuario(nombre, correo, password, carrera)
         if resultado["success"]:
+            try:
+                confirmar_cambios()
+            except Exception as e:
+                flash(f"No se pudo completar el registro: {e}", "danger")
+                return render_template("registrarse.html")
             # Inicia sesión automáticamente
             iniciar_sesion_flask(resultado["usuario"])
             flash(f"Registro exitoso. Bienvenido {resultado['usuario']['nombre_completo']}!", "success")
@@ -90,7 +407,7 @@ def inicio_sesion():
     if request.method == "POST":
         correo = request.form["correo"]
         password = request.form["password"]
-        resultado = auth_vm.iniciar_sesion(correo, password)
+        resultado = auth_vm().iniciar_sesion(correo, password)
 
         if resultado["success"]:
             # Usamos la función común para iniciar sesión
@@ -127,19 +444,24 @@ def cerrar_sesion():
 
 @app.route("/perfil", methods=["GET", "POST"])
 @login_requerido
-def perfil():
+async def perfil():
     correo = session["usuario"]["correo"]
 
     if request.method == "POST":
         data = request.get_json()
         # Actualizamos usuario usando exactamente los argumentos que acepta el ViewModel
-        resultado = usuario_vm.actualizar_usuario(
+        resultado = usuario_vm().actualizar_usuario(
             correo,
             nombre_completo=data.get("nombre_completo"),
             password=data.get("password"),  # coincide con el ViewModel
             carrera=data.get("carrera"),
             descripcion_personal=data.get("descripcion_personal")  # coincide con el ViewModel
         )
+        if resultado["success"]:
+            try:
+                confirmar_cambios()
+            except Exception as e:
+                resultado = {"success": False, "error": f"No se pudo guardar el perfil: {e}"}
 
         if resultado["success"]:
             # Actualizamos la sesión para reflejar cambios
@@ -157,19 +479,18 @@ def perfil():
             "mensaje": "Perfil actualizado con exito" if resultado["success"] else (resultado.get("error") or "No se pudo actualizar el perfil.")
         }
 
-    # GET → mostrar perfil
-    usuario_obj = usuario_vm.obtener_usuario(correo)
-    if not usuario_obj:
+    # GET → mostrar perfil (vista en memoria; solo se lee de Firebase si algo cambió)
+    perfil_data = await perfiles_vm.obtener_perfil_async(correo)
+    if not perfil_data:
         flash("No se encontraron datos del usuario en Firebase.", "danger")
         return redirect(url_for("index"))
 
-    grupos_usuario = usuario_vm.consultar_grupos_usuario(correo)
     usuario_data = {
         "correo": correo,
-        "nombre_completo": usuario_obj.nombre_completo,
-        "carrera": usuario_obj.carrera,
-        "bio": getattr(usuario_obj, "descripcion_personal", ""),  # usar el atributo correcto
-        "grupos": grupos_usuario  # lista de dict con 'id_grupo' y 'nombre'
+        "nombre_completo": perfil_data["nombre_completo"],
+        "carrera": perfil_data["carrera"],
+        "bio": perfil_data.get("descripcion_personal") or "",
+        "grupos": perfil_data["grupos"]  # lista de dict con 'id_grupo' y 'nombre'
     }
 
     return render_template("perfil.html", usuario=usuario_data)
@@ -181,7 +502,8 @@ def eliminar_perfil():
     correo = session["usuario"]["correo"]
 
     try:
-        resultado = usuario_vm.eliminar_usuario(correo)
+        resultado = usuario_vm().eliminar_usuario(correo)
+        confirmar_cambios()
         session.pop("usuario", None)  # eliminar sesión
         flash("Usuario eliminado correctamente.", "success")
         return redirect(url_for("index"))
@@ -196,15 +518,55 @@ def eliminar_perfil():
 # ========================================================
 @app.route("/clubes")
 @login_requerido
-def clubes():
+async def clubes():
+    # Paginación por cursor (?cursor=<id_grupo>) y filtro por categoría (?categoria=...)
+    categoria = request.args.get("categoria") or None
+    if categoria not in CATEGORIAS:
+        categoria = None
+    cursor = request.args.get("cursor") or None
+    etag = etag_pagina(*leer_versiones(servicio_actual(), "catalogo"))
+    respuesta = no_modificado(etag)
+    if respuesta:
+        return respuesta
+    # Búsqueda por texto (?q=...): resultados por relevancia desde el índice, sin paginar
+    q = (request.args.get("q") or "").strip()
+    correo = correo_actual()
+
     try:
-        grupos_vm = GruposViewModel(firebase_global)
-        grupos = grupos_vm.listar_grupos() or []
+        vm = grupos_vm()
+        if q:
+            # El sello de búsqueda solo cambia con los campos indexados (ver IndiceBusqueda)
+            version_busqueda, = leer_versiones(servicio_actual(), "busqueda")
+            pagina = {"grupos": vm.buscar_grupos(q, categoria, LIMITE_BUSQUEDA_CLUBES, version_busqueda),
+                      "siguiente": None}
+        else:
+            pagina = vm.listar_grupos_pagina(categoria, cursor, TAMANO_PAGINA_CLUBES)
+        # "Mis grupos" y el rol en cada grupo salen del índice de membresías ({id_grupo: rol}),
+        # no de las listas de integrantes de la página
+        roles = vm.ids_grupos_de_usuario(correo) if correo else {}
+        mis_grupos = [g.resumen() for g in await vm.grupos_de_usuario_async(correo, roles)] if correo else []
+        # Sellos de los grupos que se muestran: son la versión de sus tarjetas en caché
+        versiones = await versiones_grupos_async(
+            vm.service_async, [g["id_grupo"] for g in pagina["grupos"] + mis_grupos])
     except Exception as e:
-        grupos = []
+        pagina = {"grupos": [], "siguiente": None}
+        mis_grupos = []
+        roles = versiones = {}
         flash_clubes(f"Error cargando clubes: {e}", "danger")
 
-    return render_template("clubes.html", grupos=grupos, correo=correo_actual())
+    return con_etag(render_template(
+        "clubes.html",
+        grupos=pagina["grupos"],
+        mis_grupos=mis_grupos,
+        roles=roles,
+        versiones=versiones,
+        siguiente=pagina["siguiente"],
+        cursor=cursor,
+        categoria=categoria,
+        categorias=CATEGORIAS,
+        q=q,
+        correo=correo,
+    ), etag)
 
 def correo_actual():
     # Prioriza la sesión “usuario” real; mantiene compatibilidad con el fallback existente
@@ -218,7 +580,13 @@ def correo_actual():
 @login_requerido
 def salirse_grupo(id_grupo):
     correo = session["usuario"]["correo"]
-    resultado = usuario_vm.salirse_de_grupo(correo, id_grupo)
+    resultado = usuario_vm().salirse_de_grupo(correo, id_grupo)
+    if resultado["success"]:
+        try:
+            confirmar_cambios()
+        except Exception:
+            app.logger.exception("No se pudo salir del grupo %s", id_grupo)
+            return {"success": False}
     return {"success": resultado["success"]}
 
 
@@ -232,11 +600,10 @@ def crear_club():
     categoria = (request.form.get("categoria") or "").strip()
     orgs_raw = (request.form.get("organizadores") or "").strip()
 
-    categorias_validas = {"Tecnología", "Ciencia", "Cultura", "Deportes"}
     if not nombre:
         flash_clubes("El nombre del grupo es obligatorio.", "warning")
         return redirect(url_for("clubes"))
-    if categoria not in categorias_validas:
+    if categoria not in CATEGORIAS:
         flash_clubes("Categoría inválida.", "warning")
         return redirect(url_for("clubes"))
 
@@ -248,7 +615,7 @@ def crear_club():
         organizadores.insert(0, creador)
 
     try:
-        vm = GruposViewModel(firebase_global)
+        vm = grupos_vm()
         # crear_grupo devuelve dict con id_grupo
         nuevo = vm.crear_grupo(
             nombre=nombre,
@@ -259,6 +626,7 @@ def crear_club():
         # Añadir también al creador como integrante (si no lo está)
         if creador:
             vm.agregar_integrante(nuevo["id_grupo"], creador)
+        confirmar_cambios()
 
         flash_clubes("Grupo creado.", "success")
     except Exception as e:
@@ -277,8 +645,9 @@ def unirme_club(id_grupo):
         return redirect(url_for("inicio_sesion"))
 
     try:
-        grupos_vm = GruposViewModel(firebase_global)
-        ok = grupos_vm.agregar_integrante(id_grupo, correo)
+        vm = grupos_vm()
+        ok = vm.agregar_integrante(id_grupo, correo)
+        confirmar_cambios()
         flash_clubes("Te uniste al grupo." if ok else "Ya perteneces o no fue posible unirte.", "success" if ok else "warning")
     except Exception as e:
         flash_clubes(f"No se pudo procesar la solicitud: {e}", "danger")
@@ -298,14 +667,14 @@ def salirme_club(id_grupo):
 
 
     try:
-        grupos_vm = GruposViewModel(firebase_global)
+        vm = grupos_vm()
         # Intentar usar remover_integrante si existe en el VM
-        if hasattr(grupos_vm, "remover_integrante"):
-            ok = grupos_vm.remover_integrante(id_grupo, correo)
-            # TODO: reglas de negocio si es último organizador
+        if hasattr(vm, "remover_integrante"):
+            ok = vm.remover_integrante(id_grupo, correo)
+            # False también si es el último organizador (el grupo no puede quedar sin organizadores)
         else:
             # Fallback: remover usando el modelo Grupo
-            grupo_obj = grupos_vm.obtener_grupo(id_grupo)
+            grupo_obj = vm.obtener_grupo(id_grupo)
             if not grupo_obj:
                 flash_clubes("Grupo no encontrado.", "warning")
                 return redirect(url_for("clubes"))
@@ -315,10 +684,11 @@ def salirme_club(id_grupo):
             if correo in integrantes:
                 integrantes.remove(correo)
                 dto["integrantes"] = integrantes
-                firebase_global.guardar_datos(f"grupos/{id_grupo}", dto)
+                servicio_actual().guardar_datos(f"grupos/{id_grupo}", dto)
                 ok = True
             else:
                 ok = False
+        confirmar_cambios()
 
         if ok:
             flash_clubes("Saliste del grupo.", "success")
@@ -336,7 +706,7 @@ def salirme_club(id_grupo):
 def eliminar_club(id_grupo):
     user = correo_actual()
     try:
-        vm = GruposViewModel(firebase_global)
+        vm = grupos_vm()
         grupo = vm.obtener_grupo(id_grupo)
         if not grupo:
             flash_clubes("Grupo no encontrado.", "warning")
@@ -349,6 +719,7 @@ def eliminar_club(id_grupo):
             return redirect(url_for("clubes"))
 
         res = vm.eliminar_grupo(id_grupo)  # usa tu VM
+        confirmar_cambios()
         if res.get("success"):
             flash_clubes(f"Grupo eliminado.", "success")
         else:
@@ -364,7 +735,7 @@ def eliminar_club(id_grupo):
 def expulsar_miembro(id_grupo, correo_miembro):
     user = correo_actual()
     try:
-        vm = GruposViewModel(firebase_global)
+        vm = grupos_vm()
         grupo = vm.obtener_grupo(id_grupo)
         if not grupo:
             flash_clubes("Grupo no encontrado.", "warning")
@@ -381,6 +752,7 @@ def expulsar_miembro(id_grupo, correo_miembro):
             return redirect(url_for("grupo_detalle", id_grupo=id_grupo))
 
         ok = vm.remover_integrante(id_grupo, correo_miembro)
+        confirmar_cambios()
         flash_clubes("Integrante expulsado." if ok else "No fue posible expulsar.", "success" if ok else "warning")
     except Exception as e:
         flash_clubes(f"Error al expulsar: {e}", "danger")
@@ -390,24 +762,37 @@ def expulsar_miembro(id_grupo, correo_miembro):
 # ---------- DETALLES ----------
 @app.route("/grupos/<id_grupo>", methods=["GET"])
 @login_requerido
-def grupo_detalle(id_grupo):
+async def grupo_detalle(id_grupo):
+    # La página depende del grupo (y sus eventos) y de los nombres de los integrantes
+    version_grupo, version_nombres = leer_versiones(servicio_actual(), f"grupos/{id_grupo}", "nombres")
+    etag = etag_pagina(version_grupo, version_nombres)
+    respuesta = no_modificado(etag)
+    if respuesta:
+        return respuesta
     try:
-        grupos_vm = GruposViewModel(firebase_global)
-        grupo = grupos_vm.obtener_grupo(id_grupo)
-        if not grupo:
+        # Grupo, próximos eventos y nombres de integrantes se leen en paralelo; los nombres
+        # en caché se validan con el mismo sello del ETag
+        detalle = await grupos_vm().obtener_detalle_async(id_grupo, version_nombres)
+        if not detalle:
             flash("Grupo no encontrado.", "warning")
             return redirect(url_for("clubes"))
     except Exception as e:
         flash(f"Error al cargar grupo: {e}", "danger")
         return redirect(url_for("clubes"))
-    return render_template("grupo_detalle.html", grupo=grupo.to_dict(), correo=correo_actual())
+    return con_etag(render_template(
+        "grupo_detalle.html",
+        grupo=detalle["grupo"].to_dict(),
+        eventos=detalle["eventos"],
+        nombres=detalle["nombres"],
+        correo=correo_actual(),
+    ), etag)
 
 # ---------- CLUBES (editar grupo: nombre/descripcion) ----------
 @app.post("/grupos/<id_grupo>/editar")
 @login_requerido
 def editar_grupo(id_grupo):
     correo = correo_actual()
-    vm = GruposViewModel()
+    vm = grupos_vm()
 
     grupo = vm.obtener_grupo(id_grupo)
     if not grupo:
@@ -424,6 +809,7 @@ def editar_grupo(id_grupo):
 
     try:
         ok = vm.actualizar_grupo(id_grupo, nombre if nombre else None, descripcion if descripcion else None)
+        confirmar_cambios()
         flash_clubes("Grupo actualizado." if ok else "No hubo cambios.", "success" if ok else "info")
     except Exception as e:
         flash_clubes(f"No se pudo actualizar el grupo: {e}", "danger")
@@ -436,11 +822,18 @@ def editar_grupo(id_grupo):
 # Página que muestra eventos agregados de TODOS los grupos del usuario (menu /eventos)
 @app.route("/eventos")
 @login_requerido
-def eventos():
+async def eventos():
     correo = correo_actual()
-    eventos_vm = EventosViewModel(firebase_global)
-    eventos_agg = eventos_vm.obtener_eventos_por_usuario(correo)
-    return render_template("eventos.html", eventos=eventos_agg, grupo=None, correo=correo)
+    # Los eventos vencen con el tiempo: la versión incluye el minuto actual
+    etag = etag_pagina(*leer_versiones(servicio_actual(), "catalogo"), int(time.time() // 60))
+    respuesta = no_modificado(etag)
+    if respuesta:
+        return respuesta
+    vm = eventos_vm()
+    eventos_agg = await vm.obtener_eventos_por_usuario_async(correo)
+    versiones = await versiones_grupos_async(vm.service_async, [e.get("grupo_id") for e in eventos_agg])
+    return con_etag(render_template("eventos.html", eventos=eventos_agg, versiones=versiones,
+                                    grupo=None, correo=correo), etag)
 
 
 # Ver eventos de UN grupo específico (desde "Ver eventos" en detalle de grupo)
@@ -450,9 +843,9 @@ def eventos():
 @app.route("/clubes/<id_grupo>/crear_evento", methods=["GET", "POST"])
 @login_requerido
 def crear_evento(id_grupo):
-    grupos_vm = GruposViewModel(firebase_global)
-    eventos_vm = EventosViewModel(firebase_global)
-    grupo = grupos_vm.obtener_grupo(id_grupo)
+    vm = grupos_vm()
+    evm = eventos_vm()
+    grupo = vm.obtener_grupo(id_grupo)
     correo = correo_actual()
 
     if not grupo:
@@ -470,13 +863,14 @@ def crear_evento(id_grupo):
         descripcion = request.form.get("descripcion")
 
         try:
-            resultado = eventos_vm.crear_evento(
+            resultado = evm.crear_evento(
                 id_grupo=id_grupo,
                 fecha=fecha,
                 hora=hora,
                 descripcion=descripcion,
                 creado_por_email=correo
             )
+            confirmar_cambios()
             if resultado["success"]:
                 flash("Evento creado con éxito", "success")
             else:
@@ -500,13 +894,13 @@ def ver_eventos():
     # Si se pasa ?grupo_id=... mostramos solo ese grupo
     filtro_grupo = request.args.get("grupo_id")
     if filtro_grupo:
-        eventos = grupos_vm.obtener_eventos_por_grupo(filtro_grupo)
+        eventos = grupos_vm().obtener_eventos_por_grupo(filtro_grupo)
         # añadir meta del grupo (nombre)
-        grupo = grupos_vm.obtener_grupo(filtro_grupo)
+        grupo = grupos_vm().obtener_grupo(filtro_grupo)
         grupo_nombre = grupo.nombre if grupo else filtro_grupo
         return render_template("eventos.html", eventos=eventos, grupo_id=filtro_grupo, grupo_nombre=grupo_nombre, correo=correo)
     else:
-        eventos = grupos_vm.obtener_eventos_por_usuario(correo)
+        eventos = grupos_vm().obtener_eventos_por_usuario(correo)
         return render_template("eventos.html", eventos=eventos, grupo_id=None, grupo_nombre=None, correo=correo)
 
 # ------------------------------------------------------------------
@@ -516,6 +910,57 @@ def ver_eventos():
 def ver_eventos_grupo(id_grupo):
     return redirect(url_for("ver_eventos", grupo_id=id_grupo))
 
+# ------------------------------------------------------------------
+# RUTA: métricas en formato de texto de Prometheus
+# ------------------------------------------------------------------
+def recolectar_estado():
+    # Contadores que ya llevan otros componentes; se leen al momento de exponer
+    limites = limitador_tasa.estadisticas()
+    solicitudes = [({"regla": regla, "resultado": "permitida"}, n) for regla, n in limites["permitidas"].items()]
+    solicitudes += [({"regla": regla, "resultado": "rechazada"}, n) for regla, n in limites["rechazadas"].items()]
+    familias = [("limitador_solicitudes_total", "counter", "Solicitudes evaluadas por el límite de tasa.", solicitudes)]
+
+    if limite_concurrencia is not None:
+        c = limite_concurrencia.estadisticas()
+        familias += [
+            ("concurrencia_activas", "gauge", "Requests admitidos en curso.", [({}, c["activas"])]),
+            ("concurrencia_pico", "gauge", "Máximo de requests simultáneos observado.", [({}, c["pico"])]),
+            ("concurrencia_rechazadas_total", "counter", "Requests rechazados con 503 por falta de cupo.",
+             [({}, c["rechazadas"])]),
+        ]
+
+    caches = {"perfiles": perfiles_vm.cache, "fragmentos": fragmentos.cache}
+    if firebase_global.cache is not None:
+        caches["lecturas"] = firebase_global.cache
+    estadisticas = {nombre: cache.estadisticas() for nombre, cache in caches.items()}
+    for campo in ("aciertos", "fallos", "expulsiones", "invalidaciones"):
+        familias.append((f"cache_{campo}_total", "counter", f"Total de {campo} de cada caché en memoria.",
+                         [({"cache": nombre}, e[campo]) for nombre, e in estadisticas.items()]))
+    familias.append(("cache_bytes", "gauge", "Bytes estimados ocupados por cada caché.",
+                     [({"cache": nombre}, e["bytes"]) for nombre, e in estadisticas.items()]))
+
+    transacciones = {}
+    for ruta, contadores in firebase_global.estadisticas_transacciones().items():
+        for resultado, n in contadores.items():
+            clave = (prefijo_ruta(ruta), resultado)
+            transacciones[clave] = transacciones.get(clave, 0) + n
+    familias.append(("firebase_transacciones_total", "counter", "Intentos, conflictos y confirmaciones de transacciones.",
+                     [({"prefijo": p, "resultado": r}, n) for (p, r), n in sorted(transacciones.items())]))
+    return familias
+
+
+metricas.agregar_recolector(recolectar_estado)
+
+
+@app.route("/metrics")
+def metrics():
+    # Con METRICAS_TOKEN definido se exige "Authorization: Bearer <token>"
+    token = os.getenv("METRICAS_TOKEN")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return "No autorizado", 401
+    return metricas.texto(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
 # ========================================================
 # Ejecutar servidor
 # ========================================================
@@ -0,0 +1,77 @@
+# benchmarks/datos_sinteticos.py
+# Genera una base de datos sintética con el mismo formato que guarda la app.
+# Se carga en BackendMemoria con backend.cargar(datos) para medir sin Firebase.
+
+import random
+
+from src.model.evento import Evento
+from src.model.grupo import CATEGORIAS, Grupo
+from src.utils.claves import clave_correo
+
+# Tamaños predefinidos (--escala en suite.py)
+ESCALAS = {
+    "pequena": {"grupos": 100, "usuarios": 1000, "eventos": 5000},
+    "mediana": {"grupos": 2000, "usuarios": 20000, "eventos": 100000},
+    "grande": {"grupos": 20000, "usuarios": 200000, "eventos": 1000000},
+}
+
+
+def correo_usuario(i):
+    return f"usuario{i}@unal.edu.co"
+
+
+def generar(grupos, usuarios, eventos, integrantes_por_grupo=30, semilla=1):
+    """
+    Devuelve el árbol completo {usuarios, nombres, grupos, membresias, eventos}.
+    Cada grupo tiene un organizador y hasta 'integrantes_por_grupo' integrantes al azar;
+    los eventos se reparten entre los grupos con fechas futuras.
+    """
+    azar = random.Random(semilla)
+    datos = {"usuarios": {}, "nombres": {}, "grupos": {}, "membresias": {}, "eventos": {}}
+
+    for i in range(usuarios):
+        correo = correo_usuario(i)
+        clave = clave_correo(correo)
+        datos["usuarios"][clave] = {
+            "id_usuario": str(i),
+            "nombre_completo": f"Usuario {i}",
+            "correo": correo,
+            "contraseña": "12345678",
+            "carrera": "Ingeniería de Sistemas",
+            "grupos": [],
+            "descripcion_personal": "",
+        }
+        datos["nombres"][clave] = f"Usuario {i}"
+
+    for i in range(grupos):
+        organizador = correo_usuario(azar.randrange(usuarios))
+        cantidad = min(usuarios, azar.randint(1, integrantes_por_grupo))
+        integrantes = [organizador] + [correo_usuario(j) for j in azar.sample(range(usuarios), cantidad)]
+        grupo = Grupo(
+            nombre=f"Grupo {i}",
+            descripcion=f"Grupo de estudio número {i} sobre {CATEGORIAS[i % len(CATEGORIAS)].lower()}",
+            categoria=CATEGORIAS[i % len(CATEGORIAS)],
+            organizadores=[organizador],
+            integrantes=integrantes,
+            id_grupo=f"grupo_{i}",
+        )
+        datos["grupos"][grupo.id_grupo] = grupo.to_firebase()
+        for correo in grupo.integrantes:
+            rol = "organizador" if grupo.es_organizador(correo) else "miembro"
+            datos["membresias"].setdefault(clave_correo(correo), {})[grupo.id_grupo] = rol
+
+    for i in range(eventos if grupos else 0):
+        id_grupo = f"grupo_{azar.randrange(grupos)}"
+        creador = correo_usuario(azar.randrange(usuarios))
+        evento = Evento(
+            fecha=f"20{azar.randint(30, 40)}-{azar.randint(1, 12):02d}-{azar.randint(1, 28):02d}",
+            hora=f"{azar.randint(7, 20):02d}:00",
+            descripcion=f"Evento {i}",
+            creado_por_email=creador,
+            creado_por_nombre=datos["nombres"][clave_correo(creador)],
+            id_evento=f"evento_{i}",
+            creado_en_iso="2025-01-01T00:00:00",
+        )
+        datos["eventos"].setdefault(id_grupo, {})[evento.id] = evento.to_dict()
+
+    return datos
@@ -0,0 +1,130 @@
+# benchmarks/memoria_modelos.py
+# Memoria que ocupa materializar muchos grupos como objetos del modelo y listarlos.
+# Uso: python benchmarks/memoria_modelos.py [--grupos 10000]
+#
+# Cada escenario corre en un proceso aparte para que el pico de RSS (ru_maxrss) sea solo suyo:
+# - antes:          clase con __dict__ y listas decodificadas en from_dict (el modelo anterior).
+# - slots:          Grupo.from_dict con __slots__; las listas quedan sin decodificar.
+# - slots_listas:   igual, pero leyendo integrantes/organizadores de cada grupo.
+# - listado_antes:  el listado del catálogo como era: Grupo.from_dict(d).to_dict() (copia las listas).
+# - listado:        el listado actual: Grupo.from_dict(d).resumen() (sin listas, solo su tamaño).
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model.grupo import Grupo  # noqa: E402
+
+
+class GrupoConDict:
+    # Réplica del modelo anterior: atributos en __dict__ y listas armadas al construir
+    def __init__(self, nombre, descripcion, categoria, organizadores, integrantes=None, id_grupo=None, eventos=None):
+        self.id_grupo = id_grupo if id_grupo else nombre.replace(" ", "_").lower()
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.categoria = categoria
+        self.organizadores = organizadores if isinstance(organizadores, list) else [organizadores]
+        self.integrantes = integrantes if integrantes else self.organizadores.copy()
+        self.eventos = eventos if eventos else []
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            nombre=d.get("nombre"),
+            descripcion=d.get("descripcion"),
+            categoria=d.get("categoria"),
+            organizadores=d.get("organizadores", []),
+            integrantes=d.get("integrantes", []),
+            id_grupo=d.get("id_grupo"),
+            eventos=d.get("eventos", []),
+        )
+
+
+def grupos_sinteticos(cantidad):
+    categorias = ("Tecnología", "Ciencia", "Cultura", "Deportes")
+    return [
+        {
+            "id_grupo": f"grupo_{i}",
+            "nombre": f"Grupo {i}",
+            "descripcion": f"Descripción del grupo {i} " * 3,
+            "categoria": categorias[i % len(categorias)],
+            "organizadores": [f"org{i}@unal.edu.co"],
+            "integrantes": [f"org{i}@unal.edu.co"] + [f"est{i}_{j}@unal.edu.co" for j in range(i % 20)],
+        }
+        for i in range(cantidad)
+    ]
+
+
+def _slots_con_listas(datos):
+    grupos = [Grupo.from_dict(d) for d in datos]
+    for g in grupos:
+        g.integrantes, g.organizadores
+    return grupos
+
+
+ESCENARIOS = {
+    "antes": lambda datos: [GrupoConDict.from_dict(d) for d in datos],
+    "slots": lambda datos: [Grupo.from_dict(d) for d in datos],
+    "slots_listas": _slots_con_listas,
+    "listado_antes": lambda datos: [Grupo.from_dict(d).to_dict() for d in datos],
+    "listado": lambda datos: [Grupo.from_dict(d).resumen() for d in datos],
+}
+
+
+def _rss_pico_kb():
+    # En Linux ru_maxrss viene en KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def medir(escenario, cantidad):
+    datos = grupos_sinteticos(cantidad)
+    rss_inicial = _rss_pico_kb()
+    objetos = ESCENARIOS[escenario](datos)
+    rss_final = _rss_pico_kb()
+    del objetos
+
+    # Segunda pasada con tracemalloc: bytes asignados solo por los objetos
+    tracemalloc.start()
+    objetos = ESCENARIOS[escenario](datos)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "escenario": escenario,
+        "grupos": cantidad,
+        "rss_pico_kb": rss_final,
+        "rss_aumento_kb": rss_final - rss_inicial,
+        "objetos_kb": round(pico / 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de los modelos con y sin __slots__.")
+    parser.add_argument("--grupos", type=int, default=10000)
+    parser.add_argument("--escenario", choices=sorted(ESCENARIOS), help="Solo un escenario (uso interno).")
+    args = parser.parse_args()
+
+    if args.escenario:
+        print(json.dumps(medir(args.escenario, args.grupos)))
+        return
+
+    resultados = []
+    for escenario in ESCENARIOS:
+        salida = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--escenario", escenario, "--grupos", str(args.grupos)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        resultados.append(json.loads(salida))
+
+    print(f"{'escenario':<15}{'RSS pico (KB)':>15}{'aumento RSS (KB)':>18}{'objetos (KB)':>14}")
+    for r in resultados:
+        print(f"{r['escenario']:<15}{r['rss_pico_kb']:>15}{r['rss_aumento_kb']:>18}{r['objetos_kb']:>14}")
+
+
+if __name__ == "__main__":
+    main()
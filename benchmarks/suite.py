@@ -0,0 +1,184 @@
+# benchmarks/suite.py
+# Mide ViewModels y rutas de Flask sobre una base sintética en memoria y guarda el resultado en JSON.
+# Uso:
+#   python benchmarks/suite.py --escala pequena --salida resultados.json
+#   python benchmarks/suite.py --grupos 5000 --usuarios 50000 --eventos 200000
+#   python benchmarks/suite.py --escala pequena --comparar base.json   (muestra la diferencia con otra corrida)
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# La app debe importarse con el backend en memoria y sin control de admisión
+os.environ["BACKEND_DATOS"] = "memoria"
+os.environ["LIMITE_AUTH"] = "0"
+os.environ["LIMITE_ESCRITURA"] = "0"
+os.environ["CONCURRENCIA_MAXIMA"] = "0"
+
+from datos_sinteticos import ESCALAS, correo_usuario, generar  # noqa: E402
+from src.services.backend_memoria import BackendMemoria  # noqa: E402
+from src.services.firebase import FirebaseService  # noqa: E402
+from src.viewmodel.eventos_viewmodel import EventosViewModel  # noqa: E402
+from src.viewmodel.grupos_viewmodel import GruposViewModel  # noqa: E402
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel  # noqa: E402
+
+
+def medir(nombre, funcion, repeticiones, backend):
+    """Ejecuta funcion(i) 'repeticiones' veces; devuelve tiempos (ms) y round-trips por llamada."""
+    tiempos = []
+    backend.reiniciar_contadores()
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(i)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return {
+        "nombre": nombre,
+        "repeticiones": repeticiones,
+        "min_ms": round(tiempos[0], 3),
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "p95_ms": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        "media_ms": round(statistics.fmean(tiempos), 3),
+        "llamadas_backend": round(backend.total_llamadas() / repeticiones, 2),
+    }
+
+
+def usuarios_con_grupos(datos, cantidad):
+    # Correos (en orden estable) de usuarios que pertenecen al menos a un grupo
+    claves = sorted(datos["membresias"], key=lambda c: int(c.split("_at_")[0].removeprefix("usuario")))
+    return [datos["usuarios"][c]["correo"] for c in claves[:cantidad]]
+
+
+def benchmarks_viewmodels(datos, repeticiones, latencia):
+    backend = BackendMemoria(latencia=latencia)
+    backend.cargar(datos)
+    service = FirebaseService(backend)
+    grupos_vm = GruposViewModel(service)
+    usuario_vm = UsuarioViewModel(service)
+    eventos_vm = EventosViewModel(service)
+    correos = usuarios_con_grupos(datos, repeticiones * 2)
+    # Los de eliminar_usuario son distintos de los usados en las lecturas
+    lectores, eliminados = correos[:repeticiones], correos[repeticiones:]
+
+    resultados = [
+        medir("listar_grupos", lambda i: grupos_vm.listar_grupos(), repeticiones, backend),
+        medir("listar_grupos_pagina", lambda i: grupos_vm.listar_grupos_pagina(), repeticiones, backend),
+        medir("consultar_grupos_usuario",
+              lambda i: usuario_vm.consultar_grupos_usuario(lectores[i % len(lectores)]), repeticiones, backend),
+        medir("obtener_eventos_por_usuario",
+              lambda i: eventos_vm.obtener_eventos_por_usuario(lectores[i % len(lectores)]), repeticiones, backend),
+    ]
+    if eliminados:
+        resultados.append(medir("eliminar_usuario", lambda i: usuario_vm.eliminar_usuario(eliminados[i]),
+                                min(repeticiones, len(eliminados)), backend))
+    return resultados
+
+
+def benchmarks_rutas(datos, repeticiones, latencia):
+    import app as aplicacion
+
+    backend = aplicacion.firebase_global.backend
+    backend.latencia = latencia
+    backend.cargar(datos)
+    cliente = aplicacion.app.test_client()
+    correo = usuarios_con_grupos(datos, 1)[0] if datos["membresias"] else correo_usuario(0)
+    with cliente.session_transaction() as sesion:
+        sesion["usuario"] = {"correo": correo, "nombre": "Benchmark", "carrera": "X"}
+    id_grupo = next(iter(datos["grupos"]), "grupo_0")
+
+    def pedir(ruta):
+        def funcion(i):
+            respuesta = cliente.get(ruta)
+            if respuesta.status_code != 200:
+                raise RuntimeError(f"GET {ruta} respondió {respuesta.status_code}")
+        return funcion
+
+    rutas = ["/clubes", "/clubes?categoria=Cultura", "/clubes?q=grupo estudio", f"/grupos/{id_grupo}", "/eventos", "/perfil"]
+    return [medir(f"GET {ruta}", pedir(ruta), repeticiones, backend) for ruta in rutas]
+
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(actual, anterior):
+    # Razón de medianas actual/anterior por benchmark (> 1 es más lento)
+    previos = {r["nombre"]: r for r in anterior["resultados"]}
+    print(f"\n{'benchmark':<36}{'antes (ms)':>12}{'ahora (ms)':>12}{'razón':>8}")
+    for r in actual["resultados"]:
+        previo = previos.get(r["nombre"])
+        if not previo:
+            continue
+        razon = r["mediana_ms"] / previo["mediana_ms"] if previo["mediana_ms"] else float("inf")
+        print(f"{r['nombre']:<36}{previo['mediana_ms']:>12.3f}{r['mediana_ms']:>12.3f}{razon:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de ViewModels y rutas sobre datos sintéticos.")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="pequena")
+    parser.add_argument("--grupos", type=int, help="Reemplaza la cantidad de grupos de la escala.")
+    parser.add_argument("--usuarios", type=int, help="Reemplaza la cantidad de usuarios de la escala.")
+    parser.add_argument("--eventos", type=int, help="Reemplaza la cantidad de eventos de la escala.")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latencia simulada por llamada al backend.")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--solo", choices=("viewmodels", "rutas"), help="Ejecuta solo un grupo de benchmarks.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para comparar medianas.")
+    args = parser.parse_args()
+
+    parametros = dict(ESCALAS[args.escala])
+    for campo in ("grupos", "usuarios", "eventos"):
+        if getattr(args, campo) is not None:
+            parametros[campo] = getattr(args, campo)
+
+    inicio = time.perf_counter()
+    datos = generar(**parametros, semilla=args.semilla)
+    generacion_s = time.perf_counter() - inicio
+    latencia = args.latencia_ms / 1000
+
+    resultados = []
+    if args.solo in (None, "viewmodels"):
+        resultados += benchmarks_viewmodels(datos, args.repeticiones, latencia)
+    if args.solo in (None, "rutas"):
+        resultados += benchmarks_rutas(datos, args.repeticiones, latencia)
+
+    informe = {
+        "commit": commit_actual(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "escala": args.escala,
+        "parametros": {**parametros, "repeticiones": args.repeticiones, "latencia_ms": args.latencia_ms,
+                       "semilla": args.semilla},
+        "generacion_datos_s": round(generacion_s, 3),
+        "resultados": resultados,
+    }
+
+    print(f"{'benchmark':<36}{'mediana (ms)':>14}{'p95 (ms)':>12}{'llamadas':>10}")
+    for r in resultados:
+        print(f"{r['nombre']:<36}{r['mediana_ms']:>14.3f}{r['p95_ms']:>12.3f}{r['llamadas_backend']:>10}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            comparar(informe, json.load(archivo))
+
+
+if __name__ == "__main__":
+    main()
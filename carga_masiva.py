@@ -0,0 +1,145 @@
+# carga_masiva.py
+# Importa y exporta usuarios, grupos y eventos en bloque desde la terminal.
+# Uso:
+#   python carga_masiva.py importar usuarios estudiantes.csv
+#   python carga_masiva.py importar grupos clubes.jsonl --lote 200
+#   python carga_masiva.py exportar eventos --salida eventos.jsonl
+#
+# Columnas (CSV con encabezado, o un objeto JSON por línea con las mismas claves):
+#   usuarios: nombre_completo, correo, contraseña, carrera[, descripcion_personal]
+#   grupos:   nombre, descripcion, categoria, organizadores[, integrantes]  (correos separados por ';' en CSV)
+#   eventos:  grupo, fecha (YYYY-MM-DD), hora (HH:MM), descripcion, creado_por_email
+# Lo que produce 'exportar' se puede volver a importar.
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from src.services.firebase_global import firebase_global
+from src.viewmodel.carga_masiva_viewmodel import TIPOS, CargaMasivaViewModel
+
+# Rechazos que se muestran en pantalla; el resto solo se cuenta (o va a --rechazos)
+MAX_RECHAZOS_EN_PANTALLA = 20
+
+
+def leer_registros(ruta):
+    """Genera (numero_linea, registro) leyendo el archivo de a una línea (CSV o JSONL según la extensión)."""
+    with open(ruta, encoding="utf-8-sig", newline="") as archivo:
+        if ruta.lower().endswith(".csv"):
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+        else:
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    yield numero, json.loads(linea)
+                except json.JSONDecodeError as error:
+                    # Queda entre los rechazos en lugar de cortar la carga
+                    yield numero, {"_error": f"JSON inválido: {error.msg}"}
+
+
+def leer_punto_control(ruta, entrada, tipo):
+    # Registros ya confirmados de una corrida anterior con el mismo archivo y tipo
+    if not os.path.exists(ruta):
+        return 0
+    with open(ruta, encoding="utf-8") as archivo:
+        punto = json.load(archivo)
+    if punto.get("entrada") != os.path.abspath(entrada) or punto.get("tipo") != tipo:
+        return 0
+    return int(punto.get("procesados", 0))
+
+
+def guardar_punto_control(ruta, entrada, tipo, procesados):
+    # Se escribe a un temporal y se reemplaza: un corte a mitad no deja el archivo roto
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({"entrada": os.path.abspath(entrada), "tipo": tipo, "procesados": procesados}, archivo)
+    os.replace(temporal, ruta)
+
+
+def importar(args):
+    punto_control = args.punto_control or f"{args.archivo}.{args.tipo}.checkpoint.json"
+    ya_procesados = 0 if args.desde_cero else leer_punto_control(punto_control, args.archivo, args.tipo)
+    if ya_procesados:
+        print(f"Retomando después de {ya_procesados} registros ({punto_control}).")
+
+    registros = leer_registros(args.archivo)
+    for _ in range(ya_procesados):
+        next(registros, None)
+
+    def al_confirmar(procesados, resumen):
+        guardar_punto_control(punto_control, args.archivo, args.tipo, ya_procesados + procesados)
+        print(f"\r{args.tipo}: {ya_procesados + procesados} procesados, {resumen['escritos']} escritos, "
+              f"{resumen['omitidos']} ya existían, {len(resumen['rechazados'])} rechazados",
+              end="", file=sys.stderr, flush=True)
+
+    resultado = CargaMasivaViewModel(firebase_global).importar(args.tipo, registros, args.lote, al_confirmar)
+    print(file=sys.stderr)
+    if not resultado['success']:
+        print(resultado['error'])
+        return
+
+    rechazados = sorted(resultado['rechazados'])
+    for linea, error in rechazados[:MAX_RECHAZOS_EN_PANTALLA]:
+        print(f"  línea {linea}: {error}")
+    if len(rechazados) > MAX_RECHAZOS_EN_PANTALLA:
+        print(f"  ... y {len(rechazados) - MAX_RECHAZOS_EN_PANTALLA} rechazos más.")
+    if args.rechazos and rechazados:
+        with open(args.rechazos, "w", encoding="utf-8") as archivo:
+            for linea, error in rechazados:
+                archivo.write(json.dumps({"linea": linea, "error": error}, ensure_ascii=False) + "\n")
+        print(f"Rechazos guardados en {args.rechazos}")
+
+    # Terminó completo: la próxima corrida empieza de nuevo
+    if os.path.exists(punto_control):
+        os.remove(punto_control)
+    print(f"Importación terminada: {resultado['escritos']} {args.tipo} escritos, "
+          f"{resultado['omitidos']} ya existían, {len(rechazados)} rechazados.")
+
+
+def exportar(args):
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    total = 0
+    try:
+        for registro in CargaMasivaViewModel(firebase_global).exportar(args.tipo, args.lote):
+            salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            total += 1
+    finally:
+        if args.salida:
+            salida.close()
+    print(f"{total} {args.tipo} exportados.", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importación y exportación masiva de la base de datos.")
+    subparsers = parser.add_subparsers(dest="accion", required=True)
+
+    carga = subparsers.add_parser("importar", help="Carga un archivo CSV o JSONL por lotes.")
+    carga.add_argument("tipo", choices=TIPOS)
+    carga.add_argument("archivo", help="Archivo .csv (con encabezado) o .jsonl.")
+    carga.add_argument("--lote", type=int, default=500,
+                       help="Registros por escritura multi-ruta.")
+    carga.add_argument("--punto-control",
+                       help="Archivo del punto de control (por defecto <archivo>.<tipo>.checkpoint.json).")
+    carga.add_argument("--desde-cero", action="store_true",
+                       help="Ignora el punto de control y empieza desde el primer registro.")
+    carga.add_argument("--rechazos", help="Archivo JSONL donde guardar todos los registros rechazados.")
+    carga.set_defaults(funcion=importar)
+
+    descarga = subparsers.add_parser("exportar", help="Escribe los registros en JSONL sin cargar toda la base.")
+    descarga.add_argument("tipo", choices=TIPOS)
+    descarga.add_argument("--salida", help="Archivo .jsonl (por defecto la salida estándar).")
+    descarga.add_argument("--lote", type=int, default=500,
+                          help="Claves leídas por consulta.")
+    descarga.set_defaults(funcion=exportar)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
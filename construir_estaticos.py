@@ -0,0 +1,26 @@
+# construir_estaticos.py
+# Genera static/dist/ con los CSS e imágenes renombrados por su huella y comprimidos (.gz, .br).
+# Uso: python construir_estaticos.py   (correrlo antes de desplegar, cada vez que cambie static/)
+
+import argparse
+import os
+
+from src.utils import estaticos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye los archivos estáticos con huella.")
+    parser.add_argument("--origen", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"),
+                        help="Carpeta de archivos estáticos (por defecto static/).")
+    args = parser.parse_args()
+
+    manifiesto = estaticos.construir(args.origen)
+    for original, con_huella in sorted(manifiesto.items()):
+        print(f"{original} -> {con_huella}")
+    if estaticos.brotli is None:
+        print("Aviso: el paquete 'brotli' no está instalado; solo se generaron variantes .gz.")
+    print(f"Archivos procesados: {len(manifiesto)}.")
+
+
+if __name__ == "__main__":
+    main()
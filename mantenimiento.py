@@ -0,0 +1,121 @@
+# mantenimiento.py
+# Tareas de mantenimiento de datos que se ejecutan una vez desde la terminal.
+# Uso: python mantenimiento.py <tarea>   (python mantenimiento.py --help para ver la lista)
+
+import argparse
+
+from src.services.barrido_eventos import BarredorEventos
+from src.services.firebase_global import firebase_global
+from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+
+def reconstruir_membresias(args):
+    """Recalcula el índice membresias/{correo_key}/{id_grupo} a partir de los grupos."""
+    total = GruposViewModel(firebase_global).reconstruir_indice_membresias()
+    print(f"Índice de membresías reconstruido: {total} membresías.")
+
+
+def reconstruir_nombres(args):
+    """Recalcula el directorio nombres/{correo_key} a partir de los usuarios."""
+    total = UsuarioViewModel(firebase_global).reconstruir_directorio_nombres()
+    print(f"Directorio de nombres reconstruido: {total} usuarios.")
+
+
+def migrar_eventos(args):
+    """Mueve los eventos embebidos en grupos/{id}/eventos a eventos/{id}/{id_evento}."""
+    total = EventosViewModel(firebase_global).migrar_eventos_embebidos()
+    print(f"Eventos migrados: {total}.")
+
+
+def completar_marcas_tiempo(args):
+    """Calcula 'marca_tiempo' para los eventos guardados antes de que existiera el campo."""
+    total = EventosViewModel(firebase_global).completar_marcas_tiempo(args.lote)
+    print(f"Eventos actualizados con marca de tiempo: {total}.")
+
+
+def completar_categoria_clave(args):
+    """Agrega 'categoria_clave' a los grupos antiguos (necesario para paginar por categoría)."""
+    total = GruposViewModel(firebase_global).completar_categoria_clave(args.lote)
+    print(f"Grupos actualizados con categoria_clave: {total}.")
+
+
+def migrar_integrantes(args):
+    """Convierte las listas integrantes/organizadores de los grupos antiguos en mapas {correo_key: correo}."""
+    total = GruposViewModel(firebase_global).migrar_integrantes_a_mapas(args.lote)
+    print(f"Grupos migrados al formato de mapa: {total}.")
+
+
+def barrer_eventos(args):
+    """Borra los eventos vencidos una vez, o cada --intervalo segundos si se indica."""
+    barredor = BarredorEventos(EventosViewModel(firebase_global), args.intervalo, args.lote)
+    if not args.intervalo:
+        print(f"Eventos vencidos eliminados: {barredor.barrer_una_vez()}.")
+        return
+    print(f"Barriendo eventos vencidos cada {args.intervalo} segundos (Ctrl+C para salir)...")
+    try:
+        barredor.ejecutar()
+    except KeyboardInterrupt:
+        barredor.detener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tareas de mantenimiento de la base de datos.")
+    subparsers = parser.add_subparsers(dest="tarea", required=True)
+
+    subparsers.add_parser(
+        "reconstruir-membresias",
+        help="Reconstruye el índice inverso de membresías.",
+    ).set_defaults(funcion=reconstruir_membresias)
+
+    subparsers.add_parser(
+        "reconstruir-nombres",
+        help="Reconstruye el directorio de nombres para mostrar.",
+    ).set_defaults(funcion=reconstruir_nombres)
+
+    subparsers.add_parser(
+        "migrar-eventos",
+        help="Mueve los eventos embebidos en los grupos a sus propios nodos.",
+    ).set_defaults(funcion=migrar_eventos)
+
+    marcas = subparsers.add_parser(
+        "completar-marcas-tiempo",
+        help="Agrega la marca de tiempo numérica a los eventos antiguos.",
+    )
+    marcas.add_argument("--lote", type=int, default=500,
+                        help="Máximo de eventos actualizados por escritura.")
+    marcas.set_defaults(funcion=completar_marcas_tiempo)
+
+    categorias = subparsers.add_parser(
+        "completar-categoria-clave",
+        help="Agrega el campo de orden por categoría a los grupos antiguos.",
+    )
+    categorias.add_argument("--lote", type=int, default=500,
+                            help="Máximo de grupos actualizados por escritura.")
+    categorias.set_defaults(funcion=completar_categoria_clave)
+
+    integrantes = subparsers.add_parser(
+        "migrar-integrantes",
+        help="Guarda integrantes y organizadores como mapas por correo en lugar de listas.",
+    )
+    integrantes.add_argument("--lote", type=int, default=500,
+                             help="Máximo de grupos migrados por escritura.")
+    integrantes.set_defaults(funcion=migrar_integrantes)
+
+    barrido = subparsers.add_parser(
+        "barrer-eventos",
+        help="Elimina los eventos cuya fecha ya pasó.",
+    )
+    barrido.add_argument("--intervalo", type=float, default=0,
+                         help="Segundos entre barridos; 0 ejecuta un solo barrido.")
+    barrido.add_argument("--lote", type=int, default=500,
+                         help="Máximo de eventos borrados por actualización.")
+    barrido.set_defaults(funcion=barrer_eventos)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
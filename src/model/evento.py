@@ -4,7 +4,10 @@ from datetime import datetime
 class Evento:
     """Modelo simple de Evento"""
 
-    def __init__(self, fecha, hora, descripcion, creado_por_email, creado_por_nombre=None, id_evento=None, creado_en_iso=None):
+    # Sin __dict__ por instancia: menos memoria al listar muchos eventos
+    __slots__ = ("id", "fecha", "hora", "descripcion", "creado_por_email", "creado_por_nombre", "creado_en_iso", "marca_tiempo")
+
+    def __init__(self, fecha, hora, descripcion, creado_por_email, creado_por_nombre=None, id_evento=None, creado_en_iso=None, marca_tiempo=None):
         self.id = id_evento if id_evento else str(uuid.uuid4())
         self.fecha = fecha
         self.hora = hora
@@ -12,6 +15,27 @@ class Evento:
         self.creado_por_email = creado_por_email
         self.creado_por_nombre = creado_por_nombre
         self.creado_en_iso = creado_en_iso if creado_en_iso else datetime.utcnow().isoformat()
+        # Fecha y hora del evento en segundos epoch: ordenar y vencer eventos es comparar enteros
+        self.marca_tiempo = marca_tiempo if marca_tiempo is not None else self.calcular_marca_tiempo(fecha, hora)
+
+    @staticmethod
+    def calcular_marca_tiempo(fecha, hora=None):
+        """Convierte fecha ('YYYY-MM-DD') y hora ('HH:MM') a segundos epoch; None si no se puede."""
+        if not fecha:
+            return None
+        hora = (hora or "00:00").strip()
+
+        intentos = (
+            (f"{fecha} {hora}", "%Y-%m-%d %H:%M"),
+            (f"{fecha} {hora}", "%Y-%m-%d %H:%M:%S"),
+            (fecha, "%Y-%m-%d"),
+        )
+        for valor, formato in intentos:
+            try:
+                return int(datetime.strptime(valor, formato).timestamp())
+            except ValueError:
+                continue
+        return None
 
     def to_dict(self):
         return {
@@ -22,6 +46,7 @@ class Evento:
             "creado_por_email": self.creado_por_email,
             "creado_por_nombre": self.creado_por_nombre,
             "creado_en_iso": self.creado_en_iso,
+            "marca_tiempo": self.marca_tiempo,
         }
 
     @classmethod
@@ -34,4 +59,5 @@ class Evento:
             creado_por_nombre=d.get("creado_por_nombre"),
             id_evento=d.get("id"),
             creado_en_iso=d.get("creado_en_iso"),
+            marca_tiempo=d.get("marca_tiempo"),
         )
@@ -1,5 +1,83 @@
+from collections.abc import MutableSet
+
+from src.utils.claves import clave_correo, correo_desde_clave
+
+# Categorías válidas para un grupo (se usan al crear y al filtrar el catálogo)
+CATEGORIAS = ("Tecnología", "Ciencia", "Cultura", "Deportes")
+
+
+# Marca de "campo aún no decodificado" para los grupos creados con from_dict
+_PENDIENTE = object()
+
+
+class ConjuntoOrdenado(MutableSet):
+    """
+    Conjunto de correos que conserva el orden de inserción (un dict sin valores).
+    Preguntar 'correo in conjunto', agregar y quitar son O(1), a diferencia de una lista.
+    """
+    __slots__ = ("_elementos",)
+
+    def __init__(self, elementos=()):
+        self._elementos = dict.fromkeys(elementos)
+
+    def __contains__(self, elemento):
+        return elemento in self._elementos
+
+    def __iter__(self):
+        return iter(self._elementos)
+
+    def __len__(self):
+        return len(self._elementos)
+
+    def add(self, elemento):
+        self._elementos[elemento] = None
+
+    def discard(self, elemento):
+        self._elementos.pop(elemento, None)
+
+    def copy(self):
+        return ConjuntoOrdenado(self._elementos)
+
+    def __repr__(self):
+        return f"ConjuntoOrdenado({list(self._elementos)!r})"
+
+
+def correos_desde_firebase(valor):
+    """
+    Lee integrantes u organizadores en cualquiera de sus formatos guardados:
+    - mapa {correo_key: correo} (formato actual; también acepta {correo_key: true}),
+    - lista de correos (grupos anteriores a la migración) o un correo suelto.
+    """
+    if not valor:
+        return ConjuntoOrdenado()
+    if isinstance(valor, dict):
+        return ConjuntoOrdenado(
+            correo if isinstance(correo, str) else correo_desde_clave(clave)
+            for clave, correo in valor.items() if correo
+        )
+    if isinstance(valor, str):
+        return ConjuntoOrdenado([valor])
+    return ConjuntoOrdenado(c for c in valor if c)
+
+
+def contar_correos(valor):
+    # Cuántos correos hay guardados, en cualquiera de los formatos, sin decodificarlos
+    if not valor:
+        return 0
+    if isinstance(valor, str):
+        return 1
+    return len(valor)
+
+
+def correos_a_firebase(correos):
+    # Formato guardado: integrantes/{correo_key} = correo; unirse o salirse escribe un solo hijo
+    return {clave_correo(correo): correo for correo in correos}
+
+
 class Grupo:
     # Clase que representa un grupo estudiantil con varios organizadores.
+    # __slots__: sin __dict__ por instancia; un listado de miles de grupos ocupa bastante menos memoria.
+    __slots__ = ("id_grupo", "nombre", "descripcion", "categoria", "_organizadores", "_integrantes", "_eventos", "_datos")
 
     def __init__(self, nombre, descripcion, categoria, organizadores, integrantes=None, id_grupo=None, eventos=None):
         # ID único basado en nombre
@@ -7,49 +85,119 @@ class Grupo:
         self.nombre = nombre
         self.descripcion = descripcion
         self.categoria = categoria
-        # Revisa si los organizadores son varios y lo trata como lista
-        self.organizadores = organizadores if isinstance(organizadores, list) else [organizadores]
+        self._datos = None
+        # Organizadores e integrantes son conjuntos ordenados (acepta un correo suelto o una lista)
+        self.organizadores = organizadores
         # inicia con todos los organizadores como miembros
         self.integrantes = integrantes if integrantes else self.organizadores.copy()
-        # eventos: lista de diccionarios (cada uno representa un evento)
-        self.eventos = eventos if eventos else []
+        # eventos: solo para datos antiguos con eventos embebidos.
+        # Los eventos nuevos se guardan aparte en eventos/{id_grupo}/{id_evento}.
+        self.eventos = eventos
 
-    def to_dict(self):
-        # Convierte el objeto en un diccionario para Firebase.
+    # --- Listas decodificadas al primer acceso ---
+    # from_dict solo guarda la referencia al dict leído; las listas se arman cuando alguien las usa
+    # (un listado que solo muestra nombre y categoría nunca las toca).
+
+    @property
+    def organizadores(self):
+        if self._organizadores is _PENDIENTE:
+            self._organizadores = correos_desde_firebase(self._datos.get("organizadores"))
+        return self._organizadores
+
+    @organizadores.setter
+    def organizadores(self, valor):
+        self._organizadores = correos_desde_firebase(valor)
+
+    @property
+    def integrantes(self):
+        if self._integrantes is _PENDIENTE:
+            self._integrantes = correos_desde_firebase(self._datos.get("integrantes")) or self.organizadores.copy()
+        return self._integrantes
+
+    @integrantes.setter
+    def integrantes(self, valor):
+        self._integrantes = correos_desde_firebase(valor)
+
+    @property
+    def eventos(self):
+        if self._eventos is _PENDIENTE:
+            self._eventos = self._datos.get("eventos") or []
+        return self._eventos
+
+    @eventos.setter
+    def eventos(self, valor):
+        self._eventos = valor if valor else []
+
+    @property
+    def categoria_clave(self):
+        # "Categoría|id_grupo": permite paginar por categoría con una consulta ordenada por este campo
+        return f"{self.categoria or ''}|{self.id_grupo}"
+
+    @property
+    def num_integrantes(self):
+        # Sin decodificar la lista si aún no se ha usado (los listados solo muestran el número)
+        if self._integrantes is _PENDIENTE:
+            return contar_correos(self._datos.get("integrantes")) or contar_correos(self._datos.get("organizadores"))
+        return len(self._integrantes)
+
+    def resumen(self):
+        # Lo que muestra un listado: sin integrantes ni organizadores, que no se decodifican ni se copian.
         return {
             "id_grupo": self.id_grupo,
             "nombre": self.nombre,
             "descripcion": self.descripcion,
             "categoria": self.categoria,
-            "organizadores": self.organizadores,
-            "integrantes": self.integrantes,
-            "eventos": self.eventos,
+            "categoria_clave": self.categoria_clave,
+            "num_integrantes": self.num_integrantes,
         }
 
+    def to_dict(self):
+        # Convierte el objeto en un diccionario para las vistas: integrantes y organizadores como listas.
+        datos = {
+            "id_grupo": self.id_grupo,
+            "nombre": self.nombre,
+            "descripcion": self.descripcion,
+            "categoria": self.categoria,
+            "categoria_clave": self.categoria_clave,
+            "organizadores": list(self.organizadores),
+            "integrantes": list(self.integrantes),
+        }
+        # Se conservan los eventos embebidos que aún no se han migrado
+        if self.eventos:
+            datos["eventos"] = self.eventos
+        return datos
+
+    def to_firebase(self):
+        # Diccionario tal como se guarda en Firebase: integrantes y organizadores como mapas por correo_key.
+        datos = self.to_dict()
+        datos["organizadores"] = correos_a_firebase(self.organizadores)
+        datos["integrantes"] = correos_a_firebase(self.integrantes)
+        return datos
+
     @classmethod
     def from_dict(cls, d):
-        return cls(
-            nombre=d.get("nombre"),
-            descripcion=d.get("descripcion"),
-            categoria=d.get("categoria"),
-            organizadores=d.get("organizadores", []),
-            integrantes=d.get("integrantes", []),
-            id_grupo=d.get("id_grupo"),
-            eventos=d.get("eventos", []),
-        )
+        # No pasa por __init__: los campos simples se copian y las listas quedan pendientes
+        grupo = cls.__new__(cls)
+        grupo.nombre = d.get("nombre")
+        grupo.id_grupo = d.get("id_grupo") or grupo.nombre.replace(" ", "_").lower()
+        grupo.descripcion = d.get("descripcion")
+        grupo.categoria = d.get("categoria")
+        grupo._datos = d
+        grupo._organizadores = grupo._integrantes = grupo._eventos = _PENDIENTE
+        return grupo
 
 
     def agregar_integrante(self, usuario):
         # Agrega un usuario a la lista de integrantes si no está presente.
         if usuario not in self.integrantes:
-            self.integrantes.append(usuario)
+            self.integrantes.add(usuario)
             return True
         return False
 
     def remover_integrante(self, usuario):
         # Elimina un usuario de la lista de integrantes si existe.
         if usuario in self.integrantes:
-            self.integrantes.remove(usuario)
+            self.integrantes.discard(usuario)
             return True
         return False
 
@@ -73,29 +221,15 @@ class Grupo:
     def agregar_organizador(self, usuario):
         # Agrega un organizador al grupo si no está presente.
         if usuario not in self.organizadores:
-            self.organizadores.append(usuario)
+            self.organizadores.add(usuario)
             # Asegurar que también sea miembro
-            if usuario not in self.integrantes:
-                self.integrantes.append(usuario)
+            self.integrantes.add(usuario)
             return True
         return False
 
     def remover_organizador(self, usuario):
         # Elimina un organizador del grupo si existe.
         if usuario in self.organizadores:
-            self.organizadores.remove(usuario)
+            self.organizadores.discard(usuario)
             return True
         return False
-
-    def agregar_evento(self, evento_dict):
-        """Agrega un evento al grupo (evento_dict debe ser serializable)."""
-        if not isinstance(self.eventos, list):
-            self.eventos = []
-        self.eventos.append(evento_dict)
-
-    def eliminar_evento_por_id(self, id_evento):
-        if not self.eventos:
-            return False
-        before = len(self.eventos)
-        self.eventos = [e for e in self.eventos if e.get("id") != id_evento]
-        return len(self.eventos) < before
\ No newline at end of file
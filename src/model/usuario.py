@@ -4,6 +4,8 @@ class Usuario:
     
     # Clase que representa a un usuario dentro del sistema UNAL.
     # Contiene datos personales y algunos métodos de interacción.
+    # __slots__: sin __dict__ por instancia (menos memoria al cargar muchos usuarios).
+    __slots__ = ("id_usuario", "nombre_completo", "correo", "contraseña", "carrera", "grupos", "descripcion_personal")
     
     def __init__(self, id_usuario, nombre_completo, correo, contraseña, carrera, grupos=None, descripcion_personal=""):
         self.id_usuario = id_usuario              # ID único
@@ -70,6 +72,11 @@ class Usuario:
         }
     
 
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+
     def __str__(self):   
         # Representación legible del usuario.
 
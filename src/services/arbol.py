@@ -0,0 +1,103 @@
+# src/services/arbol.py
+# Utilidades para manipular rutas y árboles JSON con la misma semántica
+# que Firebase Realtime Database (nodos vacíos no existen, listas como mapas indexados).
+
+import copy
+
+
+def partir_ruta(ruta):
+    """Convierte 'grupos/abc/integrantes' en ['grupos', 'abc', 'integrantes'] (ignora '/' sobrantes)."""
+    if not ruta:
+        return []
+    return [segmento for segmento in str(ruta).split("/") if segmento]
+
+
+def unir_ruta(*segmentos):
+    """Une segmentos de ruta normalizando las barras."""
+    partes = []
+    for segmento in segmentos:
+        partes.extend(partir_ruta(segmento))
+    return "/".join(partes)
+
+
+def es_ancestro_o_igual(ancestro, ruta):
+    """True si 'ancestro' es la misma ruta que 'ruta' o uno de sus padres."""
+    a = partir_ruta(ancestro)
+    r = partir_ruta(ruta)
+    return r[:len(a)] == a
+
+
+def rutas_relacionadas(ruta_a, ruta_b):
+    """True si una ruta contiene a la otra (escribir en una afecta la lectura de la otra)."""
+    return es_ancestro_o_igual(ruta_a, ruta_b) or es_ancestro_o_igual(ruta_b, ruta_a)
+
+
+def validar_rutas_independientes(lista_segmentos):
+    """
+    Firebase rechaza un update donde una ruta contiene a otra; se imita ese error.
+    Recibe una lista de rutas ya partidas en segmentos.
+    """
+    ordenadas = sorted(tuple(segmentos) for segmentos in lista_segmentos)
+    for anterior, actual in zip(ordenadas, ordenadas[1:]):
+        if actual[:len(anterior)] == anterior:
+            raise ValueError(f"Rutas superpuestas en la actualización: '{'/'.join(anterior)}' y '{'/'.join(actual)}'")
+
+
+def a_arbol(valor):
+    """
+    Normaliza un valor JSON al formato interno de Firebase:
+    las listas se guardan como mapas con índices y los nodos vacíos desaparecen.
+    """
+    if isinstance(valor, dict):
+        nodo = {}
+        for clave, hijo in valor.items():
+            hijo_normalizado = a_arbol(hijo)
+            if hijo_normalizado is not None:
+                nodo[str(clave)] = hijo_normalizado
+        return nodo or None
+    if isinstance(valor, (list, tuple)):
+        return a_arbol({str(i): hijo for i, hijo in enumerate(valor)})
+    return copy.deepcopy(valor)
+
+
+def desde_arbol(nodo):
+    """
+    Devuelve una copia del nodo como lo entregaría Firebase: los mapas cuyas claves son
+    enteros y están ocupados en más de la mitad se devuelven como listas.
+    """
+    if not isinstance(nodo, dict):
+        return copy.deepcopy(nodo)
+    hijos = {clave: desde_arbol(hijo) for clave, hijo in nodo.items()}
+    if hijos and all(clave.isdigit() for clave in hijos):
+        indices = {int(clave): hijo for clave, hijo in hijos.items()}
+        maximo = max(indices)
+        if len(indices) * 2 > maximo + 1:
+            return [indices.get(i) for i in range(maximo + 1)]
+    return hijos
+
+
+def leer(raiz, segmentos):
+    """Devuelve el nodo interno en la ruta indicada, o None si no existe."""
+    nodo = raiz
+    for segmento in segmentos:
+        if not isinstance(nodo, dict) or segmento not in nodo:
+            return None
+        nodo = nodo[segmento]
+    return nodo
+
+
+def escribir(raiz, segmentos, valor):
+    """
+    Escribe 'valor' (ya normalizado con a_arbol) en la ruta y devuelve la nueva raíz.
+    Escribir None elimina el nodo y poda los padres que queden vacíos.
+    """
+    if not segmentos:
+        return valor
+    nodo = raiz if isinstance(raiz, dict) else {}
+    cabeza, resto = segmentos[0], segmentos[1:]
+    hijo = escribir(nodo.get(cabeza), resto, valor)
+    if hijo is None:
+        nodo.pop(cabeza, None)
+    else:
+        nodo[cabeza] = hijo
+    return nodo or None
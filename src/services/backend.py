@@ -0,0 +1,55 @@
+# src/services/backend.py
+# Interfaz común para los backends de almacenamiento que usa FirebaseService.
+
+
+class BackendDatos:
+    """
+    Contrato mínimo que debe cumplir un backend de datos.
+    Las rutas usan la semántica de Firebase Realtime Database ('grupos/<id>/nombre').
+    """
+
+    def obtener_datos(self, ruta):
+        raise NotImplementedError
+
+    def guardar_datos(self, ruta, datos):
+        raise NotImplementedError
+
+    def eliminar_datos(self, ruta):
+        raise NotImplementedError
+
+    def actualizar_datos(self, ruta, nuevos_datos):
+        raise NotImplementedError
+
+    def actualizar_parcial(self, ruta, campos):
+        """
+        Actualiza solo los hijos indicados de 'ruta' (update de Firebase).
+        Las claves pueden ser sub-rutas ('a/b') y un valor None elimina ese hijo.
+        """
+        raise NotImplementedError
+
+    def actualizar_multiples(self, cambios):
+        # Actualización atómica de varias rutas en un solo round-trip: {ruta: valor}
+        self.actualizar_parcial("", cambios)
+
+    def consultar(self, ruta, ordenar_por=None, desde=None, hasta=None, limite=None):
+        """
+        Consulta ordenada de los hijos de 'ruta' (order_by_child / order_by_key de Firebase).
+        Sin 'ordenar_por' se ordena por clave. 'desde' y 'hasta' son inclusivos (start_at/end_at)
+        y 'limite' equivale a limit_to_first. Devuelve una lista de pares (clave, valor) en orden.
+        """
+        raise NotImplementedError
+
+    def obtener_con_version(self, ruta):
+        """Devuelve (valor, etag). El etag identifica el contenido actual del nodo."""
+        raise NotImplementedError
+
+    def guardar_si_version(self, ruta, datos, etag):
+        """
+        Escribe 'datos' solo si el nodo conserva el 'etag' esperado (compare-and-set).
+        Devuelve (exito, valor_actual, etag_actual).
+        """
+        raise NotImplementedError
+
+    def actualizar_campo(self, ruta, campo, nuevo_valor):
+        # Solo viaja el campo modificado
+        self.actualizar_parcial(ruta, {campo: nuevo_valor})
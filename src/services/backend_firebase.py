@@ -0,0 +1,82 @@
+# src/services/backend_firebase.py
+# Backend que habla con Firebase Realtime Database a través de firebase_admin.
+
+import os
+
+import firebase_admin
+from firebase_admin import credentials, db
+
+from src.services.backend import BackendDatos
+
+
+def inicializar_firebase():
+    """Inicializa firebase_admin una sola vez usando las variables de entorno."""
+    if firebase_admin._apps:
+        return
+
+    # Variables de entorno necesarias
+    firebase_credentials = os.getenv('FIREBASE_CREDENTIALS')
+    firebase_db_url = os.getenv('FIREBASE_DB_URL')
+
+    if not firebase_credentials:
+        raise ValueError("Falta la variable de entorno FIREBASE_CREDENTIALS")
+
+    if not firebase_db_url:
+        raise ValueError("Falta la variable de entorno FIREBASE_DB_URL")
+
+    # Crear credenciales desde el archivo indicado en la variable de entorno
+    cred = credentials.Certificate(firebase_credentials)
+
+    # Inicializar Firebase
+    firebase_admin.initialize_app(cred, {
+        'databaseURL': firebase_db_url
+    })
+
+
+class BackendFirebase(BackendDatos):
+    """Backend real: cada operación es un round-trip a Firebase."""
+
+    def __init__(self):
+        # La conexión se crea al construir el backend y no al importar el módulo
+        inicializar_firebase()
+
+    def obtener_datos(self, ruta):
+        ref = db.reference(ruta)
+        return ref.get()
+
+    def guardar_datos(self, ruta, datos):
+        ref = db.reference(ruta)
+        ref.set(datos)
+
+    def eliminar_datos(self, ruta):
+        ref = db.reference(ruta)
+        ref.delete()
+
+    def actualizar_datos(self, ruta, nuevos_datos):
+        ref = db.reference(ruta)
+        ref.set(nuevos_datos)
+
+    def consultar(self, ruta, ordenar_por=None, desde=None, hasta=None, limite=None):
+        # Ordenar por un hijo requiere ".indexOn" en las reglas de la base de datos
+        ref = db.reference(ruta)
+        consulta = ref.order_by_child(ordenar_por) if ordenar_por else ref.order_by_key()
+        if desde is not None:
+            consulta = consulta.start_at(desde)
+        if hasta is not None:
+            consulta = consulta.end_at(hasta)
+        if limite:
+            consulta = consulta.limit_to_first(limite)
+        return list((consulta.get() or {}).items())
+
+    def obtener_con_version(self, ruta):
+        ref = db.reference(ruta)
+        return ref.get(etag=True)
+
+    def guardar_si_version(self, ruta, datos, etag):
+        ref = db.reference(ruta)
+        return ref.set_if_unchanged(etag, datos)
+
+    def actualizar_parcial(self, ruta, campos):
+        # update() solo envía los campos indicados; las claves pueden ser sub-rutas
+        ref = db.reference(ruta or "/")
+        ref.update(campos)
@@ -0,0 +1,157 @@
+# src/services/backend_memoria.py
+# Backend en memoria que imita Firebase Realtime Database.
+# Sirve para pruebas, pruebas de carga y perfilado sin una base de datos real.
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+from src.services import arbol
+from src.services.backend import BackendDatos
+
+
+class BackendMemoria(BackendDatos):
+    """
+    Árbol JSON en memoria con la misma semántica de rutas que Firebase.
+    Permite simular latencia por llamada (latencia + jitter aleatorio) y cuenta
+    cada round-trip por operación y por ruta.
+    """
+
+    def __init__(self, datos_iniciales=None, latencia=0.0, jitter=0.0, semilla=None):
+        self.latencia = latencia  # segundos fijos por llamada
+        self.jitter = jitter  # segundos adicionales aleatorios (0..jitter)
+        self._azar = random.Random(semilla)
+        self._lock = threading.RLock()
+        self._raiz = arbol.a_arbol(datos_iniciales or {})
+        self.llamadas = Counter()  # operación -> número de llamadas
+        self.llamadas_por_ruta = Counter()  # (operación, ruta) -> número de llamadas
+
+    # --- Utilidades para pruebas y benchmarks ---
+
+    def cargar(self, datos):
+        # Reemplaza todo el contenido sin contar llamadas
+        with self._lock:
+            self._raiz = arbol.a_arbol(datos or {})
+
+    def exportar(self):
+        # Devuelve una copia de todo el árbol sin contar llamadas
+        with self._lock:
+            return arbol.desde_arbol(self._raiz)
+
+    def reiniciar_contadores(self):
+        with self._lock:
+            self.llamadas.clear()
+            self.llamadas_por_ruta.clear()
+
+    def total_llamadas(self):
+        with self._lock:
+            return sum(self.llamadas.values())
+
+    def _registrar_llamada(self, operacion, ruta):
+        with self._lock:
+            self.llamadas[operacion] += 1
+            self.llamadas_por_ruta[(operacion, arbol.unir_ruta(ruta))] += 1
+        # La espera se hace fuera del lock para que las llamadas concurrentes se solapen
+        espera = self.latencia + (self._azar.uniform(0, self.jitter) if self.jitter else 0)
+        if espera > 0:
+            time.sleep(espera)
+
+    # --- Operaciones del backend ---
+
+    def obtener_datos(self, ruta):
+        self._registrar_llamada("obtener", ruta)
+        with self._lock:
+            return arbol.desde_arbol(arbol.leer(self._raiz, arbol.partir_ruta(ruta)))
+
+    def guardar_datos(self, ruta, datos):
+        self._registrar_llamada("guardar", ruta)
+        with self._lock:
+            self._raiz = arbol.escribir(self._raiz, arbol.partir_ruta(ruta), arbol.a_arbol(datos))
+
+    def eliminar_datos(self, ruta):
+        self._registrar_llamada("eliminar", ruta)
+        with self._lock:
+            self._raiz = arbol.escribir(self._raiz, arbol.partir_ruta(ruta), None)
+
+    def actualizar_datos(self, ruta, nuevos_datos):
+        # Igual que en Firebase, actualizar_datos reemplaza el nodo completo (set)
+        self._registrar_llamada("actualizar", ruta)
+        with self._lock:
+            self._raiz = arbol.escribir(self._raiz, arbol.partir_ruta(ruta), arbol.a_arbol(nuevos_datos))
+
+    @staticmethod
+    def _orden(valor):
+        # Orden de Firebase: null < false < true < números < cadenas < objetos
+        if valor is None:
+            return (0, 0)
+        if isinstance(valor, bool):
+            return (1, valor)
+        if isinstance(valor, (int, float)):
+            return (2, valor)
+        if isinstance(valor, str):
+            return (3, valor)
+        return (4, 0)
+
+    def consultar(self, ruta, ordenar_por=None, desde=None, hasta=None, limite=None):
+        self._registrar_llamada("consultar", ruta)
+        with self._lock:
+            nodo = arbol.leer(self._raiz, arbol.partir_ruta(ruta))
+            if not isinstance(nodo, dict):
+                return []
+
+            def valor_orden(clave, hijo):
+                if not ordenar_por:
+                    return self._orden(clave)
+                campo = arbol.leer(hijo, arbol.partir_ruta(ordenar_por))
+                return self._orden(None if isinstance(campo, dict) else campo)
+
+            # Igual que Firebase, los empates se resuelven por clave
+            hijos = sorted(nodo.items(), key=lambda par: (valor_orden(*par), par[0]))
+            resultado = []
+            for clave, hijo in hijos:
+                orden = valor_orden(clave, hijo)
+                if desde is not None and orden < self._orden(desde):
+                    continue
+                if hasta is not None and orden > self._orden(hasta):
+                    break
+                resultado.append((clave, arbol.desde_arbol(hijo)))
+                if limite and len(resultado) >= limite:
+                    break
+            return resultado
+
+    @staticmethod
+    def _etag(nodo):
+        # Como en Firebase, el etag depende solo del contenido del nodo
+        contenido = json.dumps(nodo, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+    def obtener_con_version(self, ruta):
+        self._registrar_llamada("obtener", ruta)
+        with self._lock:
+            nodo = arbol.leer(self._raiz, arbol.partir_ruta(ruta))
+            return arbol.desde_arbol(nodo), self._etag(nodo)
+
+    def guardar_si_version(self, ruta, datos, etag):
+        self._registrar_llamada("guardar_si_version", ruta)
+        segmentos = arbol.partir_ruta(ruta)
+        with self._lock:
+            nodo = arbol.leer(self._raiz, segmentos)
+            etag_actual = self._etag(nodo)
+            if etag_actual != etag:
+                return False, arbol.desde_arbol(nodo), etag_actual
+            nuevo = arbol.a_arbol(datos)
+            self._raiz = arbol.escribir(self._raiz, segmentos, nuevo)
+            return True, arbol.desde_arbol(nuevo), self._etag(nuevo)
+
+    def actualizar_parcial(self, ruta, campos):
+        self._registrar_llamada("actualizar_parcial", ruta)
+        base = arbol.partir_ruta(ruta)
+        destinos = [base + arbol.partir_ruta(clave) for clave in campos]
+        arbol.validar_rutas_independientes(destinos)
+        # Todas las rutas se aplican bajo el mismo lock: la actualización es atómica
+        with self._lock:
+            for destino, valor in zip(destinos, campos.values()):
+                self._raiz = arbol.escribir(self._raiz, destino, arbol.a_arbol(valor))
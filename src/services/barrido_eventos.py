@@ -0,0 +1,49 @@
+# src/services/barrido_eventos.py
+# Ejecuta periódicamente la purga de eventos vencidos en un hilo en segundo plano.
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class BarredorEventos:
+    """
+    Llama a eventos_vm.purgar_eventos_vencidos() cada 'intervalo' segundos.
+    Así las lecturas nunca escriben: solo filtran en memoria los eventos pasados.
+    """
+
+    def __init__(self, eventos_vm, intervalo=300, tamano_lote=500):
+        self.eventos_vm = eventos_vm
+        self.intervalo = intervalo
+        self.tamano_lote = tamano_lote
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def barrer_una_vez(self):
+        borrados = self.eventos_vm.purgar_eventos_vencidos(self.tamano_lote)
+        if borrados:
+            logger.info("Barrido de eventos: %d eventos vencidos eliminados", borrados)
+        return borrados
+
+    def ejecutar(self):
+        # Ciclo de barridos en el hilo actual hasta que se llame a detener()
+        while not self._detener.is_set():
+            try:
+                self.barrer_una_vez()
+            except Exception:
+                # Un fallo puntual (por ejemplo de red) no debe detener el barrido
+                logger.exception("Error en el barrido de eventos vencidos")
+            self._detener.wait(self.intervalo)
+
+    def iniciar(self):
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self.ejecutar, name="barrido-eventos", daemon=True)
+        self._hilo.start()
+
+    def detener(self, espera=None):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(espera)
@@ -0,0 +1,223 @@
+# src/services/busqueda.py
+# Índice invertido en memoria para buscar grupos por nombre, descripción y categoría.
+
+import bisect
+import re
+import threading
+import time
+import unicodedata
+
+from src.model.grupo import Grupo
+from src.services import arbol
+from src.services.versiones import RUTA_VERSIONES
+
+# Palabras demasiado comunes para aportar a la búsqueda
+PALABRAS_VACIAS = {"a", "al", "con", "de", "del", "el", "en", "la", "las", "los", "para", "por", "un", "una", "y"}
+
+# Peso de cada campo al puntuar un resultado
+PESOS = {"nombre": 3.0, "categoria": 2.0, "descripcion": 1.0}
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: 'Programación' -> 'programacion' (la ñ también pasa a n)."""
+    descompuesto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    return [t for t in re.findall(r"\w+", normalizar(texto)) if t not in PALABRAS_VACIAS]
+
+
+def _terminos_de(grupo):
+    pesos = {}
+    for campo, peso in PESOS.items():
+        for termino in tokenizar(getattr(grupo, campo, "")):
+            pesos[termino] = max(pesos.get(termino, 0.0), peso)
+    return pesos
+
+
+class _Indice:
+    """Estructuras del índice. Una reconstrucción arma una nueva y la reemplaza entera."""
+
+    def __init__(self):
+        self.terminos = {}  # término -> {id_grupo: peso}
+        self.vocabulario = []  # términos ordenados, para buscar por prefijo
+        self.documentos = {}  # id_grupo -> (resumen del grupo, {término: peso})
+
+    def quitar(self, id_grupo):
+        _, pesos = self.documentos.pop(id_grupo, (None, {}))
+        for termino in pesos:
+            ids = self.terminos.get(termino)
+            if ids is None:
+                continue
+            ids.pop(id_grupo, None)
+            if not ids:
+                del self.terminos[termino]
+                posicion = bisect.bisect_left(self.vocabulario, termino)
+                if posicion < len(self.vocabulario) and self.vocabulario[posicion] == termino:
+                    self.vocabulario.pop(posicion)
+
+    def agregar(self, id_grupo, datos):
+        self.quitar(id_grupo)
+        if not datos:
+            return
+        grupo = Grupo.from_dict(datos)
+        pesos = _terminos_de(grupo)
+        self.documentos[id_grupo] = (grupo.resumen(), pesos)
+        for termino, peso in pesos.items():
+            if termino not in self.terminos:
+                self.terminos[termino] = {}
+                bisect.insort(self.vocabulario, termino)
+            self.terminos[termino][id_grupo] = peso
+
+    def coincidencias(self, termino, es_ultimo):
+        # Término exacto con su peso; el último término también vale como prefijo (a medio peso)
+        resultado = dict(self.terminos.get(termino, {}))
+        if es_ultimo:
+            posicion = bisect.bisect_left(self.vocabulario, termino)
+            while posicion < len(self.vocabulario) and self.vocabulario[posicion].startswith(termino):
+                candidato = self.vocabulario[posicion]
+                if candidato != termino:
+                    for id_grupo, peso in self.terminos[candidato].items():
+                        resultado[id_grupo] = max(resultado.get(id_grupo, 0.0), peso / 2)
+                posicion += 1
+        return resultado
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido término -> {id_grupo: peso} sobre los grupos de 'ruta'.
+    - Se construye con una sola lectura de 'ruta' la primera vez que se busca.
+    - Se suscribe a las escrituras del servicio: cada grupo modificado se marca y se vuelve
+      a indexar (leyendo solo ese grupo) antes de la siguiente búsqueda.
+    - buscar(..., version=sello) recibe el sello versiones/busqueda, que solo cambia cuando se
+      crea o borra un grupo o cambia su nombre, descripción o categoría. Si no es el que refleja
+      el índice (escribió otro proceso), se reconstruye en segundo plano y mientras tanto se
+      responde con el índice actual: unirse o crear eventos no provoca reconstrucciones.
+    - Las lecturas a Firebase se hacen sin el lock: una reconstrucción arma un índice nuevo
+      y lo reemplaza de una vez, y mientras tanto las demás búsquedas usan el anterior.
+    - 'ttl' (segundos) programa también una reconstrucción en segundo plano por si algún
+      cambio no llegó con el sello; None la desactiva.
+    """
+
+    def __init__(self, service, ruta="grupos", ttl=600.0):
+        self.service = service
+        self.ruta = ruta
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._reconstruyendo = threading.Lock()  # una sola reconstrucción a la vez
+        self._indice = None  # _Indice actual (None = hay que construirlo)
+        self._version = None  # sello de versiones/busqueda que refleja el índice
+        self._pendientes = set()  # ids de grupos a reindexar
+        self._construido_en = None
+        self._hilo = None  # última reconstrucción en segundo plano
+        service.suscribir_cambios(self._al_cambiar)
+
+    # --- Mantenimiento del índice ---
+
+    def _al_cambiar(self, ruta):
+        base = arbol.partir_ruta(self.ruta)
+        segmentos = arbol.partir_ruta(ruta)
+        with self._lock:
+            if segmentos == [RUTA_VERSIONES, "busqueda"]:
+                # Sello nuevo por una escritura de este proceso: se adopta en la próxima búsqueda
+                self._version = None
+                return
+            if segmentos[:len(base)] != base:
+                if segmentos == base[:len(segmentos)]:
+                    self._indice = None  # se escribió un padre de 'ruta'
+                return
+            if len(segmentos) == len(base):
+                self._indice = None  # se reemplazó todo el árbol de grupos
+            else:
+                self._pendientes.add(segmentos[len(base)])
+
+    def reconstruir(self):
+        """Vuelve a indexar todos los grupos con una sola lectura. Devuelve cuántos indexó."""
+        with self._reconstruyendo:
+            return self._reconstruir()
+
+    def _reconstruir(self):
+        with self._lock:
+            # Lo que se escriba durante la lectura vuelve a quedar pendiente
+            self._pendientes.clear()
+        version = self.service.obtener_datos(f"{RUTA_VERSIONES}/busqueda")
+        grupos = self.service.obtener_datos(self.ruta) or {}
+        nuevo = _Indice()
+        for id_grupo, datos in grupos.items():
+            nuevo.agregar(id_grupo, datos)
+        with self._lock:
+            self._indice, self._version = nuevo, version
+            self._construido_en = time.monotonic()
+        return len(nuevo.documentos)
+
+    def _reconstruir_en_segundo_plano(self):
+        try:
+            self._reconstruir()
+        finally:
+            self._reconstruyendo.release()
+
+    def _actualizar(self, version=None):
+        with self._lock:
+            sin_indice = self._indice is None
+        if sin_indice:
+            # Solo la primera vez (o si se reemplazó todo el árbol) la búsqueda espera la lectura completa
+            with self._reconstruyendo:
+                with self._lock:
+                    sin_indice = self._indice is None  # otra búsqueda pudo construirlo mientras se esperaba
+                if sin_indice:
+                    self._reconstruir()
+
+        with self._lock:
+            vencido = self.ttl is not None and self._construido_en is not None \
+                and time.monotonic() - self._construido_en > self.ttl
+            # Otro proceso cambió un campo indexado: se sigue usando este índice mientras se renueva
+            otro_proceso = version is not None and self._version is not None and version != self._version
+            pendientes, self._pendientes = self._pendientes, set()
+        if (vencido or otro_proceso) and self._reconstruyendo.acquire(blocking=False):
+            self._hilo = threading.Thread(target=self._reconstruir_en_segundo_plano, daemon=True)
+            self._hilo.start()
+
+        leidos = {id_grupo: self.service.obtener_datos(f"{self.ruta}/{id_grupo}") for id_grupo in pendientes}
+        with self._lock:
+            if self._indice is None:
+                return  # se reemplazó todo el árbol mientras se leía: la próxima búsqueda reconstruye
+            for id_grupo, datos in leidos.items():
+                self._indice.agregar(id_grupo, datos)
+            if self._version is None:
+                self._version = version
+
+    def esperar_reconstruccion(self, timeout=None):
+        """Espera a que termine la reconstrucción en segundo plano, si hay una (pruebas, scripts)."""
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+    # --- Búsqueda ---
+
+    def buscar(self, texto, categoria=None, limite=20, version=None):
+        """
+        Devuelve los resúmenes de los grupos (ver Grupo.resumen) que contienen todos los términos de 'texto',
+        ordenados por relevancia (nombre > categoría > descripción) y luego por nombre.
+        'version' es el sello versiones/busqueda actual, si el llamador ya lo leyó.
+        """
+        terminos = tokenizar(texto)
+        if not terminos:
+            return []
+        self._actualizar(version)
+        with self._lock:
+            indice = self._indice
+            if indice is None:
+                return []
+            puntajes = None
+            for i, termino in enumerate(terminos):
+                coincidencias = indice.coincidencias(termino, i == len(terminos) - 1)
+                if puntajes is None:
+                    puntajes = coincidencias
+                else:
+                    puntajes = {g: puntajes[g] + p for g, p in coincidencias.items() if g in puntajes}
+                if not puntajes:
+                    return []
+
+            ids = [g for g in puntajes if not categoria or indice.documentos[g][0].get("categoria") == categoria]
+            ids.sort(key=lambda g: (-puntajes[g], normalizar(indice.documentos[g][0].get("nombre"))))
+            return [indice.documentos[g][0] for g in ids[:limite]]
@@ -0,0 +1,126 @@
+# src/services/cache.py
+# Caché de lecturas por ruta con TTL, expulsión LRU y presupuesto de memoria.
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.services import arbol
+
+
+class CacheLectura:
+    """
+    Guarda el resultado de obtener_datos por ruta.
+    - Cada entrada vence después de 'ttl' segundos.
+    - Si se supera 'max_bytes' se expulsan las entradas menos usadas (LRU).
+    - Una escritura en una ruta invalida esa ruta, sus padres y sus hijos.
+    """
+
+    def __init__(self, ttl=30.0, max_bytes=8 * 1024 * 1024, reloj=time.monotonic):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # ruta -> (vence_en, tamaño, valor)
+        self._bytes = 0
+        # Se incrementa en cada invalidación; evita guardar lecturas que quedaron viejas
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+
+    @staticmethod
+    def _estimar_tamano(valor):
+        # Aproximación: tamaño del JSON que viajaría por la red
+        return len(json.dumps(valor, ensure_ascii=False, default=str))
+
+    def generacion(self):
+        with self._lock:
+            return self._generacion
+
+    def obtener(self, ruta):
+        """Devuelve (encontrado, valor). El valor es una copia que se puede modificar."""
+        ruta = arbol.unir_ruta(ruta)
+        with self._lock:
+            entrada = self._entradas.get(ruta)
+            if entrada is None:
+                self.fallos += 1
+                return False, None
+            vence_en, tamano, valor = entrada
+            if vence_en <= self._reloj():
+                self._quitar(ruta)
+                self.fallos += 1
+                return False, None
+            self._entradas.move_to_end(ruta)
+            self.aciertos += 1
+        return True, copy.deepcopy(valor)
+
+    def guardar(self, ruta, valor, generacion=None):
+        """
+        Guarda una lectura. Si se pasa la 'generacion' tomada antes de leer y hubo
+        invalidaciones mientras tanto, la lectura se descarta por posiblemente vieja.
+        """
+        ruta = arbol.unir_ruta(ruta)
+        tamano = self._estimar_tamano(valor)
+        if tamano > self.max_bytes:
+            return
+        valor = copy.deepcopy(valor)
+        with self._lock:
+            if generacion is not None and generacion != self._generacion:
+                return
+            self._quitar(ruta)
+            self._entradas[ruta] = (self._reloj() + self.ttl, tamano, valor)
+            self._bytes += tamano
+            while self._bytes > self.max_bytes:
+                ruta_vieja = next(iter(self._entradas))
+                self._quitar(ruta_vieja)
+                self.expulsiones += 1
+
+    def invalidar(self, ruta):
+        """Elimina la ruta escrita, todos sus padres y todos sus hijos."""
+        with self._lock:
+            self._generacion += 1
+            afectadas = [r for r in self._entradas if arbol.rutas_relacionadas(r, ruta)]
+            for r in afectadas:
+                self._quitar(r)
+            self.invalidaciones += len(afectadas)
+
+    def limpiar(self):
+        with self._lock:
+            self._generacion += 1
+            self._entradas.clear()
+            self._bytes = 0
+
+    def _quitar(self, ruta):
+        entrada = self._entradas.pop(ruta, None)
+        if entrada is not None:
+            self._bytes -= entrada[1]
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "expulsiones": self.expulsiones,
+                "invalidaciones": self.invalidaciones,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+            }
+
+
+def cache_desde_entorno():
+    """
+    Crea la caché según CACHE_LECTURA_TTL (segundos) y CACHE_LECTURA_MAX_KB.
+    Si CACHE_LECTURA_TTL no está definida o es 0, no se usa caché.
+    """
+    ttl = float(os.getenv("CACHE_LECTURA_TTL", "0") or 0)
+    if ttl <= 0:
+        return None
+    max_kb = int(os.getenv("CACHE_LECTURA_MAX_KB", "8192"))
+    return CacheLectura(ttl=ttl, max_bytes=max_kb * 1024)
@@ -0,0 +1,86 @@
+# src/services/directorio_nombres.py
+# Resuelve correos a nombres para mostrar sin leer cada usuario por separado.
+
+import asyncio
+
+from src.services import arbol
+from src.services.cache import CacheLectura
+from src.services.firebase_async import FirebaseServiceAsync
+from src.utils.claves import clave_correo
+
+
+class DirectorioNombres:
+    """
+    Usa el nodo desnormalizado nombres/{correo_key} = nombre_completo.
+    - resolver(correos) lee en paralelo solo las entradas pedidas que no están en la caché.
+    - nombre_de(correo) lee solo la entrada de ese correo.
+    Las escrituras en nombres/ hechas con este servicio borran la entrada al momento
+    (suscribir_cambios). Las de otros procesos se notan con validar_version() y el sello
+    versiones/nombres; sin sello, vencen a los 'ttl' segundos.
+    """
+
+    def __init__(self, service, ttl=60.0, ruta="nombres", max_bytes=2 * 1024 * 1024):
+        self.service = service
+        self.service_async = FirebaseServiceAsync(service)
+        self.ruta = ruta
+        self.cache = CacheLectura(ttl=ttl, max_bytes=max_bytes)  # correo_key -> nombre (o None)
+        self._sello = None  # último sello versiones/nombres visto
+        self.service.suscribir_cambios(self._al_cambiar)
+
+    def _al_cambiar(self, ruta):
+        segmentos = arbol.partir_ruta(ruta)
+        if segmentos and segmentos[0] != self.ruta:
+            return
+        if len(segmentos) < 2:
+            # Se escribió la raíz o el directorio completo
+            self.cache.limpiar()
+        else:
+            self.cache.invalidar(segmentos[1])
+
+    def validar_version(self, sello):
+        """
+        Recibe el sello versiones/nombres que se leyó para la página (el de su ETag). Si cambió
+        desde la última vez, algún proceso escribió nombres: se vacía la caché y los nombres
+        mostrados quedan al menos tan nuevos como el sello.
+        """
+        if sello != self._sello:
+            self.cache.limpiar()
+            self._sello = sello
+
+    async def resolver_async(self, correos):
+        """Devuelve {correo: nombre}; si un correo no tiene nombre registrado se usa el correo."""
+        correos = list(dict.fromkeys(correos))
+        generacion = self.cache.generacion()
+        nombres, faltantes = {}, []
+        for correo in correos:
+            encontrado, nombre = self.cache.obtener(clave_correo(correo))
+            if encontrado:
+                nombres[correo] = nombre
+            else:
+                faltantes.append(correo)
+        if faltantes:
+            leidos = await self.service_async.obtener_varios([f"{self.ruta}/{clave_correo(c)}" for c in faltantes])
+            for correo, nombre in zip(faltantes, leidos):
+                # Si hubo una escritura en nombres/ mientras se leía, la lectura no se guarda
+                self.cache.guardar(clave_correo(correo), nombre, generacion)
+                nombres[correo] = nombre
+        return {correo: nombres.get(correo) or correo for correo in correos}
+
+    def resolver(self, correos):
+        # Solo para código síncrono: asyncio.run falla dentro de un event loop, así que las
+        # vistas async y las corrutinas deben usar 'await resolver_async(...)'
+        return asyncio.run(self.resolver_async(correos))
+
+    def nombre_de(self, correo):
+        """Nombre de un solo correo, o None si no está registrado."""
+        correo_key = clave_correo(correo)
+        encontrado, nombre = self.cache.obtener(correo_key)
+        if encontrado:
+            return nombre
+        generacion = self.cache.generacion()
+        nombre = self.service.obtener_datos(f"{self.ruta}/{correo_key}")
+        self.cache.guardar(correo_key, nombre, generacion)
+        return nombre
+
+    def invalidar(self):
+        self.cache.limpiar()
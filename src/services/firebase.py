@@ -1,57 +1,205 @@
-import firebase_admin
-from firebase_admin import credentials, db
-import os
-import json
-from dotenv import load_dotenv
-
-load_dotenv()  # Carga variables locales si estás en desarrollo
-
-# Variables de entorno necesarias
-FIREBASE_CREDENTIALS = os.getenv('FIREBASE_CREDENTIALS')
-FIREBASE_DB_URL = os.getenv('FIREBASE_DB_URL')
-
-if not FIREBASE_CREDENTIALS:
-    raise ValueError("Falta la variable de entorno FIREBASE_CREDENTIALS")
-
-if not FIREBASE_DB_URL:
-    raise ValueError("Falta la variable de entorno FIREBASE_DB_URL")
-
-# Inicializar Firebase solo una vez
-if not firebase_admin._apps:
-    # Convertir el JSON almacenado en la variable de entorno en un dict
-
-    # Crear credenciales desde el dict (sin archivo físico)
-    cred = credentials.Certificate(FIREBASE_CREDENTIALS)
-
-    # Inicializar Firebase
-    firebase_admin.initialize_app(cred, {
-        'databaseURL': FIREBASE_DB_URL
-    })
-
-
-
-class FirebaseService:
-    """Servicio para interactuar con Firebase Realtime Database."""
-
-    def obtener_datos(self, ruta):
-        ref = db.reference(ruta)
-        return ref.get()
-
-    def guardar_datos(self, ruta, datos):
-        ref = db.reference(ruta)
-        ref.set(datos)
-
-    def eliminar_datos(self, ruta):
-        ref = db.reference(ruta)
-        ref.delete()
-
-    def actualizar_datos(self, ruta, nuevos_datos):
-        ref = db.reference(ruta)
-        ref.set(nuevos_datos)
-
-    # Con este solo se actualiza el dato que se le pase
-    def actualizar_campo(self, ruta, campo, nuevo_valor):
-        datos_actuales = self.obtener_datos(ruta) or {}
-        datos_actuales[campo] = nuevo_valor
-        self.actualizar_datos(ruta, datos_actuales)
-
+import copy
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from dotenv import load_dotenv
+
+from src.services import arbol
+
+load_dotenv()  # Carga variables locales si estás en desarrollo
+
+# Backend compartido por todas las instancias de FirebaseService (igual que la app de firebase_admin)
+_backend_global = None
+_lock_backend = threading.Lock()
+
+
+def crear_backend():
+    """
+    Crea el backend según la variable de entorno BACKEND_DATOS:
+    - 'firebase' (por defecto): Firebase Realtime Database real.
+    - 'memoria': árbol en memoria; BACKEND_LATENCIA_MS y BACKEND_JITTER_MS simulan la red.
+    """
+    tipo = os.getenv('BACKEND_DATOS', 'firebase').strip().lower()
+
+    if tipo == 'memoria':
+        from src.services.backend_memoria import BackendMemoria
+        return BackendMemoria(
+            latencia=float(os.getenv('BACKEND_LATENCIA_MS', '0')) / 1000,
+            jitter=float(os.getenv('BACKEND_JITTER_MS', '0')) / 1000,
+        )
+
+    if tipo == 'firebase':
+        from src.services.backend_firebase import BackendFirebase
+        return BackendFirebase()
+
+    raise ValueError(f"BACKEND_DATOS inválido: {tipo}")
+
+
+def backend_por_defecto():
+    """Devuelve (creándolo la primera vez) el backend compartido del proceso."""
+    global _backend_global
+    with _lock_backend:
+        if _backend_global is None:
+            _backend_global = crear_backend()
+        return _backend_global
+
+
+class ErrorTransaccion(Exception):
+    """La transacción no pudo confirmarse dentro del número máximo de reintentos."""
+
+
+# Valor por defecto de _llamar: el tamaño a medir es el de lo que devolvió el backend
+_LEIDOS = object()
+
+
+class FirebaseService:
+    """Servicio para interactuar con Firebase Realtime Database."""
+
+    def __init__(self, backend=None, cache=None):
+        # Permite inyectar otro backend (por ejemplo BackendMemoria para pruebas o benchmarks)
+        self.backend = backend if backend else backend_por_defecto()
+        # Caché de lecturas opcional (CacheLectura); None desactiva la caché
+        self.cache = cache
+        # Contadores de transacciones por ruta (intentos, conflictos, reintentos, ...)
+        self._estadisticas_transacciones = defaultdict(Counter)
+        self._lock_estadisticas = threading.Lock()
+        # Funciones que se llaman con la ruta de cada escritura (índices en memoria, etc.)
+        self._suscriptores = []
+        # Funciones que se llaman tras cada llamada al backend (métricas, diagnóstico)
+        self._observadores = []
+        self._medir_bytes = False
+
+    def obtener_datos(self, ruta):
+        if self.cache is None:
+            return self._llamar("obtener", ruta, self.backend.obtener_datos, ruta)
+
+        encontrado, datos = self.cache.obtener(ruta)
+        if encontrado:
+            return datos
+        generacion = self.cache.generacion()
+        datos = self._llamar("obtener", ruta, self.backend.obtener_datos, ruta)
+        self.cache.guardar(ruta, datos, generacion)
+        return datos
+
+    def guardar_datos(self, ruta, datos):
+        self._llamar("guardar", ruta, self.backend.guardar_datos, ruta, datos, enviados=datos)
+        self._invalidar(ruta)
+
+    def eliminar_datos(self, ruta):
+        self._llamar("eliminar", ruta, self.backend.eliminar_datos, ruta, enviados=None)
+        self._invalidar(ruta)
+
+    def actualizar_datos(self, ruta, nuevos_datos):
+        self._llamar("actualizar", ruta, self.backend.actualizar_datos, ruta, nuevos_datos, enviados=nuevos_datos)
+        self._invalidar(ruta)
+
+    # Con este solo se actualiza el dato que se le pase
+    def actualizar_campo(self, ruta, campo, nuevo_valor):
+        self._llamar("actualizar_campo", ruta, self.backend.actualizar_campo, ruta, campo, nuevo_valor,
+                     enviados=nuevo_valor)
+        self._invalidar(f"{ruta}/{campo}")
+
+    # Actualiza solo los campos indicados del nodo (update); un valor None borra ese campo
+    def actualizar_parcial(self, ruta, campos):
+        if not campos:
+            return
+        self._llamar("actualizar_parcial", ruta, self.backend.actualizar_parcial, ruta, campos, enviados=campos)
+        for campo in campos:
+            self._invalidar(f"{ruta}/{campo}")
+
+    # Cambia varias rutas de forma atómica en un solo round-trip: {ruta: valor}
+    def actualizar_multiples(self, cambios):
+        if not cambios:
+            return
+        # Para los observadores la "ruta" son las colecciones tocadas: 'grupos+membresias+versiones'
+        colecciones = "+".join(sorted({(arbol.partir_ruta(r) or ["/"])[0] for r in cambios})) if self._observadores else ""
+        self._llamar("actualizar_multiples", colecciones, self.backend.actualizar_multiples, cambios, enviados=cambios)
+        for ruta in cambios:
+            self._invalidar(ruta)
+
+    # Consulta ordenada y limitada (paginación). No pasa por la caché de lecturas.
+    def consultar(self, ruta, ordenar_por=None, desde=None, hasta=None, limite=None):
+        return self._llamar("consultar", ruta, self.backend.consultar, ruta, ordenar_por, desde, hasta, limite)
+
+    # Construye un objeto del modelo con los datos de la ruta (None si no existe)
+    def obtener_objeto(self, ruta, fabrica):
+        datos = self.obtener_datos(ruta)
+        return fabrica(datos) if datos else None
+
+    def transaccion(self, ruta, funcion, max_reintentos=25):
+        """
+        Aplica 'funcion(valor_actual) -> valor_nuevo' con compare-and-set sobre el etag del nodo.
+        Si otro cliente escribió entre la lectura y la escritura, se reintenta con el valor nuevo
+        (hasta 'max_reintentos' veces, con una espera aleatoria creciente).
+        Si la función devuelve el mismo valor no se escribe nada.
+        Devuelve (hubo_cambio, valor_final) o lanza ErrorTransaccion.
+        """
+        for intento in range(max_reintentos + 1):
+            self._contar_transaccion(ruta, "intentos")
+            if intento:
+                self._contar_transaccion(ruta, "reintentos")
+                time.sleep(random.uniform(0, min(0.2, 0.005 * 2 ** intento)))
+
+            actual, etag = self._llamar("obtener_con_version", ruta, self.backend.obtener_con_version, ruta)
+            nuevo = funcion(copy.deepcopy(actual))
+            if nuevo == actual:
+                return False, actual
+
+            exito, _, _ = self._llamar("guardar_si_version", ruta, self.backend.guardar_si_version, ruta, nuevo, etag,
+                                       enviados=nuevo)
+            if exito:
+                self._invalidar(ruta)
+                self._contar_transaccion(ruta, "confirmadas")
+                return True, nuevo
+            self._contar_transaccion(ruta, "conflictos")
+
+        self._contar_transaccion(ruta, "agotadas")
+        raise ErrorTransaccion(f"No se pudo confirmar la transacción en '{ruta}' tras {max_reintentos} reintentos")
+
+    def _contar_transaccion(self, ruta, contador):
+        with self._lock_estadisticas:
+            self._estadisticas_transacciones[ruta][contador] += 1
+
+    def estadisticas_transacciones(self):
+        # Copia de los contadores por ruta: {ruta: {"intentos": n, "conflictos": n, ...}}
+        with self._lock_estadisticas:
+            return {ruta: dict(contadores) for ruta, contadores in self._estadisticas_transacciones.items()}
+
+    def observar_llamadas(self, funcion, medir_bytes=False):
+        """
+        Registra funcion(operacion, ruta, segundos, bytes), que se llama después de cada llamada
+        al backend (no en los aciertos de la caché). 'bytes' es el tamaño en JSON de lo leído o
+        escrito solo si algún observador pidió medir_bytes; si no, es None. Medirlo serializa
+        cada valor leído o escrito otra vez, así que queda apagado por defecto.
+        """
+        self._observadores.append(funcion)
+        self._medir_bytes = self._medir_bytes or medir_bytes
+
+    def _llamar(self, operacion, ruta, metodo, *args, enviados=_LEIDOS):
+        # Sin observadores no se mide nada: llamada directa al backend
+        if not self._observadores:
+            return metodo(*args)
+        inicio = time.perf_counter()
+        resultado = metodo(*args)
+        segundos = time.perf_counter() - inicio
+        tamano = None
+        if self._medir_bytes:
+            datos = resultado if enviados is _LEIDOS else enviados
+            tamano = len(json.dumps(datos, ensure_ascii=False, default=str)) if datos is not None else 0
+        for funcion in self._observadores:
+            funcion(operacion, ruta, segundos, tamano)
+        return resultado
+
+    def suscribir_cambios(self, funcion):
+        """Registra funcion(ruta), que se llama después de cada escritura hecha por este servicio."""
+        self._suscriptores.append(funcion)
+
+    def _invalidar(self, ruta):
+        # Toda escritura invalida la ruta, sus padres y sus hijos en la caché
+        if self.cache is not None:
+            self.cache.invalidar(ruta)
+        for funcion in self._suscriptores:
+            funcion(ruta)
@@ -0,0 +1,52 @@
+# src/services/firebase_async.py
+# Variante asyncio de FirebaseService para lanzar lecturas independientes a la vez.
+
+import asyncio
+
+from src.services.lecturas_redundantes import anotar_origen
+
+
+class FirebaseServiceAsync:
+    """
+    Envuelve un servicio síncrono (FirebaseService o UnidadDeTrabajo) con métodos 'async'.
+    firebase_admin no tiene cliente asyncio, así que cada llamada corre en un hilo
+    (asyncio.to_thread); varias lecturas esperadas con asyncio.gather viajan en paralelo
+    y la página tarda lo que la lectura más lenta, no la suma de todas.
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    @staticmethod
+    async def _en_hilo(funcion, *args):
+        anotar_origen()  # Para el detector de lecturas: el hilo no ve la pila del ViewModel
+        return await asyncio.to_thread(funcion, *args)
+
+    async def obtener_datos(self, ruta):
+        return await self._en_hilo(self.service.obtener_datos, ruta)
+
+    async def obtener_varios(self, rutas):
+        """Lee varias rutas en paralelo y devuelve los valores en el mismo orden."""
+        anotar_origen()
+        return list(await asyncio.gather(*(self.obtener_datos(ruta) for ruta in rutas)))
+
+    async def obtener_objeto(self, ruta, fabrica):
+        return await self._en_hilo(self.service.obtener_objeto, ruta, fabrica)
+
+    async def consultar(self, ruta, ordenar_por=None, desde=None, hasta=None, limite=None):
+        return await self._en_hilo(self.service.consultar, ruta, ordenar_por, desde, hasta, limite)
+
+    async def guardar_datos(self, ruta, datos):
+        await self._en_hilo(self.service.guardar_datos, ruta, datos)
+
+    async def eliminar_datos(self, ruta):
+        await self._en_hilo(self.service.eliminar_datos, ruta)
+
+    async def actualizar_parcial(self, ruta, campos):
+        await self._en_hilo(self.service.actualizar_parcial, ruta, campos)
+
+    async def actualizar_multiples(self, cambios):
+        await self._en_hilo(self.service.actualizar_multiples, cambios)
+
+    async def transaccion(self, ruta, funcion, max_reintentos=25):
+        return await self._en_hilo(self.service.transaccion, ruta, funcion, max_reintentos)
@@ -1,4 +1,6 @@
+from src.services.cache import cache_desde_entorno
 from src.services.firebase import FirebaseService
 
 # Creamos un servicio (objeto) global que se puede reutilizar en toda la app
-firebase_global = FirebaseService()
+# La caché de lecturas se activa con CACHE_LECTURA_TTL (ver src/services/cache.py)
+firebase_global = FirebaseService(cache=cache_desde_entorno())
@@ -0,0 +1,38 @@
+# src/services/fragmentos.py
+# Caché de fragmentos HTML ya renderizados (tarjetas de grupo, filas de evento).
+
+from src.services.cache import CacheLectura
+
+
+class CacheFragmentos:
+    """
+    Guarda el HTML de cada fragmento con la clave tipo/rol/id/versión, donde la versión es
+    el sello versiones/grupos/{id} del grupo (ver cambios_version) y el rol es el del
+    usuario que mira (organizador, miembro o externo: cambia los botones de la tarjeta).
+    Un fragmento cuyo grupo cambió simplemente deja de pedirse y sale por TTL/LRU,
+    así que no hace falta invalidar nada al escribir.
+    """
+
+    def __init__(self, ttl=600.0, max_bytes=4 * 1024 * 1024):
+        self.cache = CacheLectura(ttl=ttl, max_bytes=max_bytes)
+        self.renderizados = 0
+
+    def obtener(self, tipo, id_fragmento, rol, version, renderizar):
+        """
+        Devuelve el HTML en caché o lo genera con renderizar() y lo guarda.
+        Sin sello (datos anteriores a los sellos de versión) se renderiza sin guardar.
+        """
+        if version is None:
+            self.renderizados += 1
+            return renderizar()
+        clave = f"{tipo}/{rol}/{id_fragmento}/{version}"
+        encontrado, html = self.cache.obtener(clave)
+        if encontrado:
+            return html
+        html = renderizar()
+        self.renderizados += 1
+        self.cache.guardar(clave, html)
+        return html
+
+    def estadisticas(self):
+        return {**self.cache.estadisticas(), "renderizados": self.renderizados}
@@ -0,0 +1,178 @@
+# src/services/lecturas_redundantes.py
+# Detector de lecturas redundantes a Firebase (modo desarrollo / canary).
+# Registra cada llamada al backend durante un request y avisa de lecturas repetidas,
+# ráfagas N+1 de rutas hermanas y requests que superan su presupuesto de llamadas.
+
+import contextvars
+import json
+import logging
+import os
+import random
+import sys
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from src.services import arbol
+
+logger = logging.getLogger("lecturas_redundantes")
+
+# Operaciones que leen datos
+LECTURAS = ("obtener", "consultar", "obtener_con_version")
+# Raíz del proyecto, para reconocer los marcos de la app al buscar el origen de una llamada
+_RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SERVICIOS = os.path.join(_RAIZ, "src", "services")
+_VIEWMODELS = os.path.join(_RAIZ, "src", "viewmodel")
+
+# Registros activos en el contexto actual (un request, una prueba...). Es una tupla para poder
+# anidarlos; las lecturas en hilos de asyncio.to_thread heredan el contexto y llegan al mismo registro.
+_activos = contextvars.ContextVar("registros_lecturas", default=())
+# Origen anotado por FirebaseServiceAsync: el hilo de trabajo no ve la pila del ViewModel que espera
+_origen = contextvars.ContextVar("origen_lecturas", default=None)
+
+
+class PresupuestoExcedido(AssertionError):
+    """Un bloque vigilado en modo estricto hizo más llamadas al backend que su presupuesto."""
+
+
+class RegistroLlamadas:
+    def __init__(self, nombre, presupuesto=None):
+        self.nombre = nombre
+        self.presupuesto = presupuesto
+        self.llamadas = []  # (operacion, ruta, origen)
+        self.avisos = []
+        self._lock = threading.Lock()
+
+    def agregar(self, operacion, ruta, origen):
+        with self._lock:
+            self.llamadas.append((operacion, arbol.unir_ruta(ruta), origen))
+
+    def excedido(self):
+        return self.presupuesto is not None and len(self.llamadas) > self.presupuesto
+
+
+def _buscar_origen(marco):
+    # (ViewModel más cercano como 'Clase.metodo', primer marco del proyecto fuera de src/services)
+    respaldo = None
+    while marco is not None:
+        archivo = os.path.abspath(marco.f_code.co_filename)
+        if archivo.startswith(_VIEWMODELS):
+            objeto = marco.f_locals.get("self")
+            clase = f"{type(objeto).__name__}." if objeto is not None else ""
+            return f"{clase}{marco.f_code.co_name}", respaldo
+        if respaldo is None and archivo.startswith(_RAIZ) and not archivo.startswith(_SERVICIOS):
+            respaldo = f"{os.path.splitext(os.path.basename(archivo))[0]}:{marco.f_code.co_name}"
+        marco = marco.f_back
+    return None, respaldo
+
+
+def origen_llamada():
+    """
+    'Clase.metodo' del ViewModel que hizo la llamada: el más cercano en la pila o, en un
+    hilo de FirebaseServiceAsync, el que anotó anotar_origen(). Si no hay ninguno (ruta de
+    app.py, script, prueba) devuelve 'archivo:funcion' del primer marco del proyecto.
+    """
+    viewmodel, respaldo = _buscar_origen(sys._getframe(1))
+    return viewmodel or _origen.get() or respaldo or "desconocido"
+
+
+def anotar_origen():
+    """
+    Guarda en el contexto el ViewModel que está llamando, antes de pasar la llamada a otro
+    hilo o a tareas de asyncio.gather (ambos copian el contexto). Solo si hay algo vigilando.
+    """
+    if _activos.get():
+        viewmodel, _ = _buscar_origen(sys._getframe(1))
+        if viewmodel:
+            _origen.set(viewmodel)
+
+
+def analizar(registro, umbral_hermanas=5):
+    """
+    Devuelve la lista de avisos (dicts) del registro:
+    - lectura_repetida: la misma ruta se leyó del backend más de una vez.
+    - rafaga_hermanas: un mismo origen leyó 'umbral_hermanas' o más rutas que solo difieren
+      en un segmento (grupos/*/nombre, eventos/*...), el patrón típico de un N+1.
+    - presupuesto_excedido: hubo más llamadas que el presupuesto del registro.
+    """
+    lecturas = [(op, ruta, origen) for op, ruta, origen in registro.llamadas if op in LECTURAS]
+    avisos = []
+
+    veces = Counter((op, ruta) for op, ruta, _ in lecturas)
+    origenes = defaultdict(set)
+    for op, ruta, origen in lecturas:
+        origenes[(op, ruta)].add(origen)
+    for (op, ruta), n in sorted(veces.items()):
+        if n > 1:
+            avisos.append({"tipo": "lectura_repetida", "operacion": op, "ruta": ruta, "veces": n,
+                           "origenes": sorted(origenes[(op, ruta)])})
+
+    hermanas = defaultdict(set)  # (origen, patrón) -> rutas distintas
+    for _, ruta, origen in lecturas:
+        segmentos = arbol.partir_ruta(ruta)
+        for i in range(1, len(segmentos)):
+            hermanas[(origen, "/".join(segmentos[:i] + ["*"] + segmentos[i + 1:]))].add(ruta)
+    reportadas = set()
+    for (origen, patron), rutas in sorted(hermanas.items(), key=lambda item: (-len(item[1]), item[0])):
+        if len(rutas) >= umbral_hermanas and (origen, frozenset(rutas)) not in reportadas:
+            reportadas.add((origen, frozenset(rutas)))
+            avisos.append({"tipo": "rafaga_hermanas", "origen": origen, "patron": patron, "lecturas": len(rutas)})
+
+    if registro.excedido():
+        avisos.append({"tipo": "presupuesto_excedido", "llamadas": len(registro.llamadas),
+                       "presupuesto": registro.presupuesto})
+    return avisos
+
+
+class DetectorLecturas:
+    """
+    Observador de FirebaseService (service.observar_llamadas). Solo registra llamadas
+    dentro de un bloque activo: iniciar()/terminar() alrededor de un request, o vigilar()
+    en pruebas. Con 'muestreo' < 1 solo se vigila esa fracción de los requests (canary).
+    """
+
+    def __init__(self, umbral_hermanas=5, muestreo=1.0):
+        self.umbral_hermanas = umbral_hermanas
+        self.muestreo = muestreo
+
+    def __call__(self, operacion, ruta, segundos, tamano):
+        activos = _activos.get()
+        if not activos:
+            return
+        origen = origen_llamada()
+        for registro in activos:
+            registro.agregar(operacion, ruta, origen)
+
+    def iniciar(self, nombre, presupuesto=None):
+        """Empieza a registrar. Devuelve (registro, token) o None si el muestreo lo descarta."""
+        if self.muestreo < 1 and random.random() >= self.muestreo:
+            return None
+        registro = RegistroLlamadas(nombre, presupuesto)
+        return registro, _activos.set(_activos.get() + (registro,))
+
+    def terminar(self, registro, token):
+        """Deja de registrar, analiza y escribe cada aviso en el log como una línea JSON."""
+        _activos.reset(token)
+        registro.avisos = analizar(registro, self.umbral_hermanas)
+        for aviso in registro.avisos:
+            logger.warning(json.dumps({"evento": "lecturas_redundantes", "bloque": registro.nombre, **aviso},
+                                      ensure_ascii=False))
+        return registro.avisos
+
+    @contextmanager
+    def vigilar(self, nombre="bloque", presupuesto=None, estricto=True):
+        """
+        Para pruebas: registra las llamadas del bloque 'with' y, si 'estricto' y se supera
+        el presupuesto, lanza PresupuestoExcedido con las llamadas hechas.
+        """
+        registro = RegistroLlamadas(nombre, presupuesto)
+        token = _activos.set(_activos.get() + (registro,))
+        try:
+            yield registro
+        finally:
+            self.terminar(registro, token)
+        if estricto and registro.excedido():
+            detalle = "\n".join(f"  {op} {ruta} ({origen})" for op, ruta, origen in registro.llamadas)
+            raise PresupuestoExcedido(
+                f"{nombre}: {len(registro.llamadas)} llamadas al backend (presupuesto {presupuesto})\n{detalle}"
+            )
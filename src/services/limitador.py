@@ -0,0 +1,135 @@
+# src/services/limitador.py
+# Control de admisión en el proceso: límite de tasa por cubetas de tokens y tope de concurrencia.
+
+import math
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+
+class LimitadorTasa:
+    """
+    Una cubeta de tokens por clave (por ejemplo 'auth:ip:1.2.3.4' o 'escritura:correo:ana@...').
+    Cada cubeta guarda hasta 'capacidad' tokens y recupera 'tasa' tokens por segundo;
+    cada solicitud gasta un token. Solo se guardan las 'max_claves' cubetas usadas más
+    recientemente, para que muchas IPs distintas no agoten la memoria.
+    """
+
+    def __init__(self, max_claves=10000, reloj=time.monotonic):
+        self.max_claves = max_claves
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._cubetas = OrderedDict()  # clave -> (tokens, actualizado_en)
+        self.permitidas = Counter()  # regla -> solicitudes admitidas
+        self.rechazadas = Counter()  # regla -> solicitudes rechazadas
+
+    def _recargar(self, clave, capacidad, tasa, ahora):
+        # Tokens actuales de la cubeta (llamar con el lock tomado)
+        tokens, actualizado_en = self._cubetas.pop(clave, (capacidad, ahora))
+        return min(capacidad, tokens + (ahora - actualizado_en) * tasa)
+
+    def _guardar(self, clave, tokens, ahora):
+        self._cubetas[clave] = (tokens, ahora)
+        while len(self._cubetas) > self.max_claves:
+            self._cubetas.popitem(last=False)
+
+    def tomar(self, clave, capacidad, tasa):
+        """Gasta un token de la cubeta. Devuelve (permitido, segundos hasta el próximo token)."""
+        return self.tomar_todas([clave], capacidad, tasa)
+
+    def tomar_todas(self, claves, capacidad, tasa):
+        """
+        Gasta un token de cada cubeta solo si todas tienen uno; si alguna no, no se gasta
+        ninguno. Devuelve (permitido, segundos hasta que todas tengan token).
+        """
+        ahora = self._reloj()
+        with self._lock:
+            tokens = {clave: self._recargar(clave, capacidad, tasa, ahora) for clave in claves}
+            permitido = all(t >= 1 for t in tokens.values())
+            for clave, t in tokens.items():
+                self._guardar(clave, t - 1 if permitido else t, ahora)
+        espera = 0.0 if permitido else max((1 - t) / tasa for t in tokens.values() if t < 1)
+        return permitido, espera
+
+    def permitir(self, regla, claves, capacidad, tasa):
+        """
+        La solicitud pasa solo si hay token en todas sus cubetas (IP, correo...); si una
+        la rechaza, las demás conservan su token.
+        Devuelve (permitido, segundos para reintentar redondeados hacia arriba).
+        """
+        permitido, espera = self.tomar_todas([f"{regla}:{clave}" for clave in claves], capacidad, tasa)
+        with self._lock:
+            if permitido:
+                self.permitidas[regla] += 1
+            else:
+                self.rechazadas[regla] += 1
+        return permitido, math.ceil(espera)
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "permitidas": dict(self.permitidas),
+                "rechazadas": dict(self.rechazadas),
+                "cubetas": len(self._cubetas),
+            }
+
+
+class LimiteConcurrencia:
+    """
+    Tope de solicitudes atendidas a la vez. Si no hay cupo tras 'espera' segundos,
+    la solicitud se rechaza en lugar de encolarse frente a Firebase.
+    """
+
+    def __init__(self, maximo, espera=0.0):
+        self.maximo = maximo
+        self.espera = espera
+        self._semaforo = threading.BoundedSemaphore(maximo)
+        self._lock = threading.Lock()
+        self.activas = 0
+        self.pico = 0
+        self.admitidas = 0
+        self.rechazadas = 0
+
+    def entrar(self):
+        if self.espera:
+            admitida = self._semaforo.acquire(timeout=self.espera)
+        else:
+            admitida = self._semaforo.acquire(blocking=False)
+        if not admitida:
+            with self._lock:
+                self.rechazadas += 1
+            return False
+        with self._lock:
+            self.activas += 1
+            self.admitidas += 1
+            self.pico = max(self.pico, self.activas)
+        return True
+
+    def salir(self):
+        with self._lock:
+            self.activas -= 1
+        self._semaforo.release()
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "maximo": self.maximo,
+                "activas": self.activas,
+                "pico": self.pico,
+                "admitidas": self.admitidas,
+                "rechazadas": self.rechazadas,
+            }
+
+
+def regla_desde_entorno(nombre, por_defecto):
+    """
+    Lee una regla 'capacidad/segundos' de la variable de entorno 'nombre'
+    (por ejemplo LIMITE_AUTH=10/60: ráfagas de 10 y 10 solicitudes por minuto).
+    Devuelve (capacidad, tasa por segundo) o None si la variable vale '0' (sin límite).
+    """
+    valor = (os.getenv(nombre) or por_defecto).strip()
+    if valor == "0":
+        return None
+    capacidad, segundos = valor.split("/")
+    return int(capacidad), int(capacidad) / float(segundos)
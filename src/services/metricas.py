@@ -0,0 +1,138 @@
+# src/services/metricas.py
+# Registro de métricas en memoria con salida en el formato de texto de Prometheus (/metrics).
+
+import bisect
+import math
+import threading
+from collections import defaultdict
+
+# Límites (segundos) de los histogramas de latencia
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas_texto(etiquetas, extra=()):
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in pares) + "}"
+
+
+def _numero(valor):
+    if valor == math.inf:
+        return "+Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+def prefijo_ruta(ruta, niveles=1):
+    # 'grupos/club_cine/integrantes' -> 'grupos': agrupa las llamadas sin una serie por cada id
+    segmentos = [s for s in str(ruta or "").split("/") if s]
+    return "/".join(segmentos[:niveles]) or "/"
+
+
+class RegistroMetricas:
+    """
+    Contadores, medidores (gauges) e histogramas con etiquetas, seguros entre hilos.
+    Todos los hilos del proceso escriben en el mismo registro y texto() lo expone completo.
+    Los 'recolectores' son funciones que al exponer devuelven métricas calculadas en ese
+    momento (estadísticas del limitador, la caché, las transacciones...).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tipos = {}  # nombre -> (tipo, ayuda, límites)
+        self._valores = defaultdict(float)  # (nombre, etiquetas) -> valor de contador o medidor
+        self._histogramas = {}  # (nombre, etiquetas) -> [conteos por límite, suma, total]
+        self._recolectores = []
+
+    def describir(self, nombre, tipo, ayuda, limites=LIMITES_LATENCIA):
+        with self._lock:
+            self._tipos[nombre] = (tipo, ayuda, tuple(limites) if tipo == "histogram" else None)
+
+    def agregar_recolector(self, funcion):
+        """funcion() -> [(nombre, tipo, ayuda, [(etiquetas_dict, valor), ...]), ...]"""
+        self._recolectores.append(funcion)
+
+    @staticmethod
+    def _clave(nombre, etiquetas):
+        return nombre, tuple(sorted((etiquetas or {}).items()))
+
+    def incrementar(self, nombre, etiquetas=None, valor=1):
+        with self._lock:
+            self._valores[self._clave(nombre, etiquetas)] += valor
+
+    def observar(self, nombre, valor, etiquetas=None):
+        clave = self._clave(nombre, etiquetas)
+        with self._lock:
+            limites = self._tipos[nombre][2]
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                histograma = self._histogramas[clave] = [[0] * len(limites), 0.0, 0]
+            posicion = bisect.bisect_left(limites, valor)
+            if posicion < len(limites):
+                histograma[0][posicion] += 1
+            histograma[1] += valor
+            histograma[2] += 1
+
+    def valor(self, nombre, etiquetas=None):
+        with self._lock:
+            return self._valores.get(self._clave(nombre, etiquetas), 0.0)
+
+    def texto(self):
+        """Todas las métricas en el formato de exposición de texto de Prometheus."""
+        with self._lock:
+            tipos = dict(self._tipos)
+            valores = dict(self._valores)
+            histogramas = {clave: (list(h[0]), h[1], h[2]) for clave, h in self._histogramas.items()}
+
+        lineas = []
+        for nombre, (tipo, ayuda, limites) in sorted(tipos.items()):
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+            if tipo == "histogram":
+                for (n, etiquetas), (conteos, suma, total) in sorted(histogramas.items()):
+                    if n != nombre:
+                        continue
+                    acumulado = 0
+                    for limite, conteo in zip(limites, conteos):
+                        acumulado += conteo
+                        lineas.append(f"{nombre}_bucket{_etiquetas_texto(etiquetas, [('le', _numero(limite))])} {acumulado}")
+                    lineas.append(f"{nombre}_bucket{_etiquetas_texto(etiquetas, [('le', '+Inf')])} {total}")
+                    lineas.append(f"{nombre}_sum{_etiquetas_texto(etiquetas)} {_numero(suma)}")
+                    lineas.append(f"{nombre}_count{_etiquetas_texto(etiquetas)} {total}")
+            else:
+                for (n, etiquetas), valor in sorted(valores.items()):
+                    if n == nombre:
+                        lineas.append(f"{nombre}{_etiquetas_texto(etiquetas)} {_numero(valor)}")
+
+        for recolector in self._recolectores:
+            for nombre, tipo, ayuda, muestras in recolector():
+                lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+                for etiquetas, valor in muestras:
+                    lineas.append(f"{nombre}{_etiquetas_texto(sorted((etiquetas or {}).items()))} {_numero(valor)}")
+        return "\n".join(lineas) + "\n"
+
+
+class MetricasFirebase:
+    """
+    Observador de FirebaseService (service.observar_llamadas): cuenta cada llamada al backend
+    por operación y prefijo de ruta, con su latencia (histograma) y, si el servicio mide bytes
+    (observar_llamadas(..., medir_bytes=True)), los bytes de datos leídos o escritos.
+    """
+
+    def __init__(self, registro):
+        self.registro = registro
+        registro.describir("firebase_llamadas_segundos", "histogram",
+                           "Latencia de las llamadas al backend de datos por operación y prefijo de ruta.")
+        registro.describir("firebase_bytes_total", "counter",
+                           "Bytes de datos (JSON) leídos o escritos por operación y prefijo de ruta.")
+
+    def __call__(self, operacion, ruta, segundos, tamano):
+        etiquetas = {"operacion": operacion, "prefijo": prefijo_ruta(ruta)}
+        self.registro.observar("firebase_llamadas_segundos", segundos, etiquetas)
+        if tamano is not None:
+            self.registro.incrementar("firebase_bytes_total", etiquetas, tamano)
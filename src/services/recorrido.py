@@ -0,0 +1,20 @@
+# src/services/recorrido.py
+# Recorre los hijos de una ruta por páginas de claves, sin leer el nodo completo.
+
+
+def recorrer_por_clave(service, ruta, tamano_pagina=500):
+    """
+    Genera (clave, valor) de los hijos de 'ruta' en orden de clave, pidiendo 'tamano_pagina'
+    hijos por consulta (order_by_key + start_at + limit_to_first). Solo hay una página en memoria.
+    """
+    ultima = None
+    while True:
+        pagina = service.consultar(ruta, desde=ultima, limite=tamano_pagina + (ultima is not None))
+        if ultima is not None and pagina and pagina[0][0] == ultima:
+            pagina = pagina[1:]  # start_at es inclusivo
+        if not pagina:
+            return
+        yield from pagina
+        if len(pagina) < tamano_pagina:
+            return
+        ultima = pagina[-1][0]
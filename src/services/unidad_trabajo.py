@@ -0,0 +1,208 @@
+# src/services/unidad_trabajo.py
+# Unidad de trabajo por request: deduplica lecturas y agrupa las escrituras.
+
+import copy
+import threading
+
+from src.services import arbol
+
+
+class UnidadDeTrabajo:
+    """
+    Envuelve un FirebaseService con la misma interfaz durante un request:
+    - Cada ruta se lee como máximo una vez; las rutas hijas de una ruta ya leída
+      se sirven desde esa lectura (mapa de identidad por ruta).
+    - Las escrituras se acumulan (ya combinadas, sin rutas superpuestas) y se envían
+      juntas en una sola actualización multi-ruta al llamar a confirmar().
+    - Las lecturas posteriores a una escritura ven el valor escrito.
+    - obtener_objeto() devuelve siempre el mismo objeto (Grupo, Usuario...) para una ruta,
+      así los ViewModels del mismo request comparten lo ya cargado.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._lock = threading.RLock()
+        self._lecturas = {}  # ruta -> nodo (formato interno de arbol)
+        self._pendientes = {}  # ruta -> nodo a escribir (None = borrar)
+        self._objetos = {}  # (ruta, fabrica) -> objeto
+        self.lecturas_evitadas = 0
+        self._transacciones = 0  # cambia cuando una transacción escribe por fuera de la unidad
+        self._escrituras = 0  # cambia con cada escritura pendiente
+
+    @property
+    def backend(self):
+        return self.service.backend
+
+    # --- Lecturas ---
+
+    def _derivar(self, ruta):
+        """Busca la ruta (o un padre) entre lo ya leído o lo pendiente de escribir."""
+        segmentos = arbol.partir_ruta(ruta)
+        for i in range(len(segmentos), -1, -1):
+            padre = "/".join(segmentos[:i])
+            for fuente in (self._pendientes, self._lecturas):
+                if padre in fuente:
+                    return True, arbol.leer(fuente[padre], segmentos[i:])
+        return False, None
+
+    def obtener_datos(self, ruta):
+        ruta = arbol.unir_ruta(ruta)
+        with self._lock:
+            encontrado, nodo = self._derivar(ruta)
+            if encontrado:
+                self.lecturas_evitadas += 1
+                return arbol.desde_arbol(nodo)
+
+            transacciones = self._transacciones
+
+        # La lectura al backend se hace sin el lock: otras lecturas del request
+        # (por ejemplo desde FirebaseServiceAsync) pueden ir en paralelo
+        nodo = arbol.a_arbol(self.service.obtener_datos(ruta))
+
+        with self._lock:
+            encontrado, ya_leido = self._derivar(ruta)
+            if encontrado:
+                return arbol.desde_arbol(ya_leido)
+            if transacciones != self._transacciones:
+                # Una transacción cambió datos mientras se leía: se vuelve a leer
+                return self.obtener_datos(ruta)
+            # Las escrituras pendientes dentro de la ruta se aplican sobre lo leído
+            for pendiente, valor in self._pendientes.items():
+                if arbol.es_ancestro_o_igual(ruta, pendiente):
+                    relativa = arbol.partir_ruta(pendiente)[len(arbol.partir_ruta(ruta)):]
+                    nodo = arbol.escribir(nodo, relativa, copy.deepcopy(valor))
+            self._lecturas[ruta] = nodo
+            return arbol.desde_arbol(nodo)
+
+    def obtener_objeto(self, ruta, fabrica):
+        """Devuelve fabrica(datos) para la ruta, reutilizando el mismo objeto durante el request."""
+        ruta = arbol.unir_ruta(ruta)
+        clave = (ruta, fabrica)
+        with self._lock:
+            if clave in self._objetos:
+                return self._objetos[clave]
+            version = (self._escrituras, self._transacciones)
+        datos = self.obtener_datos(ruta)
+        with self._lock:
+            objeto = fabrica(datos) if datos else None
+            if version != (self._escrituras, self._transacciones):
+                return objeto  # hubo escrituras durante la lectura: no se guarda
+            # Si otra lectura concurrente ya lo construyó, se devuelve ese mismo objeto
+            return self._objetos.setdefault(clave, objeto)
+
+    def consultar(self, ruta, ordenar_por=None, desde=None, hasta=None, limite=None):
+        ruta = arbol.unir_ruta(ruta)
+        with self._lock:
+            # La consulta la resuelve el backend: primero se envía lo pendiente bajo la ruta
+            if any(arbol.rutas_relacionadas(ruta, pendiente) for pendiente in self._pendientes):
+                self.confirmar()
+            resultado = self.service.consultar(ruta, ordenar_por, desde, hasta, limite)
+            # Cada hijo devuelto queda como leído para el resto del request
+            for clave, valor in resultado:
+                self._lecturas.setdefault(arbol.unir_ruta(f"{ruta}/{clave}"), arbol.a_arbol(valor))
+            return resultado
+
+    # --- Escrituras (quedan pendientes hasta confirmar) ---
+
+    def _escribir(self, ruta, valor):
+        ruta = arbol.unir_ruta(ruta)
+        segmentos = arbol.partir_ruta(ruta)
+        nodo = arbol.a_arbol(valor)
+        with self._lock:
+            self._escrituras += 1
+            # 1. Combinar con las escrituras pendientes
+            for pendiente in list(self._pendientes):
+                if pendiente != ruta and arbol.es_ancestro_o_igual(pendiente, ruta):
+                    relativa = segmentos[len(arbol.partir_ruta(pendiente)):]
+                    self._pendientes[pendiente] = arbol.escribir(self._pendientes[pendiente], relativa, copy.deepcopy(nodo))
+                    break
+            else:
+                for pendiente in list(self._pendientes):
+                    if arbol.es_ancestro_o_igual(ruta, pendiente):
+                        del self._pendientes[pendiente]
+                self._pendientes[ruta] = nodo
+
+            # 2. Mantener coherentes las lecturas ya hechas
+            for leida in list(self._lecturas):
+                if arbol.es_ancestro_o_igual(leida, ruta):
+                    relativa = segmentos[len(arbol.partir_ruta(leida)):]
+                    self._lecturas[leida] = arbol.escribir(self._lecturas[leida], relativa, copy.deepcopy(nodo))
+                elif arbol.es_ancestro_o_igual(ruta, leida):
+                    del self._lecturas[leida]
+
+            # 3. Los objetos construidos sobre rutas afectadas se vuelven a construir al pedirlos
+            self._olvidar_objetos(ruta)
+
+    def _olvidar_objetos(self, ruta):
+        for clave in list(self._objetos):
+            if arbol.rutas_relacionadas(clave[0], ruta):
+                del self._objetos[clave]
+
+    def guardar_datos(self, ruta, datos):
+        self._escribir(ruta, datos)
+
+    def eliminar_datos(self, ruta):
+        self._escribir(ruta, None)
+
+    def actualizar_datos(self, ruta, nuevos_datos):
+        self._escribir(ruta, nuevos_datos)
+
+    def actualizar_campo(self, ruta, campo, nuevo_valor):
+        self._escribir(f"{ruta}/{campo}", nuevo_valor)
+
+    def actualizar_parcial(self, ruta, campos):
+        with self._lock:
+            for campo, valor in campos.items():
+                self._escribir(f"{ruta}/{campo}", valor)
+
+    def actualizar_multiples(self, cambios):
+        with self._lock:
+            for ruta, valor in cambios.items():
+                self._escribir(ruta, valor)
+
+    # --- Transacciones: no se pueden diferir ---
+
+    def transaccion(self, ruta, funcion, max_reintentos=25):
+        with self._lock:
+            # Lo pendiente se envía antes para que la transacción parta del estado real
+            self.confirmar()
+            resultado = self.service.transaccion(ruta, funcion, max_reintentos)
+            self._transacciones += 1
+            for leida in list(self._lecturas):
+                if arbol.rutas_relacionadas(leida, ruta):
+                    del self._lecturas[leida]
+            self._olvidar_objetos(ruta)
+            return resultado
+
+    def estadisticas_transacciones(self):
+        return self.service.estadisticas_transacciones()
+
+    def suscribir_cambios(self, funcion):
+        # Los suscriptores se enteran de las escrituras cuando se confirman en el servicio
+        self.service.suscribir_cambios(funcion)
+
+    # --- Cierre del request ---
+
+    def hay_pendientes(self):
+        with self._lock:
+            return bool(self._pendientes)
+
+    def confirmar(self):
+        """Envía todas las escrituras pendientes en una sola actualización multi-ruta."""
+        with self._lock:
+            if not self._pendientes:
+                return
+            cambios = {ruta: arbol.desde_arbol(valor) for ruta, valor in self._pendientes.items()}
+            try:
+                self.service.actualizar_multiples(cambios)
+            except Exception:
+                # Lo que no se pudo escribir no debe verse ni reintentarse en este request
+                self.descartar()
+                raise
+            self._pendientes.clear()
+
+    def descartar(self):
+        with self._lock:
+            self._pendientes.clear()
+            self._lecturas.clear()
+            self._objetos.clear()
@@ -0,0 +1,52 @@
+# src/services/versiones.py
+# Sellos de versión de los datos que muestran las páginas, para responder GET condicionales (ETag).
+#   versiones/catalogo          cambia con cualquier escritura en grupos, membresías o eventos
+#   versiones/grupos/{id_grupo} cambia con las escrituras de ese grupo o de sus eventos
+#   versiones/nombres           cambia cuando cambia algún nombre para mostrar
+#   versiones/usuarios/{key}    cambia con las escrituras de los datos de ese usuario
+#   versiones/busqueda          cambia al crear o borrar un grupo o cambiar un campo indexado
+#                               (nombre, descripción, categoría); no con uniones ni eventos
+
+import os
+import time
+
+RUTA_VERSIONES = "versiones"
+
+
+def nuevo_sello():
+    # Nanosegundos más un sufijo aleatorio: dos procesos que escriben a la vez no repiten sello
+    return f"{time.time_ns():x}-{os.urandom(3).hex()}"
+
+
+def cambios_version(grupos=(), eliminados=(), nombres=False, usuarios=(), busqueda=False):
+    """
+    Rutas de versión a incluir en la misma actualización multi-ruta que hace el cambio,
+    así el sello y los datos se escriben juntos.
+    """
+    sello = nuevo_sello()
+    cambios = {}
+    for id_grupo in grupos:
+        cambios[f"{RUTA_VERSIONES}/grupos/{id_grupo}"] = sello
+    for id_grupo in eliminados:
+        cambios[f"{RUTA_VERSIONES}/grupos/{id_grupo}"] = None
+    if grupos or eliminados:
+        cambios[f"{RUTA_VERSIONES}/catalogo"] = sello
+    if nombres:
+        cambios[f"{RUTA_VERSIONES}/nombres"] = sello
+    if busqueda:
+        cambios[f"{RUTA_VERSIONES}/busqueda"] = sello
+    for correo_key in usuarios:
+        cambios[f"{RUTA_VERSIONES}/usuarios/{correo_key}"] = sello
+    return cambios
+
+
+def leer_versiones(service, *claves):
+    """Sellos actuales, por ejemplo leer_versiones(service, 'catalogo', 'grupos/club_cine')."""
+    return [service.obtener_datos(f"{RUTA_VERSIONES}/{clave}") for clave in claves]
+
+
+async def versiones_grupos_async(service_async, ids_grupo):
+    """Sellos versiones/grupos/{id} de varios grupos, leídos en paralelo: {id_grupo: sello}."""
+    ids = list(dict.fromkeys(i for i in ids_grupo if i))
+    sellos = await service_async.obtener_varios([f"{RUTA_VERSIONES}/grupos/{i}" for i in ids])
+    return dict(zip(ids, sellos))
@@ -0,0 +1,14 @@
+# src/utils/claves.py
+# Funciones para construir claves válidas en rutas de Firebase.
+
+def clave_correo(correo: str) -> str:
+    """
+    Firebase no permite ciertos caracteres en las rutas ('.', '@', ...),
+    por eso el correo se transforma antes de usarlo como clave.
+    """
+    return correo.replace('@', '_at_').replace('.', '_dot_')
+
+
+def correo_desde_clave(clave: str) -> str:
+    """Inversa de clave_correo: 'ana_at_unal_dot_edu_dot_co' -> 'ana@unal.edu.co'."""
+    return clave.replace('_dot_', '.').replace('_at_', '@')
@@ -0,0 +1,117 @@
+# src/utils/estaticos.py
+# Archivos estáticos con huella de contenido: static/clubes.css -> static/dist/clubes.<hash>.css
+# Como el nombre cambia cuando cambia el contenido, el navegador puede guardarlos un año sin revalidar.
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+
+try:
+    import brotli  # Opcional: sin él solo se generan variantes .gz
+except ImportError:
+    brotli = None
+
+CARPETA_DIST = "dist"
+MANIFIESTO = "manifest.json"
+# Solo vale la pena comprimir texto; PNG/JPG ya vienen comprimidos
+EXTENSIONES_COMPRIMIBLES = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+# Codificaciones precomprimidas, en orden de preferencia
+VARIANTES = (("br", ".br"), ("gzip", ".gz"))
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+
+
+def huella(contenido, largo=10):
+    return hashlib.sha256(contenido).hexdigest()[:largo]
+
+
+def _escribir(ruta, contenido):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "wb") as archivo:
+        archivo.write(contenido)
+
+
+def construir(origen, destino=None):
+    """
+    Copia cada archivo de 'origen' (menos 'dist/') a 'destino' con la huella en el nombre,
+    escribe las variantes .gz y .br de los archivos de texto y el manifiesto
+    {"clubes.css": "dist/clubes.<hash>.css"}. Devuelve el manifiesto.
+    """
+    destino = destino or os.path.join(origen, CARPETA_DIST)
+    manifiesto = {}
+    for carpeta, subcarpetas, archivos in os.walk(origen):
+        # No se procesa la propia salida
+        subcarpetas[:] = [s for s in subcarpetas if os.path.join(carpeta, s) != destino]
+        for nombre in sorted(archivos):
+            ruta = os.path.join(carpeta, nombre)
+            relativa = os.path.relpath(ruta, origen).replace(os.sep, "/")
+            with open(ruta, "rb") as archivo:
+                contenido = archivo.read()
+
+            base, extension = os.path.splitext(relativa)
+            con_huella = f"{base}.{huella(contenido)}{extension}"
+            salida = os.path.join(destino, con_huella)
+            _escribir(salida, contenido)
+
+            if extension.lower() in EXTENSIONES_COMPRIMIBLES:
+                # mtime=0 para que el mismo CSS produzca siempre el mismo .gz
+                _escribir(salida + ".gz", gzip.compress(contenido, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _escribir(salida + ".br", brotli.compress(contenido, quality=11))
+
+            manifiesto[relativa] = f"{CARPETA_DIST}/{con_huella}"
+
+    _escribir(os.path.join(destino, MANIFIESTO), json.dumps(manifiesto, indent=2, sort_keys=True).encode("utf-8"))
+    return manifiesto
+
+
+def cargar_manifiesto(carpeta_static):
+    ruta = os.path.join(carpeta_static, CARPETA_DIST, MANIFIESTO)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def registrar_estaticos(app):
+    """
+    Conecta el manifiesto con Flask:
+    - url_for('static', filename='clubes.css') devuelve la versión con huella si existe.
+    - Los archivos de dist/ se sirven con caché inmutable de un año y, si el navegador
+      acepta br/gzip, con la variante ya comprimida en lugar de comprimir en cada request.
+    Sin manifiesto (no se corrió el build) todo sigue funcionando con los archivos originales.
+    """
+    manifiesto = cargar_manifiesto(app.static_folder)
+    app.extensions["manifiesto_estaticos"] = manifiesto
+
+    @app.url_defaults
+    def nombre_con_huella(endpoint, valores):
+        if endpoint == "static" and valores.get("filename") in manifiesto:
+            valores["filename"] = manifiesto[valores["filename"]]
+
+    # Debe registrarse antes que los demás before_request para no pasar por la admisión
+    @app.before_request
+    def servir_precomprimido():
+        if request.endpoint != "static":
+            return None
+        nombre = (request.view_args or {}).get("filename", "")
+        if not nombre.startswith(CARPETA_DIST + "/"):
+            return None
+
+        aceptadas = request.headers.get("Accept-Encoding", "")
+        for codificacion, sufijo in VARIANTES:
+            if codificacion in aceptadas and os.path.isfile(os.path.join(app.static_folder, nombre + sufijo)):
+                respuesta = send_from_directory(
+                    app.static_folder, nombre + sufijo,
+                    mimetype=mimetypes.guess_type(nombre)[0] or "application/octet-stream",
+                )
+                respuesta.headers["Content-Encoding"] = codificacion
+                break
+        else:
+            respuesta = send_from_directory(app.static_folder, nombre)
+        respuesta.headers["Cache-Control"] = CACHE_INMUTABLE
+        respuesta.headers["Vary"] = "Accept-Encoding"
+        return respuesta
@@ -7,3 +7,12 @@ def es_correo_valido(correo: str) -> bool:
     Retorna True si termina en '@unal.edu.co', False en caso contrario.
     """
     return isinstance(correo, str) and correo.endswith("@unal.edu.co")
+
+
+# Largo mínimo de la contraseña al registrarse (formulario y carga masiva)
+LONGITUD_MINIMA_CONTRASENA = 8
+
+
+def es_contrasena_valida(password) -> bool:
+    """Retorna True si la contraseña tiene al menos LONGITUD_MINIMA_CONTRASENA caracteres."""
+    return isinstance(password, str) and len(password) >= LONGITUD_MINIMA_CONTRASENA
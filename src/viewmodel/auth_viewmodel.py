@@ -3,7 +3,8 @@
 
 from src.model.usuario import Usuario
 from src.services.firebase import FirebaseService
-from src.utils.validaciones import es_correo_valido  # Función que valida correos institucionales
+from src.services.versiones import cambios_version
+from src.utils.validaciones import es_contrasena_valida, es_correo_valido  # Validaciones comunes
 
 
 class UsuarioAuthViewModel:
@@ -27,7 +28,7 @@ class UsuarioAuthViewModel:
             return {'success': False, 'error': 'El correo debe ser institucional @unal.edu.co'}
 
         # 1.1 Validar longitud minima de la contrasena
-        if len(password or "") < 8:
+        if not es_contrasena_valida(password):
             return {'success': False, 'error': 'La contrasena debe tener al menos 8 caracteres.'}
 
         # 2. Crear clave 'segura' para almacenar usuario en Firebase
@@ -48,8 +49,12 @@ class UsuarioAuthViewModel:
             carrera=carrera
         )
 
-        # 5. Guardar en Firebase
-        self.service.guardar_datos(ruta_usuario, usuario.to_dict())
+        # 5. Guardar en Firebase el usuario y su nombre para mostrar (nombres/{correo_key})
+        self.service.actualizar_multiples({
+            ruta_usuario: usuario.to_dict(),
+            f"nombres/{correo_key}": nombre,
+            **cambios_version(nombres=True),
+        })
 
         # Devolver los datos completos para iniciar sesión automáticamente
         return {
@@ -87,7 +92,7 @@ class UsuarioAuthViewModel:
         if not es_correo_valido(correo):
             return {'success': False, 'error': 'Correo institucional incorrecto.'}
 
-        if len(password) < 8:
+        if not es_contrasena_valida(password):
             return {'success': False, 'error': 'La contrasena debe tener al menos 8 caracteres.'}
 
         return {'success': True}
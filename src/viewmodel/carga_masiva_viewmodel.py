@@ -0,0 +1,254 @@
+# carga_masiva_viewmodel.py
+# Importación y exportación masiva de usuarios, grupos y eventos (lo usa carga_masiva.py)
+
+import asyncio
+import uuid
+from itertools import islice
+
+from src.model.evento import Evento
+from src.model.grupo import CATEGORIAS, Grupo
+from src.model.usuario import Usuario
+from src.services.firebase import FirebaseService
+from src.services.firebase_async import FirebaseServiceAsync
+from src.services.recorrido import recorrer_por_clave
+from src.services.versiones import cambios_version
+from src.utils.claves import clave_correo
+from src.utils.validaciones import LONGITUD_MINIMA_CONTRASENA, es_contrasena_valida, es_correo_valido
+
+TIPOS = ("usuarios", "grupos", "eventos")
+
+
+def _texto(fila, *campos):
+    # Primer campo presente y no vacío (el CSV puede traer 'nombre' o 'nombre_completo')
+    for campo in campos:
+        valor = fila.get(campo)
+        if valor not in (None, ""):
+            return str(valor).strip()
+    return ""
+
+
+def _correos(valor):
+    # Lista de correos: una lista (JSONL) o un texto separado por ';' (CSV)
+    if isinstance(valor, (list, tuple)):
+        return [str(c).strip() for c in valor if str(c).strip()]
+    return [c.strip() for c in str(valor or "").split(";") if c.strip()]
+
+
+class CargaMasivaViewModel:
+    """
+    Carga registros validados con las mismas reglas que los formularios y los escribe por
+    lotes: cada lote es UNA actualización multi-ruta (datos, índices y sellos de versión).
+    Los registros llegan como (numero_linea, dict) desde cualquier iterable, así el archivo
+    se lee en streaming y nunca está completo en memoria.
+    """
+
+    def __init__(self, service=None):
+        self.service = service if service else FirebaseService()
+        self.service_async = FirebaseServiceAsync(self.service)
+        self.ruta_usuarios = "usuarios"
+        self.ruta_nombres = "nombres"
+        self.ruta_grupos = "grupos"
+        self.ruta_membresias = "membresias"
+        self.ruta_eventos = "eventos"
+        self._nombres = None  # correo_key -> nombre, se lee una vez al primer uso
+        self._grupos_existentes = {}  # id_grupo -> bool, para no volver a preguntar
+
+    # --- Importación ---
+
+    def importar(self, tipo, registros, tamano_lote=500, al_confirmar=None):
+        """
+        Importa los registros de 'tipo' ('usuarios', 'grupos' o 'eventos').
+        Tras escribir cada lote llama a al_confirmar(procesados, resumen): ahí se guarda el
+        punto de control y se muestra el progreso. Devuelve el resumen con los rechazos
+        [(linea, error)] y cuántos registros ya existían (omitidos).
+        """
+        if tipo not in TIPOS:
+            return {'success': False, 'error': f"Tipo desconocido: {tipo}"}
+        preparar = getattr(self, f"_preparar_{tipo}")
+        resumen = {'success': True, 'procesados': 0, 'escritos': 0, 'omitidos': 0, 'rechazados': []}
+
+        registros = iter(registros)
+        while True:
+            lote = list(islice(registros, tamano_lote))
+            if not lote:
+                break
+            legibles = []
+            for linea, fila in lote:
+                if "_error" in fila:
+                    resumen['rechazados'].append((linea, fila["_error"]))
+                else:
+                    legibles.append((linea, fila))
+            cambios, escritos = preparar(legibles, resumen)
+            if cambios:
+                self.service.actualizar_multiples(cambios)
+            resumen['procesados'] += len(lote)
+            resumen['escritos'] += escritos
+            if al_confirmar:
+                al_confirmar(resumen['procesados'], resumen)
+        return resumen
+
+    def _nombres_registrados(self):
+        if self._nombres is None:
+            self._nombres = self.service.obtener_datos(self.ruta_nombres) or {}
+        return self._nombres
+
+    def _grupos_que_existen(self, ids):
+        # Solo se lee el nombre de cada grupo aún no consultado, todos en paralelo
+        nuevos = [gid for gid in dict.fromkeys(ids) if gid not in self._grupos_existentes]
+        if nuevos:
+            nombres = asyncio.run(self.service_async.obtener_varios(
+                [f"{self.ruta_grupos}/{gid}/nombre" for gid in nuevos]))
+            self._grupos_existentes.update({gid: bool(n) for gid, n in zip(nuevos, nombres)})
+        return {gid for gid in ids if self._grupos_existentes.get(gid)}
+
+    def _preparar_usuarios(self, lote, resumen):
+        # El directorio nombres/ sirve para saber qué correos ya están registrados sin leer usuarios/
+        registrados = self._nombres_registrados()
+        cambios = {}
+        for linea, fila in lote:
+            nombre = _texto(fila, "nombre_completo", "nombre")
+            correo = _texto(fila, "correo")
+            password = _texto(fila, "contraseña", "password")
+            carrera = _texto(fila, "carrera")
+            if not nombre or not correo or not password or not carrera:
+                resumen['rechazados'].append((linea, "Todos los campos son obligatorios."))
+                continue
+            if not es_correo_valido(correo):
+                resumen['rechazados'].append((linea, "El correo debe ser institucional @unal.edu.co"))
+                continue
+            if not es_contrasena_valida(password):
+                resumen['rechazados'].append(
+                    (linea, f"La contrasena debe tener al menos {LONGITUD_MINIMA_CONTRASENA} caracteres."))
+                continue
+            correo_key = clave_correo(correo)
+            if correo_key in registrados:
+                resumen['omitidos'] += 1
+                continue
+
+            usuario = Usuario.crear_usuario(nombre, correo, password, carrera,
+                                            descripcion_personal=_texto(fila, "descripcion_personal"))
+            if fila.get("id_usuario"):
+                usuario.id_usuario = str(fila["id_usuario"])
+            cambios[f"{self.ruta_usuarios}/{correo_key}"] = usuario.to_dict()
+            cambios[f"{self.ruta_nombres}/{correo_key}"] = nombre
+            registrados[correo_key] = nombre
+        if cambios:
+            cambios.update(cambios_version(nombres=True))
+        return cambios, sum(1 for ruta in cambios if ruta.startswith(f"{self.ruta_usuarios}/"))
+
+    def _preparar_grupos(self, lote, resumen):
+        validos = {}
+        for linea, fila in lote:
+            nombre = _texto(fila, "nombre")
+            categoria = _texto(fila, "categoria")
+            organizadores = _correos(fila.get("organizadores"))
+            integrantes = _correos(fila.get("integrantes"))
+            if not nombre or not organizadores:
+                resumen['rechazados'].append((linea, "El grupo necesita nombre y al menos un organizador."))
+                continue
+            if categoria not in CATEGORIAS:
+                resumen['rechazados'].append((linea, f"Categoría inválida: {categoria or '(vacía)'}"))
+                continue
+            invalidos = [c for c in organizadores + integrantes if not es_correo_valido(c)]
+            if invalidos:
+                resumen['rechazados'].append((linea, f"Correo no institucional: {invalidos[0]}"))
+                continue
+
+            grupo = Grupo(nombre=nombre, descripcion=_texto(fila, "descripcion"), categoria=categoria,
+                          organizadores=organizadores, integrantes=organizadores + integrantes,
+                          id_grupo=_texto(fila, "id_grupo") or None)
+            if grupo.id_grupo in validos:
+                resumen['omitidos'] += 1
+                continue
+            validos[grupo.id_grupo] = grupo
+
+        existentes = self._grupos_que_existen(list(validos))
+        cambios = {}
+        for id_grupo, grupo in validos.items():
+            if id_grupo in existentes:
+                resumen['omitidos'] += 1
+                continue
+            cambios[f"{self.ruta_grupos}/{id_grupo}"] = grupo.to_firebase()
+            for correo in grupo.integrantes:
+                rol = "organizador" if correo in grupo.organizadores else "miembro"
+                cambios[f"{self.ruta_membresias}/{clave_correo(correo)}/{id_grupo}"] = rol
+            self._grupos_existentes[id_grupo] = True
+        escritos = [gid for gid in validos if gid not in existentes]
+        if escritos:
+            usuarios = {clave_correo(c) for gid in escritos for c in validos[gid].integrantes}
+            cambios.update(cambios_version(grupos=escritos, usuarios=sorted(usuarios), busqueda=True))
+        return cambios, len(escritos)
+
+    def _preparar_eventos(self, lote, resumen):
+        validos = []
+        for linea, fila in lote:
+            id_grupo = _texto(fila, "grupo", "id_grupo")
+            fecha = _texto(fila, "fecha")
+            hora = _texto(fila, "hora")
+            descripcion = _texto(fila, "descripcion")
+            creado_por = _texto(fila, "creado_por_email", "creado_por")
+            if not id_grupo or not fecha or not descripcion or not creado_por:
+                resumen['rechazados'].append((linea, "El evento necesita grupo, fecha, descripción y creador."))
+                continue
+            if Evento.calcular_marca_tiempo(fecha, hora) is None:
+                resumen['rechazados'].append((linea, f"Fecha u hora inválida: {fecha} {hora}".strip()))
+                continue
+            if not es_correo_valido(creado_por):
+                resumen['rechazados'].append((linea, f"Correo no institucional: {creado_por}"))
+                continue
+            validos.append((linea, id_grupo, fecha, hora, descripcion, creado_por, fila))
+
+        existentes = self._grupos_que_existen([v[1] for v in validos])
+        nombres = self._nombres_registrados()
+        cambios = {}
+        grupos = set()
+        for linea, id_grupo, fecha, hora, descripcion, creado_por, fila in validos:
+            if id_grupo not in existentes:
+                resumen['rechazados'].append((linea, f"Grupo no encontrado: {id_grupo}"))
+                continue
+            # Sin id en el archivo se deriva uno de los datos: reimportar el mismo archivo
+            # (por ejemplo tras retomar desde un punto de control) no duplica eventos
+            id_evento = _texto(fila, "id") or str(uuid.uuid5(
+                uuid.NAMESPACE_URL, "|".join((id_grupo, fecha, hora, descripcion, creado_por))))
+            evento = Evento(fecha, hora, descripcion, creado_por,
+                            _texto(fila, "creado_por_nombre") or nombres.get(clave_correo(creado_por)),
+                            id_evento=id_evento, creado_en_iso=_texto(fila, "creado_en_iso") or None)
+            cambios[f"{self.ruta_eventos}/{id_grupo}/{evento.id}"] = evento.to_dict()
+            grupos.add(id_grupo)
+        escritos = len(cambios)
+        if grupos:
+            cambios.update(cambios_version(grupos=sorted(grupos)))
+        return cambios, escritos
+
+    # --- Exportación ---
+
+    def exportar(self, tipo, tamano_lote=500):
+        """
+        Genera los registros de 'tipo' en el mismo formato que acepta importar(), leyendo la
+        base por páginas de 'tamano_lote' claves. Los eventos se leen por páginas de grupos.
+        """
+        if tipo == "usuarios":
+            for _, datos in recorrer_por_clave(self.service, self.ruta_usuarios, tamano_lote):
+                if datos:
+                    yield {campo: datos.get(campo) for campo in
+                           ("id_usuario", "nombre_completo", "correo", "contraseña", "carrera", "descripcion_personal")}
+        elif tipo == "grupos":
+            for id_grupo, datos in recorrer_por_clave(self.service, self.ruta_grupos, tamano_lote):
+                if datos:
+                    grupo = Grupo.from_dict({**datos, "id_grupo": datos.get("id_grupo") or id_grupo})
+                    yield {
+                        "id_grupo": grupo.id_grupo,
+                        "nombre": grupo.nombre,
+                        "descripcion": grupo.descripcion,
+                        "categoria": grupo.categoria,
+                        "organizadores": list(grupo.organizadores),
+                        "integrantes": list(grupo.integrantes),
+                    }
+        elif tipo == "eventos":
+            # Cada hijo de eventos/ trae todos los eventos de un grupo: se piden menos por página
+            for id_grupo, eventos in recorrer_por_clave(self.service, self.ruta_eventos, max(1, tamano_lote // 50)):
+                for datos in (eventos or {}).values():
+                    if datos:
+                        yield {"grupo": id_grupo, **Evento.from_dict(datos).to_dict()}
+        else:
+            raise ValueError(f"Tipo desconocido: {tipo}")
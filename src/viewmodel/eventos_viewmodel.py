@@ -1,104 +1,207 @@
-from datetime import datetime
+import asyncio
+import time
 
 from src.model.evento import Evento
 from src.model.grupo import Grupo
+from src.services.directorio_nombres import DirectorioNombres
+from src.services.firebase_async import FirebaseServiceAsync
 from src.services.firebase_global import firebase_global
-from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+from src.services.recorrido import recorrer_por_clave
+from src.services.versiones import cambios_version
+from src.utils.claves import clave_correo
 
 class EventosViewModel:
-    def __init__(self, service=None):
+    def __init__(self, service=None, directorio=None):
         self.service = service if service else firebase_global
+        # Misma conexión con métodos async, para esperar varias lecturas a la vez
+        self.service_async = FirebaseServiceAsync(self.service)
+        self._directorio = directorio  # se crea al usarlo si no se pasa
         self.ruta_grupos = "grupos"
+        # Cada evento es un nodo propio: eventos/{id_grupo}/{id_evento}
+        self.ruta_eventos = "eventos"
 
-    def _parsear_fecha_evento(self, evento):
-        fecha = evento.get("fecha")
-        hora = (evento.get("hora") or "00:00").strip()
-        if not fecha:
-            return None
+    @property
+    def directorio(self):
+        # Crearlo se suscribe a las escrituras del servicio: solo se hace si este ViewModel lo usa
+        if self._directorio is None:
+            self._directorio = DirectorioNombres(self.service)
+        return self._directorio
 
-        intentos = (
-            (f"{fecha} {hora}", "%Y-%m-%d %H:%M"),
-            (f"{fecha} {hora}", "%Y-%m-%d %H:%M:%S"),
-            (fecha, "%Y-%m-%d"),
-        )
-        for valor, formato in intentos:
-            try:
-                return datetime.strptime(valor, formato)
-            except ValueError:
-                continue
-        return None
+    def _ruta_evento(self, id_grupo, id_evento=None):
+        ruta = f"{self.ruta_eventos}/{id_grupo}"
+        return f"{ruta}/{id_evento}" if id_evento else ruta
 
-    def _limpiar_eventos_vencidos(self, id_grupo, grupo):
-        if not grupo or not getattr(grupo, "eventos", None):
-            return
+    @staticmethod
+    def _marca_tiempo(evento):
+        # Usa la marca precalculada; solo los registros antiguos sin marca se parsean
+        marca = evento.get("marca_tiempo")
+        if marca is None:
+            marca = Evento.calcular_marca_tiempo(evento.get("fecha"), evento.get("hora"))
+        return marca
 
-        ahora = datetime.now()
-        vigentes = []
-        for evento in grupo.eventos:
-            dt_evento = self._parsear_fecha_evento(evento)
-            if dt_evento and dt_evento < ahora:
-                continue
-            vigentes.append(evento)
+    def _esta_vencido(self, evento, ahora):
+        marca = self._marca_tiempo(evento)
+        return marca is not None and marca < ahora
 
-        if len(vigentes) != len(grupo.eventos):
-            grupo.eventos = vigentes
-            self._guardar_grupo(id_grupo, grupo.to_dict())
+    def _ordenar(self, eventos):
+        # Orden ascendente por fecha+hora; los eventos sin fecha van primero
+        return sorted(eventos, key=lambda e: self._marca_tiempo(e) or 0)
 
-    def _obtener_grupo(self, id_grupo):
-        data = self.service.obtener_datos(f"{self.ruta_grupos}/{id_grupo}")
-        grupo = Grupo.from_dict(data) if data else None
-        if grupo:
-            self._limpiar_eventos_vencidos(id_grupo, grupo)
-        return grupo
+    def _filtrar_rango(self, eventos, desde=None, hasta=None):
+        # 'desde'/'hasta' son segundos epoch; nunca se devuelven eventos ya pasados
+        inicio = max(desde or 0, int(time.time()))
+        resultado = []
+        for e in eventos:
+            marca = self._marca_tiempo(e)
+            if marca is None:
+                # Sin fecha válida: solo aparece cuando no se pidió un rango
+                if desde is None and hasta is None:
+                    resultado.append(e)
+            elif marca >= inicio and (hasta is None or marca <= hasta):
+                resultado.append(e)
+        return resultado
+
+    def _vigentes(self, eventos, desde=None, hasta=None):
+        # Solo lectura: los vencidos se filtran en memoria y los borra el barrido periódico
+        return self._filtrar_rango([e for e in (eventos or {}).values() if e], desde, hasta)
+
+    def _leer_eventos_grupo(self, id_grupo, desde=None, hasta=None):
+        return self._vigentes(self.service.obtener_datos(self._ruta_evento(id_grupo)), desde, hasta)
 
-    def _guardar_grupo(self, id_grupo, grupo_dict):
-        self.service.actualizar_datos(f"{self.ruta_grupos}/{id_grupo}", grupo_dict)
+    def purgar_eventos_vencidos(self, tamano_lote=500, grupos_por_pagina=50):
+        """
+        Borra de eventos/ todos los eventos cuya fecha ya pasó, en lotes de 'tamano_lote'
+        rutas por actualización. eventos/ se recorre por páginas de 'grupos_por_pagina'
+        grupos, así un barrido nunca tiene el árbol completo en memoria.
+        Devuelve el número de eventos borrados.
+        """
+        ahora = int(time.time())
+        borrados = 0
+        vencidos = []  # (id_grupo, ruta) pendientes de borrar
+
+        def borrar(lote):
+            cambios = {ruta: None for _, ruta in lote}
+            # Los grupos con eventos borrados cambian de versión en la misma escritura
+            cambios.update(cambios_version(grupos={gid for gid, _ in lote}))
+            self.service.actualizar_multiples(cambios)
+            return len(lote)
+
+        for gid, eventos in recorrer_por_clave(self.service, self.ruta_eventos, grupos_por_pagina):
+            if not isinstance(eventos, dict):
+                continue
+            vencidos += [(gid, self._ruta_evento(gid, eid))
+                         for eid, evento in eventos.items() if evento and self._esta_vencido(evento, ahora)]
+            while len(vencidos) >= tamano_lote:
+                borrados += borrar(vencidos[:tamano_lote])
+                vencidos = vencidos[tamano_lote:]
+        if vencidos:
+            borrados += borrar(vencidos)
+        return borrados
+
+    def _obtener_grupo(self, id_grupo):
+        return self.service.obtener_objeto(f"{self.ruta_grupos}/{id_grupo}", Grupo.from_dict)
 
     def crear_evento(self, id_grupo, fecha, hora, descripcion, creado_por_email):
-        grupo = self._obtener_grupo(id_grupo)
-        if not grupo:
+        # Basta con saber que el grupo existe: se lee solo su nombre
+        if not self.service.obtener_datos(f"{self.ruta_grupos}/{id_grupo}/nombre"):
             return {"success": False, "error": "Grupo no encontrado"}
 
+        # Solo se lee el nombre del creador, no todo su registro de usuario
         try:
-            usuario_vm = UsuarioViewModel(self.service)
-            usuario = usuario_vm.obtener_usuario(creado_por_email)
-            nombre_creador = usuario.nombre if usuario else None
+            nombre_creador = self.directorio.nombre_de(creado_por_email)
         except Exception:
             nombre_creador = None
 
         evento = Evento(fecha, hora, descripcion, creado_por_email, nombre_creador)
-        grupo.agregar_evento(evento.to_dict())
-        self._guardar_grupo(id_grupo, grupo.to_dict())
+        # Se escribe solo el nodo del evento (más el sello de versión del grupo),
+        # no el documento del grupo ni otros eventos
+        self.service.actualizar_multiples({
+            self._ruta_evento(id_grupo, evento.id): evento.to_dict(),
+            **cambios_version(grupos=[id_grupo]),
+        })
         return {"success": True, "evento": evento.to_dict()}
 
-    def obtener_eventos_por_grupo(self, id_grupo):
-        grupo = self._obtener_grupo(id_grupo)
-        if not grupo:
-            return []
-        return sorted(grupo.eventos, key=lambda e: (e.get("fecha", ""), e.get("hora", "")))
+    def obtener_eventos_por_grupo(self, id_grupo, desde=None, hasta=None):
+        # 'desde' y 'hasta' (segundos epoch) permiten pedir solo un rango de fechas
+        return self._ordenar(self._leer_eventos_grupo(id_grupo, desde, hasta))
 
-    def obtener_eventos_por_usuario(self, correo):
-        grupos = self.service.obtener_datos(self.ruta_grupos) or {}
+    def obtener_eventos_por_usuario(self, correo, desde=None, hasta=None):
+        # Solo para código síncrono: las lecturas por grupo van en paralelo (un viaje, no 2 por grupo)
+        return asyncio.run(self.obtener_eventos_por_usuario_async(correo, desde, hasta))
+
+    # --- Lecturas async: las rutas pueden esperarlas juntas con asyncio.gather ---
+
+    async def obtener_eventos_por_grupo_async(self, id_grupo, desde=None, hasta=None):
+        eventos = await self.service_async.obtener_datos(self._ruta_evento(id_grupo))
+        return self._ordenar(self._vigentes(eventos, desde, hasta))
+
+    async def obtener_eventos_por_usuario_async(self, correo, desde=None, hasta=None):
+        # Tras leer el índice, los eventos y el nombre de cada grupo se leen todos en paralelo
+        indice = await self.service_async.obtener_datos(f"membresias/{clave_correo(correo)}") or {}
+        ids = list(indice)
+        eventos_por_grupo, nombres = await asyncio.gather(
+            self.service_async.obtener_varios([self._ruta_evento(gid) for gid in ids]),
+            self.service_async.obtener_varios([f"{self.ruta_grupos}/{gid}/nombre" for gid in ids]),
+        )
         eventos_usuario = []
-        for gid, gdata in grupos.items():
-            if not gdata:
-                continue
-            grupo = Grupo.from_dict(gdata)
-            self._limpiar_eventos_vencidos(gid, grupo)
-            if correo in getattr(grupo, "integrantes", []):
-                for e in grupo.eventos:
-                    ev = e.copy()
-                    ev["grupo_id"] = gid
-                    ev["grupo_nombre"] = getattr(grupo, "nombre", "Sin nombre")
-                    eventos_usuario.append(ev)
-        return sorted(eventos_usuario, key=lambda e: (e.get("fecha", ""), e.get("hora", "")))
+        for gid, eventos, nombre_grupo in zip(ids, eventos_por_grupo, nombres):
+            for e in self._vigentes(eventos, desde, hasta):
+                ev = e.copy()
+                ev["grupo_id"] = gid
+                ev["grupo_nombre"] = nombre_grupo or "Sin nombre"
+                eventos_usuario.append(ev)
+        return self._ordenar(eventos_usuario)
 
     def eliminar_evento(self, id_grupo, id_evento):
-        grupo = self._obtener_grupo(id_grupo)
-        if not grupo:
+        # Igual que al crear: basta con leer el nombre para saber si el grupo existe
+        if not self.service.obtener_datos(f"{self.ruta_grupos}/{id_grupo}/nombre"):
             return {"success": False, "error": "Grupo no encontrado"}
-        eliminado = grupo.eliminar_evento_por_id(id_evento)
-        if eliminado:
-            self._guardar_grupo(id_grupo, grupo.to_dict())
-            return {"success": True}
-        return {"success": False, "error": "Evento no encontrado"}
+        ruta = self._ruta_evento(id_grupo, id_evento)
+        if not self.service.obtener_datos(ruta):
+            return {"success": False, "error": "Evento no encontrado"}
+        self.service.actualizar_multiples({ruta: None, **cambios_version(grupos=[id_grupo])})
+        return {"success": True}
+
+    def migrar_eventos_embebidos(self):
+        """
+        Mueve los arreglos 'eventos' guardados dentro de grupos/{id} a eventos/{id}/{id_evento}.
+        Devuelve el número de eventos migrados.
+        """
+        grupos = self.service.obtener_datos(self.ruta_grupos) or {}
+        migrados = 0
+        for gid, gdata in grupos.items():
+            embebidos = (gdata or {}).get("eventos") or []
+            if isinstance(embebidos, dict):
+                embebidos = list(embebidos.values())
+            if not embebidos:
+                continue
+            # Por grupo: se crean los nodos y se borra el arreglo en una sola actualización
+            cambios = {f"{self.ruta_grupos}/{gid}/eventos": None, **cambios_version(grupos=[gid])}
+            for e in embebidos:
+                if not e:
+                    continue
+                evento = Evento.from_dict(e)
+                cambios[self._ruta_evento(gid, evento.id)] = evento.to_dict()
+                migrados += 1
+            self.service.actualizar_multiples(cambios)
+        return migrados
+
+    def completar_marcas_tiempo(self, tamano_lote=500):
+        """
+        Agrega 'marca_tiempo' a los eventos guardados antes de que existiera el campo.
+        Escribe solo ese campo, en lotes de 'tamano_lote' rutas. Devuelve cuántos completó.
+        """
+        todos = self.service.obtener_datos(self.ruta_eventos) or {}
+        cambios = {}
+        for gid, eventos in todos.items():
+            if not isinstance(eventos, dict):
+                continue
+            for eid, evento in eventos.items():
+                if evento and evento.get("marca_tiempo") is None:
+                    marca = Evento.calcular_marca_tiempo(evento.get("fecha"), evento.get("hora"))
+                    if marca is not None:
+                        cambios[f"{self._ruta_evento(gid, eid)}/marca_tiempo"] = marca
+        rutas = list(cambios)
+        for inicio in range(0, len(rutas), tamano_lote):
+            self.service.actualizar_multiples({r: cambios[r] for r in rutas[inicio:inicio + tamano_lote]})
+        return len(rutas)
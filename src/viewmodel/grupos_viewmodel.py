@@ -2,23 +2,41 @@
 
 # Importamos la clase Grupo (nuestro modelo de datos de grupos)
 # y FirebaseService (para conectarnos y manipular Firebase)
-from datetime import datetime
+import asyncio
 
-from src.model.evento import Evento
-from src.model.grupo import Grupo
+from src.model.grupo import Grupo, correos_a_firebase, correos_desde_firebase
+from src.services.busqueda import IndiceBusqueda
+from src.services.directorio_nombres import DirectorioNombres
 from src.services.firebase import FirebaseService
-from src.viewmodel.usuarios_viewmodel import UsuarioViewModel  
+from src.services.firebase_async import FirebaseServiceAsync
+from src.services.versiones import cambios_version
+from src.utils.claves import clave_correo
 
 
 class GruposViewModel:
     # Clase que maneja la lógica de los grupos y su conexión con Firebase
 
-    def __init__(self, service=None):
+    def __init__(self, service=None, directorio=None, indice=None):
         # Si nos pasan un servicio de Firebase, lo usamos; si no, creamos uno nuevo
         # Esto permite inyectar un servicio diferente para pruebas o futuras mejoras
         self.service = service if service else FirebaseService()
+        # Misma conexión con métodos async, para esperar varias lecturas a la vez
+        self.service_async = FirebaseServiceAsync(self.service)
+        # Directorio de nombres para mostrar; se puede compartir entre ViewModels (se crea al usarlo si no se pasa)
+        self._directorio = directorio
+        # Índice de búsqueda de grupos; la app comparte uno solo (se crea al buscar si no se pasa)
+        self.indice = indice
         # Definimos la "carpeta" principal en Firebase donde estarán todos los grupos
         self.ruta_grupos = "grupos"
+        # Índice inverso: membresias/{correo_key}/{id_grupo} = rol del usuario en el grupo
+        self.ruta_membresias = "membresias"
+
+    @property
+    def directorio(self):
+        # Crearlo se suscribe a las escrituras del servicio: solo se hace si este ViewModel lo usa
+        if self._directorio is None:
+            self._directorio = DirectorioNombres(self.service)
+        return self._directorio
 
     # --- CRUD Básico: Crear, Leer, Actualizar, Eliminar ---
 
@@ -34,22 +52,26 @@ class GruposViewModel:
         )
         # Definimos la ruta en Firebase donde guardaremos este grupo
         ruta = f"{self.ruta_grupos}/{grupo.id_grupo}"
-        # Guardamos los datos del grupo en Firebase como diccionario
-        self.service.guardar_datos(ruta, grupo.to_dict())
+        # Guardamos el grupo y las membresías de sus integrantes en una sola escritura atómica
+        cambios = {ruta: grupo.to_firebase()}
+        for correo in grupo.integrantes:
+            cambios[self._ruta_membresia(correo, grupo.id_grupo)] = self._rol_en_grupo(grupo, correo)
+        cambios.update(cambios_version(grupos=[grupo.id_grupo], usuarios=self._claves_de(grupo), busqueda=True))
+        self.service.actualizar_multiples(cambios)
         # Retornamos el diccionario para usarlo fácilmente en el frontend o más lógica
         return grupo.to_dict()
     
     def obtener_grupo(self, id_grupo):
-        datos = self.service.obtener_datos(f"{self.ruta_grupos}/{id_grupo}") or {}
-        if datos:
-            grupo = Grupo.from_dict(datos)
-            self._limpiar_eventos_vencidos(id_grupo, grupo)
-            return grupo
-        return None
+        # Dentro de un request (UnidadDeTrabajo) todos los ViewModels comparten el mismo objeto
+        return self.service.obtener_objeto(f"{self.ruta_grupos}/{id_grupo}", Grupo.from_dict)
 
     def guardar_grupo_dict(self, id_grupo, grupo_dict):
-        # actualiza todo el documento
-        self.service.actualizar_datos(f"{self.ruta_grupos}/{id_grupo}", grupo_dict)
+        # actualiza todo el documento (junto con su sello de versión); las listas se guardan como mapas
+        grupo = Grupo.from_dict(grupo_dict)
+        self.service.actualizar_multiples({
+            f"{self.ruta_grupos}/{id_grupo}": grupo.to_firebase(),
+            **cambios_version(grupos=[id_grupo], usuarios=self._claves_de(grupo), busqueda=True),
+        })
 
     def listar_grupos(self):
         # Lista todos los grupos guardados en Firebase
@@ -59,8 +81,55 @@ class GruposViewModel:
         # Si no hay grupos, devolvemos lista vacía
         if not data:
             return []
-        # Convertimos cada diccionario a objeto Grupo y luego a dict (para frontend)
-        return [Grupo(**info).to_dict() for info in data.values()]
+        # Convertimos cada diccionario a objeto Grupo y luego a su resumen (para frontend),
+        # sin decodificar ni copiar las listas de integrantes y organizadores
+        return [Grupo.from_dict(info).resumen() for info in data.values() if info]
+
+    def listar_grupos_pagina(self, categoria=None, cursor=None, tamano=12):
+        """
+        Devuelve una página del catálogo: {'grupos': [resúmenes], 'siguiente': cursor o None}.
+        Solo se leen tamano + 1 grupos (el extra indica si hay otra página). El cursor es
+        el id del primer grupo de la página siguiente.
+        """
+        if categoria:
+            # Ordenado por "Categoría|id_grupo": solo los grupos de esa categoría, por id
+            prefijo = f"{categoria}|"
+            filas = self.service.consultar(
+                self.ruta_grupos, ordenar_por="categoria_clave",
+                desde=prefijo + (cursor or ""), hasta=prefijo + "\uf8ff", limite=tamano + 1,
+            )
+        else:
+            filas = self.service.consultar(self.ruta_grupos, desde=cursor, limite=tamano + 1)
+
+        filas = [(clave, datos) for clave, datos in filas if datos]
+        siguiente = filas[tamano][0] if len(filas) > tamano else None
+        grupos = [Grupo.from_dict(datos).resumen() for _, datos in filas[:tamano]]
+        return {"grupos": grupos, "siguiente": siguiente}
+
+    def buscar_grupos(self, texto, categoria=None, limite=20, version=None):
+        # Búsqueda por nombre, descripción y categoría, ordenada por relevancia.
+        # 'version' es el sello versiones/busqueda actual (ver IndiceBusqueda.buscar)
+        if self.indice is None:
+            self.indice = IndiceBusqueda(self.service)
+        return self.indice.buscar(texto, categoria, limite, version)
+
+    def completar_categoria_clave(self, tamano_lote=500):
+        """
+        Agrega 'categoria_clave' a los grupos creados antes de la paginación por categoría.
+        Devuelve cuántos grupos se actualizaron.
+        """
+        grupos = self.service.obtener_datos(self.ruta_grupos) or {}
+        cambios = {}
+        for gid, datos in grupos.items():
+            if not datos:
+                continue
+            clave = Grupo.from_dict(datos).categoria_clave
+            if datos.get("categoria_clave") != clave:
+                cambios[f"{self.ruta_grupos}/{gid}/categoria_clave"] = clave
+        rutas = list(cambios)
+        for inicio in range(0, len(rutas), tamano_lote):
+            self.service.actualizar_multiples({r: cambios[r] for r in rutas[inicio:inicio + tamano_lote]})
+        return len(rutas)
 
     def actualizar_grupo(self, id_grupo, nombre=None, descripcion=None, categoria=None):
         # Actualiza la información de un grupo existente
@@ -70,10 +139,19 @@ class GruposViewModel:
         # Si no existe, devolvemos False indicando que no se pudo actualizar
         if not grupo:
             return False
+        antes = {"nombre": grupo.nombre, "descripcion": grupo.descripcion, "categoria": grupo.categoria}
         # Llamamos al método del modelo para actualizar la info
         grupo.actualizar_info(nombre, descripcion, categoria)
-        # Guardamos los cambios en Firebase
-        self.service.actualizar_datos(f"{self.ruta_grupos}/{id_grupo}", grupo.to_dict())
+        # Guardamos en Firebase solo los campos que cambiaron
+        cambios = {campo: getattr(grupo, campo) for campo, valor in antes.items() if getattr(grupo, campo) != valor}
+        if "categoria" in cambios:
+            cambios["categoria_clave"] = grupo.categoria_clave
+        if cambios:
+            rutas = {f"{self.ruta_grupos}/{id_grupo}/{campo}": valor for campo, valor in cambios.items()}
+            # El nombre se muestra en el perfil de cada integrante: cambian sus sellos
+            usuarios = self._claves_de(grupo) if "nombre" in cambios else ()
+            self.service.actualizar_multiples({
+                **rutas, **cambios_version(grupos=[id_grupo], usuarios=usuarios, busqueda=True)})
         return True
 
     def eliminar_grupo(self, id_grupo):
@@ -84,176 +162,249 @@ class GruposViewModel:
         if not grupo:
             return {'success': False, 'error': 'Grupo no encontrado.'}
 
-        # Eliminar el grupo de Firebase
-        self.service.eliminar_datos(f"{self.ruta_grupos}/{id_grupo}")
+        # Eliminar el grupo, sus eventos y sus membresías en una sola escritura atómica
+        self.service.actualizar_multiples(self._cambios_eliminar_grupo(grupo, id_grupo))
         return {'success': True, 'mensaje': f'Grupo {grupo.nombre} eliminado correctamente.'}
 
     # --- Gestión de integrantes del grupo ---
 
     def agregar_integrante(self, id_grupo, usuario):
-        # Agrega un usuario a la lista de integrantes de un grupo
+        # Agrega un usuario a los integrantes de un grupo
         
         # Obtenemos el grupo primero
         grupo = self.obtener_grupo(id_grupo)
         if not grupo:  # Si no existe, devolvemos False
             return False
-        # Intentamos agregar el usuario al grupo usando método de la clase Grupo
-        if grupo.agregar_integrante(usuario):
-            # Si se agregó correctamente, actualizamos Firebase
-            self.service.actualizar_datos(f"{self.ruta_grupos}/{id_grupo}", grupo.to_dict())
-            return True
-        # Si el usuario ya estaba, devolvemos False
-        return False
+        # Si ya es integrante no hay nada que escribir
+        if not grupo.agregar_integrante(usuario):
+            return False
+
+        # Se escribe solo el hijo integrantes/{correo_key} (no toda la lista), junto con
+        # el índice de membresías: uniones simultáneas tocan nodos distintos y no se pisan
+        self.service.actualizar_multiples({
+            self._ruta_integrante(id_grupo, usuario): usuario,
+            self._ruta_membresia(usuario, id_grupo): self._rol_en_grupo(grupo, usuario),
+            **cambios_version(grupos=[id_grupo], usuarios=[clave_correo(usuario)]),
+        })
+        return True
 
     def remover_integrante(self, id_grupo, usuario):
-        # Elimina un usuario de la lista de integrantes de un grupo
+        # Elimina un usuario de los integrantes de un grupo
        
         # Obtenemos el grupo
         grupo = self.obtener_grupo(id_grupo)
         if not grupo:
             return False
-        # Intentamos remover el usuario usando método de la clase Grupo
-        if grupo.remover_integrante(usuario):
-            # Actualizamos Firebase con la nueva lista de integrantes
-            self.service.actualizar_datos(f"{self.ruta_grupos}/{id_grupo}", grupo.to_dict())
-            return True
-        return False
-
-    def listar_grupos_con_usuarios(self):
-        # Retorna una lista de grupos, pero cada uno con los nombres de sus integrantes.
-        
-        # Obtenemos todos los grupos desde Firebase
-        grupos = self.listar_grupos()
-
-        # Para cada grupo, agregamos un nuevo campo 'nombres_integrantes'
-        for g in grupos:
-            nombres = []
+        if usuario not in grupo.integrantes:
+            return False
+        # Un organizador primero deja de serlo; si es el último, no puede salir
+        if usuario in grupo.organizadores:
+            if not self.cambiar_organizador(id_grupo, usuario, False):
+                return False
+            grupo.remover_organizador(usuario)
+        grupo.remover_integrante(usuario)
+
+        # Se borra solo su hijo en integrantes y su membresía del índice
+        self.service.actualizar_multiples({
+            self._ruta_integrante(id_grupo, usuario): None,
+            self._ruta_membresia(usuario, id_grupo): None,
+            **cambios_version(grupos=[id_grupo], usuarios=[clave_correo(usuario)]),
+        })
+        return True
 
-            # Recorremos los correos de los integrantes
-            for correo in g.get("integrantes", []):
-                # Importación solo dentro del método para evitar circularidad
-                from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
-                # Buscamos al usuario en Firebase usando UsuarioViewModel
-                usuario = UsuarioViewModel(self.service).obtener_usuario(correo)
+    def cambiar_organizador(self, id_grupo, correo, es_organizador):
+        """
+        Agrega o quita 'correo' de organizadores/ con una transacción (compare-and-set sobre el
+        nodo), así la regla "el grupo conserva al menos un organizador" se decide sobre la lista
+        más reciente aunque otros cambien roles o salgan a la vez. Devuelve False (sin escribir)
+        si quitarlo dejaría el grupo sin organizadores. No toca el índice de membresías.
+        """
+        ultimo = []
+
+        def aplicar(valor):
+            ultimo.clear()  # se vuelve a aplicar en cada reintento
+            organizadores = correos_desde_firebase(valor)
+            if es_organizador:
+                organizadores.add(correo)
+            elif correo in organizadores:
+                if len(organizadores) == 1:
+                    ultimo.append(correo)
+                    return valor
+                organizadores.discard(correo)
+            return correos_a_firebase(organizadores) if organizadores else valor
+
+        self.service.transaccion(f"{self.ruta_grupos}/{id_grupo}/organizadores", aplicar)
+        return not ultimo
+
+    def _ruta_integrante(self, id_grupo, correo, lista="integrantes"):
+        # grupos/{id_grupo}/integrantes/{correo_key} (o organizadores/{correo_key})
+        return f"{self.ruta_grupos}/{id_grupo}/{lista}/{clave_correo(correo)}"
+
+    def migrar_integrantes_a_mapas(self, tamano_lote=500):
+        """
+        Convierte integrantes y organizadores guardados como listas al formato de mapa
+        {correo_key: correo}. Devuelve cuántos grupos se migraron.
+        """
+        grupos = self.service.obtener_datos(self.ruta_grupos) or {}
+        pendientes = {}  # id_grupo -> {ruta: mapa}
+        for gid, datos in grupos.items():
+            if not datos:
+                continue
+            if all(isinstance(datos.get(lista), (dict, type(None))) for lista in ("integrantes", "organizadores")):
+                continue  # ya está en el formato nuevo
+            grupo = Grupo.from_dict(datos)
+            pendientes[gid] = {
+                f"{self.ruta_grupos}/{gid}/integrantes": correos_a_firebase(grupo.integrantes),
+                f"{self.ruta_grupos}/{gid}/organizadores": correos_a_firebase(grupo.organizadores),
+            }
+        ids = list(pendientes)
+        for inicio in range(0, len(ids), tamano_lote):
+            lote = ids[inicio:inicio + tamano_lote]
+            cambios = {ruta: valor for gid in lote for ruta, valor in pendientes[gid].items()}
+            self.service.actualizar_multiples({**cambios, **cambios_version(grupos=lote)})
+        return len(ids)
+
+    # --- Índice inverso de membresías ---
+
+    @staticmethod
+    def _claves_de(grupo):
+        # correo_key de integrantes y organizadores: sus perfiles muestran el grupo
+        return [clave_correo(c) for c in set(grupo.integrantes) | set(grupo.organizadores)]
+
+    @staticmethod
+    def _rol_en_grupo(grupo, correo):
+        return "organizador" if correo in grupo.organizadores else "miembro"
+
+    def _ruta_membresia(self, correo, id_grupo=None):
+        ruta = f"{self.ruta_membresias}/{clave_correo(correo)}"
+        return f"{ruta}/{id_grupo}" if id_grupo else ruta
+
+    def _cambios_eliminar_grupo(self, grupo, id_grupo):
+        # Rutas a borrar al eliminar un grupo: el documento, sus eventos y cada membresía
+        cambios = {
+            f"{self.ruta_grupos}/{id_grupo}": None,
+            self._eventos_vm()._ruta_evento(id_grupo): None,
+        }
+        for correo in set(grupo.integrantes) | set(grupo.organizadores):
+            cambios[self._ruta_membresia(correo, id_grupo)] = None
+        cambios.update(cambios_version(eliminados=[id_grupo], usuarios=self._claves_de(grupo), busqueda=True))
+        return cambios
+
+    def ids_grupos_de_usuario(self, correo):
+        # Lee solo el índice del usuario: {id_grupo: rol}
+        return self.service.obtener_datos(self._ruta_membresia(correo)) or {}
+
+    def grupos_de_usuario(self, correo):
+        # Devuelve los objetos Grupo a los que pertenece el usuario usando el índice
+        grupos = []
+        for id_grupo in self.ids_grupos_de_usuario(correo):
+            datos = self.service.obtener_datos(f"{self.ruta_grupos}/{id_grupo}")
+            if not datos:
+                continue  # entrada huérfana: el grupo ya no existe
+            grupo = Grupo.from_dict(datos)
+            if correo in grupo.integrantes:
+                grupos.append(grupo)
+        return grupos
 
-                # Si el usuario existe, añadimos su nombre; si no, dejamos el correo
-                if usuario:
-                    nombres.append(usuario.nombre)
-                else:
-                    nombres.append(correo)
+    # --- Lecturas async: las rutas pueden esperarlas juntas con asyncio.gather ---
 
-            # Agregamos la nueva lista al grupo
-            g["nombres_integrantes"] = nombres
+    async def obtener_grupo_async(self, id_grupo):
+        return await self.service_async.obtener_objeto(f"{self.ruta_grupos}/{id_grupo}", Grupo.from_dict)
 
-        # Devolvemos la lista de grupos con los nombres incluidos
-        return grupos
+    async def grupos_de_usuario_async(self, correo, indice=None):
+        # Igual que grupos_de_usuario, pero los grupos del índice se leen en paralelo.
+        # 'indice' es el mapa membresias/{correo_key} si ya se leyó
+        if indice is None:
+            indice = await self.service_async.obtener_datos(self._ruta_membresia(correo)) or {}
+        grupos = await asyncio.gather(*(self.obtener_grupo_async(id_grupo) for id_grupo in indice))
+        return [g for g in grupos if g and correo in g.integrantes]
 
-    def _parsear_fecha_evento(self, evento):
-        fecha = evento.get("fecha")
-        hora = (evento.get("hora") or "00:00").strip()
-        if not fecha:
+    async def obtener_detalle_async(self, id_grupo, version_nombres=None):
+        """
+        Grupo, próximos eventos y nombres de integrantes; las lecturas van en paralelo.
+        'version_nombres' es el sello versiones/nombres de la página, si ya se leyó.
+        """
+        if version_nombres is not None:
+            self.directorio.validar_version(version_nombres)
+        grupo, eventos = await asyncio.gather(
+            self.obtener_grupo_async(id_grupo),
+            self._eventos_vm().obtener_eventos_por_grupo_async(id_grupo),
+        )
+        if not grupo:
             return None
+        # Solo los nombres de los integrantes de este grupo, leídos juntos (o desde la caché)
+        nombres = await self.directorio.resolver_async(grupo.integrantes)
+        return {"grupo": grupo, "eventos": eventos, "nombres": nombres}
 
-        intentos = (
-            (f"{fecha} {hora}", "%Y-%m-%d %H:%M"),
-            (f"{fecha} {hora}", "%Y-%m-%d %H:%M:%S"),
-            (fecha, "%Y-%m-%d"),
-        )
-        for valor, formato in intentos:
-            try:
-                return datetime.strptime(valor, formato)
-            except ValueError:
+    def reconstruir_indice_membresias(self):
+        """
+        Recalcula todo el índice 'membresias' a partir de los grupos existentes
+        y lo escribe de una sola vez. Devuelve el número de membresías indexadas.
+        """
+        grupos = self.service.obtener_datos(self.ruta_grupos) or {}
+        indice = {}
+        total = 0
+        for gid, gdata in grupos.items():
+            if not gdata:
                 continue
-        return None
+            grupo = Grupo.from_dict(gdata)
+            id_grupo = grupo.id_grupo or gid
+            for correo in set(grupo.integrantes) | set(grupo.organizadores):
+                indice.setdefault(clave_correo(correo), {})[id_grupo] = self._rol_en_grupo(grupo, correo)
+                total += 1
+        # Las páginas que dependen del índice ("Mis grupos") cambian de versión
+        self.service.actualizar_multiples({self.ruta_membresias: indice, **cambios_version(grupos=list(grupos))})
+        return total
+
+    async def listar_grupos_con_usuarios_async(self):
+        # Retorna una lista de grupos, pero cada uno con los nombres de sus integrantes.
 
-    def _limpiar_eventos_vencidos(self, id_grupo, grupo):
-        if not grupo or not getattr(grupo, "eventos", None):
-            return
+        # Obtenemos todos los grupos desde Firebase (aquí sí hacen falta las listas de integrantes)
+        data = await self.service_async.obtener_datos(self.ruta_grupos) or {}
+        grupos = [Grupo.from_dict(info).to_dict() for info in data.values() if info]
 
-        ahora = datetime.now()
-        vigentes = []
-        for evento in grupo.eventos:
-            dt_evento = self._parsear_fecha_evento(evento)
-            if dt_evento and dt_evento < ahora:
-                continue
-            vigentes.append(evento)
+        # Resolvemos todos los correos de una sola vez con el directorio de nombres
+        correos = {correo for g in grupos for correo in g.get("integrantes", [])}
+        nombres = await self.directorio.resolver_async(correos)
+
+        # Para cada grupo, agregamos un nuevo campo 'nombres_integrantes'
+        # (si el usuario no tiene nombre registrado, se deja el correo)
+        for g in grupos:
+            g["nombres_integrantes"] = [nombres[correo] for correo in g.get("integrantes", [])]
+
+        # Devolvemos la lista de grupos con los nombres incluidos
+        return grupos
 
-        if len(vigentes) != len(grupo.eventos):
-            grupo.eventos = vigentes
-            self.guardar_grupo_dict(id_grupo, grupo.to_dict())
+    def listar_grupos_con_usuarios(self):
+        # Solo para código síncrono (scripts, menú de terminal); las vistas async esperan la versión async
+        return asyncio.run(self.listar_grupos_con_usuarios_async())
+
+    # --- Eventos: viven en eventos/{id_grupo}/{id_evento} y los maneja EventosViewModel ---
+
+    def _eventos_vm(self):
+        # Importación solo dentro del método para evitar circularidad
+        from src.viewmodel.eventos_viewmodel import EventosViewModel
+        return EventosViewModel(self.service, self._directorio)
 
     def crear_evento(self, id_grupo, fecha, hora, descripcion, creado_por_email):
         """
-        Crea un evento y lo añade al arreglo 'eventos' dentro del grupo en Firebase.
+        Crea un evento como nodo propio en eventos/{id_grupo}/{id_evento}.
         """
-        grupo = self.obtener_grupo(id_grupo)
-        if not grupo:
-            return {"success": False, "error": "Grupo no encontrado"}
         # Validación simple (puedes expandir)
         if not (fecha and hora and descripcion):
             return {"success": False, "error": "Datos incompletos"}
-
-        # Intentar obtener nombre del creador
-        try:
-            usuario_vm = UsuarioViewModel(self.service)
-            usuario = usuario_vm.obtener_usuario(creado_por_email)
-            nombre_creador = usuario.nombre if usuario else None
-        except Exception:
-            nombre_creador = None
-
-        evento = Evento(fecha=fecha, hora=hora, descripcion=descripcion,
-                        creado_por_email=creado_por_email,
-                        creado_por_nombre=nombre_creador)
-
-        # Añadir al grupo y actualizar en Firebase
-        grupo.agregar_evento(evento.to_dict())
-        self.guardar_grupo_dict(id_grupo, grupo.to_dict())
-        return {"success": True, "evento": evento.to_dict()}
+        return self._eventos_vm().crear_evento(id_grupo, fecha, hora, descripcion, creado_por_email)
 
     def obtener_eventos_por_grupo(self, id_grupo):
-        grupo = self.obtener_grupo(id_grupo)
-        if not grupo:
-            return []
-        # devolver ordenados por fecha+hora asc (opcional)
-        try:
-            eventos = sorted(grupo.eventos, key=lambda e: (e.get("fecha",""), e.get("hora","")))
-        except Exception:
-            eventos = grupo.eventos or []
-        return eventos
+        # devolver ordenados por fecha+hora asc
+        return self._eventos_vm().obtener_eventos_por_grupo(id_grupo)
 
     def obtener_eventos_por_usuario(self, correo_usuario):
         """
-        Recorre todos los grupos y devuelve los eventos de aquellos donde el usuario es integrante.
-        Devuelve lista de dicts con un campo adicional 'grupo_id' y 'grupo_nombre'.
+        Devuelve los eventos de los grupos donde el usuario es integrante.
+        Cada evento incluye los campos adicionales 'grupo_id' y 'grupo_nombre'.
         """
-        grupos = self.service.obtener_datos(self.ruta_grupos) or {}
-        resultados = []
-        for gid, gdict in grupos.items():
-            if not gdict:
-                continue
-
-            grupo = Grupo.from_dict(gdict)
-            self._limpiar_eventos_vencidos(gid, grupo)
-
-            if correo_usuario in grupo.integrantes:
-                for e in grupo.eventos:
-                    evt = e.copy()
-                    evt["grupo_id"] = getattr(grupo, "id_grupo", gid)
-                    evt["grupo_nombre"] = getattr(grupo, "nombre", "Sin nombre")
-                    resultados.append(evt)
-        # opcional: ordenar por fecha+hora asc
-        try:
-            resultados = sorted(resultados, key=lambda e: (e.get("fecha",""), e.get("hora","")))
-        except Exception:
-            pass
-        return resultados
+        return self._eventos_vm().obtener_eventos_por_usuario(correo_usuario)
 
     def eliminar_evento(self, id_grupo, id_evento):
-        grupo = self.obtener_grupo(id_grupo)
-        if not grupo:
-            return {"success": False, "error": "Grupo no encontrado"}
-        eliminado = grupo.eliminar_evento_por_id(id_evento)
-        if eliminado:
-            self.guardar_grupo_dict(id_grupo, grupo.to_dict())
-            return {"success": True}
-        return {"success": False, "error": "Evento no encontrado"}
+        return self._eventos_vm().eliminar_evento(id_grupo, id_evento)
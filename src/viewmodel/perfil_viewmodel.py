@@ -0,0 +1,87 @@
+# Vista del perfil de usuario materializada en memoria.
+# Una visita repetida a /perfil no hace lecturas a Firebase mientras nada de lo que muestra cambie.
+
+import asyncio
+
+from src.services import arbol
+from src.services.cache import CacheLectura
+from src.services.firebase_async import FirebaseServiceAsync
+from src.services.firebase_global import firebase_global
+from src.services.versiones import RUTA_VERSIONES
+from src.utils.claves import clave_correo
+
+# Campos del usuario que se muestran en el perfil (nunca la contraseña)
+CAMPOS_PERFIL = ("correo", "nombre_completo", "carrera", "descripcion_personal")
+
+
+class PerfilViewModel:
+    """
+    Perfil = campos del usuario + [{id_grupo, nombre}] de sus grupos, guardado en una
+    CacheLectura por correo_key con TTL. Una visita repetida sale de la caché sin leer nada.
+    Se suscribe a las escrituras del servicio y borra solo los perfiles afectados:
+    - usuarios/{correo_key}/... y membresias/{correo_key}/... → ese usuario.
+    - versiones/usuarios/{correo_key} → ese usuario. El sello cambia con sus datos, sus
+      membresías y el renombre de alguno de sus grupos (ver cambios_version(usuarios=...)).
+    Las escrituras de otros procesos se ven al vencer el TTL (PERFIL_TTL).
+    Debe ser uno solo para toda la app (como el directorio de nombres).
+    """
+
+    def __init__(self, service=None, ttl=300.0, max_bytes=2 * 1024 * 1024):
+        self.service = service if service else firebase_global
+        self.service_async = FirebaseServiceAsync(self.service)
+        self.cache = CacheLectura(ttl=ttl, max_bytes=max_bytes)
+        self.ruta_usuarios = "usuarios"
+        self.ruta_membresias = "membresias"
+        self.ruta_grupos = "grupos"
+        self.service.suscribir_cambios(self._al_cambiar)
+
+    # --- Invalidación ---
+
+    def _al_cambiar(self, ruta):
+        segmentos = arbol.partir_ruta(ruta)
+        if len(segmentos) < 2:
+            # Se escribió la raíz o una colección completa ('usuarios', 'grupos', ...)
+            if not segmentos or segmentos[0] in (self.ruta_usuarios, self.ruta_membresias, self.ruta_grupos):
+                self.cache.limpiar()
+            return
+
+        coleccion, clave = segmentos[0], segmentos[1]
+        if coleccion in (self.ruta_usuarios, self.ruta_membresias):
+            self.cache.invalidar(clave)
+        elif coleccion == RUTA_VERSIONES and clave == self.ruta_usuarios:
+            if len(segmentos) > 2:
+                self.cache.invalidar(segmentos[2])
+            else:
+                self.cache.limpiar()
+
+    # --- Lectura ---
+
+    async def obtener_perfil_async(self, correo):
+        """Devuelve el perfil (dict) o None si el usuario no existe."""
+        correo_key = clave_correo(correo)
+        encontrado, perfil = self.cache.obtener(correo_key)
+        if encontrado:
+            return perfil
+
+        generacion = self.cache.generacion()
+        usuario, indice = await self.service_async.obtener_varios([
+            f"{self.ruta_usuarios}/{correo_key}",
+            f"{self.ruta_membresias}/{correo_key}",
+        ])
+        if not usuario:
+            return None
+        ids = list(indice or {})
+        # Del grupo solo se necesita el nombre
+        nombres = await self.service_async.obtener_varios([f"{self.ruta_grupos}/{gid}/nombre" for gid in ids])
+
+        perfil = {campo: usuario.get(campo) for campo in CAMPOS_PERFIL}
+        perfil["correo"] = perfil["correo"] or correo
+        perfil["grupos"] = [{"id_grupo": gid, "nombre": nombre} for gid, nombre in zip(ids, nombres) if nombre]
+
+        # Si algo del perfil cambió mientras se leía, la caché descarta este valor
+        self.cache.guardar(correo_key, perfil, generacion)
+        return perfil
+
+    def obtener_perfil(self, correo):
+        # Solo para código síncrono (scripts, menú de terminal); las vistas async esperan obtener_perfil_async
+        return asyncio.run(self.obtener_perfil_async(correo))
@@ -1,7 +1,12 @@
 # Maneja operaciones generales de usuarios, aparte de login/registro.
 # Aquí se gestionan cosas como consultar, actualizar, eliminar o cambiar roles de usuarios.
+import asyncio
+
 from src.model.usuario import Usuario
 from src.services.firebase import FirebaseService
+from src.services.firebase_async import FirebaseServiceAsync
+from src.services.versiones import cambios_version
+from src.utils.claves import clave_correo
 
 class UsuarioViewModel:
     # ViewModel para manejar operaciones generales de usuarios con Firebase.
@@ -10,8 +15,12 @@ class UsuarioViewModel:
         # Si se pasa un servicio de Firebase externo (por ejemplo, para pruebas), se usa ese.
         # Si no, se crea uno nuevo.
         self.service = service if service else FirebaseService()
+        # Misma conexión con métodos async, para esperar varias lecturas a la vez
+        self.service_async = FirebaseServiceAsync(self.service)
         # Define la ruta donde están almacenados los usuarios dentro de Firebase.
         self.ruta_usuarios = "usuarios"
+        # Nombres para mostrar: nombres/{correo_key} = nombre_completo
+        self.ruta_nombres = "nombres"
 
     # Busca y obtiene un usuario en Firebase usando su correo.
     # Retorna un objeto Usuario si lo encuentra, o None si no existe.
@@ -19,13 +28,9 @@ class UsuarioViewModel:
         # Firebase no permite ciertos caracteres en las rutas, por eso se reemplazan.
         correo_key = correo.replace('@', '_at_').replace('.', '_dot_')
         ruta_usuario = f"{self.ruta_usuarios}/{correo_key}"
-        # Se obtienen los datos del usuario desde Firebase.
-        data = self.service.obtener_datos(ruta_usuario)
-        if not data:
-            # Si no hay datos, el usuario no existe.
-            return None
-        # Se devuelve un objeto Usuario usando los datos obtenidos.
-        return Usuario(**data)
+        # Se obtiene un objeto Usuario desde Firebase (None si no existe).
+        # Dentro de un request (UnidadDeTrabajo) se reutiliza el mismo objeto ya cargado.
+        return self.service.obtener_objeto(ruta_usuario, Usuario.from_dict)
 
     # Actualiza los datos de un usuario. Solo se cambian los campos enviados.
     def actualizar_usuario(self, correo, nombre_completo=None, password=None, carrera=None, descripcion_personal=None):
@@ -34,53 +39,94 @@ class UsuarioViewModel:
         if not usuario:
             return {'success': False, 'error': 'Usuario no encontrado.'}
 
-        # Si se pasó un nombre completo nuevo, se actualiza.
-        if nombre_completo:
-            usuario.nombre_completo = nombre_completo
-        # Si se pasó una contraseña nueva, se actualiza.
-        if password:
-            usuario.contraseña = password
-        # Si se pasó una carrera nueva, se actualiza.
-        if carrera:
-            usuario.carrera = carrera
-        # Si se pasó una descripción personal nueva, se actualiza.
-        if descripcion_personal:
-            usuario.descripcion_personal = descripcion_personal
+        # Solo se envían a Firebase los campos que llegaron y que realmente cambiaron.
+        nuevos = {
+            "nombre_completo": nombre_completo,
+            "contraseña": password,
+            "carrera": carrera,
+            "descripcion_personal": descripcion_personal,
+        }
+        cambios = {}
+        for campo, valor in nuevos.items():
+            if valor and valor != getattr(usuario, campo, None):
+                setattr(usuario, campo, valor)
+                cambios[campo] = valor
 
         # Se vuelve a generar la clave del correo.
         correo_key = correo.replace('@', '_at_').replace('.', '_dot_')
         ruta_usuario = f"{self.ruta_usuarios}/{correo_key}"
-        # Se guarda el usuario actualizado en Firebase.
-        self.service.actualizar_datos(ruta_usuario, usuario.to_dict())
+        # Se guardan solo los campos modificados en Firebase (y el nombre para mostrar si cambió).
+        rutas = {f"{ruta_usuario}/{campo}": valor for campo, valor in cambios.items()}
+        if "nombre_completo" in cambios:
+            rutas[f"{self.ruta_nombres}/{correo_key}"] = cambios["nombre_completo"]
+        if rutas:
+            rutas.update(cambios_version(nombres="nombre_completo" in cambios, usuarios=[correo_key]))
+        self.service.actualizar_multiples(rutas)
         return {'success': True, 'mensaje': 'Usuario actualizado correctamente.'}
 
     # Elimina completamente un usuario del sistema y lo quita de todos los grupos donde esté inscrito (de Firebase).
-    def eliminar_usuario(self, correo):
+    def planificar_eliminacion(self, correo, membresias=None):
+        """
+        Calcula todos los cambios para eliminar al usuario sin escribir nada.
+        Devuelve (cambios, reporte): 'cambios' es {ruta: valor} para una sola
+        actualización multi-ruta y 'reporte' resume qué grupos se borran o se modifican.
+        'membresias' es el índice {id_grupo: rol} del usuario, si ya se leyó.
+        """
         correo_key = correo.replace('@', '_at_').replace('.', '_dot_')
-        ruta_usuario = f"{self.ruta_usuarios}/{correo_key}"
 
         from src.viewmodel.grupos_viewmodel import GruposViewModel
         grupos_vm = GruposViewModel(self.service)
 
-        todos_los_grupos = grupos_vm.listar_grupos()
-
-        for grupo in todos_los_grupos:
-            if correo in grupo["integrantes"]:
-                # Caso: único organizador → eliminar grupo
-                if correo in grupo["organizadores"] and len(grupo["organizadores"]) == 1:
-                    grupos_vm.eliminar_grupo(grupo["id_grupo"])
-                else:
-                    # Caso: hay otros organizadores → solo remover al usuario
-                    if correo in grupo["integrantes"]:
-                        grupo["integrantes"].remove(correo)
-                    if correo in grupo["organizadores"]:
-                        grupo["organizadores"].remove(correo)
-                    self.service.actualizar_datos(f"grupos/{grupo['id_grupo']}", grupo)
-
-        # Finalmente, eliminar usuario de Firebase
-        self.service.eliminar_datos(ruta_usuario)
-
-        return {'success': True, 'mensaje': f'Usuario {correo} eliminado y removido de sus grupos.'}
+        # El usuario, su nombre y todo su índice de membresías se borran de una vez
+        ruta_indice = grupos_vm._ruta_membresia(correo)
+        cambios = {
+            f"{self.ruta_usuarios}/{correo_key}": None,
+            f"{self.ruta_nombres}/{correo_key}": None,
+            ruta_indice: None,
+        }
+        reporte = {"grupos_eliminados": [], "grupos_actualizados": []}
+
+        # Solo se recorren los grupos del usuario según el índice de membresías (leído una
+        # vez); los grupos se leen en paralelo
+        if membresias is None:
+            membresias = grupos_vm.ids_grupos_de_usuario(correo)
+        for grupo in asyncio.run(grupos_vm.grupos_de_usuario_async(correo, membresias)):
+            if list(grupo.organizadores) == [correo]:
+                # Caso: único organizador → se borra el grupo con sus eventos y membresías
+                reporte["grupos_eliminados"].append(grupo.id_grupo)
+                for ruta, valor in grupos_vm._cambios_eliminar_grupo(grupo, grupo.id_grupo).items():
+                    # Las membresías del propio usuario ya quedan cubiertas por borrar su índice
+                    if not ruta.startswith(ruta_indice + "/"):
+                        cambios[ruta] = valor
+            else:
+                # Caso: hay otros organizadores → solo se borran sus hijos en integrantes y organizadores
+                reporte["grupos_actualizados"].append(grupo.id_grupo)
+                cambios[grupos_vm._ruta_integrante(grupo.id_grupo, correo)] = None
+                cambios[grupos_vm._ruta_integrante(grupo.id_grupo, correo, "organizadores")] = None
+
+        # Sellos de versión: grupos modificados, grupos borrados, directorio de nombres y el
+        # perfil de cada integrante de un grupo borrado
+        usuarios = {correo_key}
+        for ruta in [r for r in cambios if r.startswith("versiones/")]:
+            if ruta.startswith("versiones/usuarios/"):
+                usuarios.add(ruta.rsplit("/", 1)[1])
+            del cambios[ruta]
+        cambios.update(cambios_version(
+            grupos=reporte["grupos_actualizados"], eliminados=reporte["grupos_eliminados"], nombres=True,
+            usuarios=sorted(usuarios), busqueda=bool(reporte["grupos_eliminados"]),
+        ))
+        reporte["rutas_modificadas"] = len(cambios)
+        return cambios, reporte
+
+    # Elimina un usuario y lo saca de sus grupos en una sola escritura atómica.
+    def eliminar_usuario(self, correo):
+        cambios, reporte = self.planificar_eliminacion(correo)
+        self.service.actualizar_multiples(cambios)
+        return {
+            'success': True,
+            'mensaje': f'Usuario {correo} eliminado y removido de sus grupos.',
+            **reporte,
+        }
 
 
     # Devuelve una lista con todos los grupos a los que pertenece un usuario.
@@ -88,12 +134,25 @@ class UsuarioViewModel:
         # Se importa el ViewModel de grupos (aquí dentro para evitar importaciones circulares).
         from src.viewmodel.grupos_viewmodel import GruposViewModel
         grupos_vm = GruposViewModel(self.service)
-        # Se listan todos los grupos existentes.
-        todos_los_grupos = grupos_vm.listar_grupos()
-        # Se filtran los grupos donde el correo está en la lista de integrantes.
-        grupos_usuario = [g for g in todos_los_grupos if correo in g['integrantes']]
+        # Se leen solo los grupos del usuario a partir del índice de membresías.
+        grupos_usuario = [g.to_dict() for g in grupos_vm.grupos_de_usuario(correo)]
         return grupos_usuario
 
+    # --- Lecturas async: las rutas pueden esperarlas juntas con asyncio.gather ---
+
+    async def obtener_usuario_async(self, correo):
+        correo_key = correo.replace('@', '_at_').replace('.', '_dot_')
+        return await self.service_async.obtener_objeto(f"{self.ruta_usuarios}/{correo_key}", Usuario.from_dict)
+
+    async def consultar_grupos_usuario_async(self, correo):
+        from src.viewmodel.grupos_viewmodel import GruposViewModel
+        grupos = await GruposViewModel(self.service).grupos_de_usuario_async(correo)
+        return [g.to_dict() for g in grupos]
+
+    async def obtener_perfil_async(self, correo):
+        # Usuario y grupos se leen a la vez: la espera es la de la lectura más lenta
+        return await asyncio.gather(self.obtener_usuario_async(correo), self.consultar_grupos_usuario_async(correo))
+
     # Verifica si un usuario es organizador de un grupo específico.
     def es_organizador_de_grupo(self, correo, id_grupo):
         from src.viewmodel.grupos_viewmodel import GruposViewModel
@@ -121,20 +180,31 @@ class UsuarioViewModel:
         if correo_usuario not in grupo.integrantes:
             return {'success': False, 'error': 'El usuario no pertenece al grupo.'}
 
-        # Si el nuevo rol es "organizador", lo añadimos si aún no está.
-        if nuevo_rol == 'organizador':
-            if correo_usuario not in grupo.organizadores:
-                grupo.organizadores.append(correo_usuario)
-
-        # Si el nuevo rol es "miembro", lo removemos de la lista de organizadores.
-        elif nuevo_rol == 'miembro':
-            if correo_usuario in grupo.organizadores:
-                grupo.organizadores.remove(correo_usuario)
-
         # Si el rol no es válido, se lanza un error.
-        else:
+        if nuevo_rol not in ('organizador', 'miembro'):
             return {'success': False, 'error': 'Rol inválido.'}
 
-        # Guardamos los cambios del grupo en Firebase.
-        self.service.actualizar_datos(f"grupos/{grupo.id_grupo}", grupo.to_dict())
+        # Transacción sobre organizadores: un cambio de rol simultáneo no deja al grupo sin
+        # organizadores. Luego se refleja el nuevo rol en el índice de membresías.
+        if not grupos_vm.cambiar_organizador(grupo.id_grupo, correo_usuario, nuevo_rol == 'organizador'):
+            return {'success': False, 'error': 'El grupo debe tener al menos un organizador.'}
+        self.service.actualizar_multiples({
+            grupos_vm._ruta_membresia(correo_usuario, grupo.id_grupo): nuevo_rol,
+            **cambios_version(grupos=[grupo.id_grupo], usuarios=[clave_correo(correo_usuario)]),
+        })
+        if nuevo_rol == 'organizador':
+            grupo.agregar_organizador(correo_usuario)
+        else:
+            grupo.remover_organizador(correo_usuario)
         return {'success': True, 'mensaje': f'Rol del usuario actualizado a {nuevo_rol}.'}
+
+    # Recalcula nombres/{correo_key} a partir de todos los usuarios (para datos anteriores al directorio).
+    def reconstruir_directorio_nombres(self):
+        usuarios = self.service.obtener_datos(self.ruta_usuarios) or {}
+        nombres = {
+            correo_key: data.get("nombre_completo")
+            for correo_key, data in usuarios.items()
+            if data and data.get("nombre_completo")
+        }
+        self.service.actualizar_multiples({self.ruta_nombres: nombres, **cambios_version(nombres=True)})
+        return len(nombres)
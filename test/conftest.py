@@ -0,0 +1,6 @@
+# Configuración común de pytest.
+# Sin credenciales de Firebase las pruebas usan el backend en memoria.
+import os
+
+if not os.getenv("FIREBASE_CREDENTIALS"):
+    os.environ.setdefault("BACKEND_DATOS", "memoria")
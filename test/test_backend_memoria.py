@@ -0,0 +1,56 @@
+# Pruebas del backend en memoria (python -m pytest test/test_backend_memoria.py)
+import time
+
+import pytest
+
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+
+
+def test_semantica_de_rutas():
+    service = FirebaseService(BackendMemoria())
+
+    service.guardar_datos("grupos/club_a", {"nombre": "Club A", "integrantes": ["a@unal.edu.co", "b@unal.edu.co"]})
+    assert service.obtener_datos("grupos/club_a/nombre") == "Club A"
+    assert service.obtener_datos("/grupos/club_a/integrantes/") == ["a@unal.edu.co", "b@unal.edu.co"]
+    assert service.obtener_datos("grupos/no_existe") is None
+
+    # Al borrar el último hijo, los padres vacíos desaparecen
+    service.eliminar_datos("grupos/club_a")
+    assert service.obtener_datos("grupos") is None
+
+    service.actualizar_campo("usuarios/x", "carrera", "Medicina")
+    assert service.obtener_datos("usuarios/x") == {"carrera": "Medicina"}
+
+
+def test_contadores_y_latencia():
+    backend = BackendMemoria(latencia=0.01, jitter=0.005, semilla=1)
+    service = FirebaseService(backend)
+
+    inicio = time.perf_counter()
+    service.guardar_datos("a/b", 1)
+    service.obtener_datos("a/b")
+    service.actualizar_campo("a", "c", 2)
+    assert time.perf_counter() - inicio >= 0.03
+
+    # actualizar_campo es un único update, sin leer el nodo
+    assert backend.llamadas == {"guardar": 1, "obtener": 1, "actualizar_parcial": 1}
+    assert backend.llamadas_por_ruta[("actualizar_parcial", "a")] == 1
+    assert backend.total_llamadas() == 3
+    assert backend.exportar() == {"a": {"b": 1, "c": 2}}
+
+
+def test_actualizacion_multiple_atomica():
+    service = FirebaseService(BackendMemoria({"grupos": {"g1": {"nombre": "A", "categoria": "Cultura"}}}))
+
+    service.actualizar_parcial("grupos/g1", {"nombre": "B", "categoria": None})
+    assert service.obtener_datos("grupos/g1") == {"nombre": "B"}
+
+    service.actualizar_multiples({"grupos/g1/nombre": "C", "membresias/x/g1": "miembro"})
+    assert service.obtener_datos("membresias/x") == {"g1": "miembro"}
+    assert service.backend.llamadas["actualizar_parcial"] == 2
+
+    # Igual que Firebase, no se permiten rutas superpuestas en una misma actualización
+    with pytest.raises(ValueError):
+        service.actualizar_multiples({"grupos/g1": None, "grupos/g1/nombre": "D"})
+    assert service.obtener_datos("grupos/g1/nombre") == "C"
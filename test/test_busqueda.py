@@ -0,0 +1,71 @@
+# Pruebas del índice de búsqueda de grupos
+from src.services.backend_memoria import BackendMemoria
+from src.services.busqueda import IndiceBusqueda, normalizar
+from src.services.firebase import FirebaseService
+from src.services.unidad_trabajo import UnidadDeTrabajo
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+
+
+def _ids(grupos):
+    return [g["id_grupo"] for g in grupos]
+
+
+def test_normalizar_quita_tildes_y_mayusculas():
+    assert normalizar("Programación Ñandú") == "programacion nandu"
+
+
+def test_busqueda_por_relevancia_y_actualizacion_incremental():
+    service = FirebaseService(BackendMemoria())
+    indice = IndiceBusqueda(service)
+    vm = GruposViewModel(service, indice=indice)
+    vm.crear_grupo("Club Robótica", "Construimos robots", "Tecnología", ["ana@unal.edu.co"])
+    vm.crear_grupo("Club Ajedrez", "Torneos y robótica de tablero", "Cultura", ["ana@unal.edu.co"])
+    vm.crear_grupo("Coro", "Canto coral", "Cultura", ["ana@unal.edu.co"])
+
+    # Sin tildes ni mayúsculas; el nombre pesa más que la descripción
+    assert _ids(vm.buscar_grupos("ROBOTICA")) == ["club_robótica", "club_ajedrez"]
+    assert _ids(vm.buscar_grupos("robot", categoria="Cultura")) == ["club_ajedrez"]
+    assert _ids(vm.buscar_grupos("cultura canto")) == ["coro"]
+
+    # Los cambios se reflejan leyendo solo el grupo modificado
+    service.backend.reiniciar_contadores()
+    vm.actualizar_grupo("coro", descripcion="Música coral y robótica")
+    vm.eliminar_grupo("club_ajedrez")
+    assert _ids(vm.buscar_grupos("robotica")) == ["club_robótica", "coro"]
+    assert ("obtener", "grupos") not in service.backend.llamadas_por_ruta
+
+
+def test_escrituras_de_la_unidad_de_trabajo_llegan_al_confirmar():
+    service = FirebaseService(BackendMemoria())
+    indice = IndiceBusqueda(service)
+    assert indice.buscar("teatro") == []
+
+    unidad = UnidadDeTrabajo(service)
+    GruposViewModel(unidad, indice=indice).crear_grupo("Teatro", "Obras", "Cultura", ["ana@unal.edu.co"])
+    assert indice.buscar("teatro") == []
+    unidad.confirmar()
+    assert _ids(indice.buscar("teatro")) == ["teatro"]
+
+
+def test_escritura_de_otro_proceso_se_detecta_por_el_sello():
+    backend = BackendMemoria()
+    otro_proceso = GruposViewModel(FirebaseService(backend))
+    service = FirebaseService(backend)
+    indice = IndiceBusqueda(service, ttl=None)
+    otro_proceso.crear_grupo("Teatro", "Obras", "Cultura", ["ana@unal.edu.co"])
+    version = service.obtener_datos("versiones/busqueda")
+    assert _ids(indice.buscar("teatro", version=version)) == ["teatro"]
+
+    # Uniones y cambios de membresía no tocan el sello de búsqueda: nada que reconstruir
+    otro_proceso.agregar_integrante("teatro", "luis@unal.edu.co")
+    assert service.obtener_datos("versiones/busqueda") == version
+
+    # Con un sello nuevo la búsqueda responde con el índice que tiene y este se reconstruye
+    # en segundo plano (una sola lectura del árbol)
+    otro_proceso.crear_grupo("Teatro Musical", "Obras", "Cultura", ["ana@unal.edu.co"])
+    version = service.obtener_datos("versiones/busqueda")
+    backend.reiniciar_contadores()
+    indice.buscar("teatro", version=version)
+    indice.esperar_reconstruccion()
+    assert backend.llamadas_por_ruta[("obtener", "grupos")] == 1
+    assert _ids(indice.buscar("teatro", version=version)) == ["teatro", "teatro_musical"]
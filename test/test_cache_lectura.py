@@ -0,0 +1,53 @@
+# Pruebas de la caché de lecturas de FirebaseService
+from src.services.backend_memoria import BackendMemoria
+from src.services.cache import CacheLectura
+from src.services.firebase import FirebaseService
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_aciertos_ttl_e_invalidacion():
+    reloj = RelojFalso()
+    backend = BackendMemoria({"grupos": {"a": {"nombre": "A"}, "b": {"nombre": "B"}}})
+    service = FirebaseService(backend, cache=CacheLectura(ttl=10, reloj=reloj))
+
+    assert service.obtener_datos("grupos") == {"a": {"nombre": "A"}, "b": {"nombre": "B"}}
+    service.obtener_datos("grupos")
+    service.obtener_datos("grupos/a")
+    assert backend.llamadas["obtener"] == 2
+    assert service.cache.estadisticas()["aciertos"] == 1
+
+    # Escribir un hijo invalida al padre, y escribir el padre invalida a los hijos
+    service.guardar_datos("grupos/a/nombre", "A2")
+    assert service.obtener_datos("grupos")["a"]["nombre"] == "A2"
+    service.eliminar_datos("grupos")
+    assert service.obtener_datos("grupos/a") is None
+
+    # Las entradas vencen con el TTL
+    llamadas = backend.llamadas["obtener"]
+    reloj.ahora += 11
+    service.obtener_datos("grupos/a")
+    assert backend.llamadas["obtener"] == llamadas + 1
+
+
+def test_presupuesto_lru_y_copias():
+    cache = CacheLectura(ttl=60, max_bytes=40)
+    cache.guardar("a", "x" * 15)
+    cache.guardar("b", "y" * 15)
+    cache.obtener("a")  # 'a' pasa a ser la más reciente
+    cache.guardar("c", "z" * 15)
+    assert cache.obtener("b") == (False, None)
+    assert cache.obtener("a")[0] and cache.obtener("c")[0]
+    assert cache.estadisticas()["expulsiones"] == 1
+
+    # Modificar lo devuelto no altera la caché
+    cache.guardar("d", {"lista": [1]})
+    _, valor = cache.obtener("d")
+    valor["lista"].append(2)
+    assert cache.obtener("d")[1] == {"lista": [1]}
@@ -0,0 +1,66 @@
+# Pruebas de la importación y exportación masiva
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.viewmodel.carga_masiva_viewmodel import CargaMasivaViewModel
+
+
+def _vm():
+    backend = BackendMemoria()
+    return backend, CargaMasivaViewModel(FirebaseService(backend))
+
+
+def test_importa_usuarios_por_lotes_validando_cada_registro():
+    backend, vm = _vm()
+    filas = [(i + 2, {"nombre_completo": f"Estudiante {i}", "correo": f"est{i}@unal.edu.co",
+                      "contraseña": "12345678", "carrera": "Química"}) for i in range(5)]
+    filas += [
+        (7, {"nombre_completo": "Otro", "correo": "otro@gmail.com", "contraseña": "12345678", "carrera": "X"}),
+        (8, {"nombre_completo": "Corta", "correo": "corta@unal.edu.co", "contraseña": "123", "carrera": "X"}),
+        (9, {"nombre_completo": "Repetido", "correo": "est0@unal.edu.co", "contraseña": "12345678", "carrera": "X"}),
+    ]
+    confirmados = []
+
+    resumen = vm.importar("usuarios", iter(filas), tamano_lote=3,
+                          al_confirmar=lambda procesados, _: confirmados.append(procesados))
+
+    assert resumen["escritos"] == 5 and resumen["omitidos"] == 1
+    assert [linea for linea, _ in resumen["rechazados"]] == [7, 8]
+    assert confirmados == [3, 6, 8]
+    # Una sola escritura multi-ruta por lote (más la lectura inicial de nombres/)
+    assert backend.llamadas["actualizar_parcial"] == 2
+    assert backend.llamadas["obtener"] == 1
+    assert vm.service.obtener_datos("nombres/est4_at_unal_dot_edu_dot_co") == "Estudiante 4"
+
+
+def test_grupos_y_eventos_se_reimportan_sin_duplicar():
+    _, vm = _vm()
+    grupos = [(1, {"nombre": "Club Ajedrez", "descripcion": "Partidas", "categoria": "Deportes",
+                   "organizadores": "ana@unal.edu.co", "integrantes": "beto@unal.edu.co;caro@unal.edu.co"}),
+              (2, {"nombre": "Club Raro", "categoria": "Otra", "organizadores": "ana@unal.edu.co"})]
+    eventos = [(1, {"grupo": "club_ajedrez", "fecha": "2031-03-01", "hora": "10:00",
+                    "descripcion": "Torneo", "creado_por_email": "ana@unal.edu.co"}),
+               (2, {"grupo": "club_inexistente", "fecha": "2031-03-01", "hora": "10:00",
+                    "descripcion": "Nada", "creado_por_email": "ana@unal.edu.co"})]
+
+    assert vm.importar("grupos", grupos)["escritos"] == 1
+    assert vm.importar("grupos", grupos)["omitidos"] == 1
+    vm.importar("eventos", eventos)
+    resumen = vm.importar("eventos", eventos)
+
+    assert resumen["rechazados"] == [(2, "Grupo no encontrado: club_inexistente")]
+    assert len(vm.service.obtener_datos("eventos/club_ajedrez")) == 1
+    assert vm.service.obtener_datos("membresias/caro_at_unal_dot_edu_dot_co") == {"club_ajedrez": "miembro"}
+
+
+def test_exportar_pagina_por_clave_y_se_puede_volver_a_importar():
+    backend, vm = _vm()
+    vm.importar("grupos", [(i, {"nombre": f"Grupo {i}", "categoria": "Ciencia",
+                                "organizadores": [f"org{i}@unal.edu.co"]}) for i in range(7)])
+    backend.reiniciar_contadores()
+
+    exportados = list(vm.exportar("grupos", tamano_lote=3))
+
+    assert sorted(g["id_grupo"] for g in exportados) == [f"grupo_{i}" for i in range(7)]
+    assert backend.llamadas["consultar"] == 3
+    _, destino = _vm()
+    assert destino.importar("grupos", enumerate(exportados, start=1))["escritos"] == 7
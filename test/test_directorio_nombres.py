@@ -0,0 +1,88 @@
+# Pruebas del directorio de nombres (sin N+1 al listar integrantes)
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.viewmodel.auth_viewmodel import UsuarioAuthViewModel
+from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+
+def test_listar_grupos_con_usuarios_lee_cada_nombre_una_vez():
+    service = FirebaseService(BackendMemoria())
+    auth_vm = UsuarioAuthViewModel(service)
+    grupos_vm = GruposViewModel(service)
+    correos = [f"estudiante{i}@unal.edu.co" for i in range(30)]
+    for i, correo in enumerate(correos):
+        auth_vm.registrar_usuario(f"Estudiante {i}", correo, "12345678", "Ingeniería")
+    for g in range(3):
+        grupos_vm.crear_grupo(f"Club {g}", "", "Ciencia", correos[g * 10:(g + 1) * 10])
+    UsuarioViewModel(service).actualizar_usuario(correos[0], nombre_completo="Estudiante Cero")
+
+    service.backend.reiniciar_contadores()
+    grupos_vm = GruposViewModel(service)
+    grupos = grupos_vm.listar_grupos_con_usuarios()
+    # grupos + solo las entradas nombres/{correo_key} de los integrantes, nunca el mapa completo
+    assert service.backend.llamadas["obtener"] == 1 + len(correos)
+    assert ("obtener", "nombres") not in service.backend.llamadas_por_ruta
+    assert grupos[0]["nombres_integrantes"][:2] == ["Estudiante Cero", "Estudiante 1"]
+
+    # La segunda vez los nombres salen de la caché del directorio
+    service.backend.reiniciar_contadores()
+    grupos_vm.listar_grupos_con_usuarios()
+    assert service.backend.llamadas["obtener"] == 1
+
+    # Un cambio de nombre borra esa entrada de la caché al momento
+    UsuarioViewModel(service).actualizar_usuario(correos[1], nombre_completo="Estudiante Uno")
+    assert grupos_vm.listar_grupos_con_usuarios()[0]["nombres_integrantes"][1] == "Estudiante Uno"
+
+    # Los correos sin nombre registrado se muestran tal cual
+    grupos_vm.agregar_integrante("club_0", "sin.registro@unal.edu.co")
+    assert GruposViewModel(service).listar_grupos_con_usuarios()[0]["nombres_integrantes"][-1] == "sin.registro@unal.edu.co"
+
+
+def test_crear_evento_guarda_nombre_del_creador():
+    service = FirebaseService(BackendMemoria())
+    UsuarioAuthViewModel(service).registrar_usuario("Ana Pérez", "ana@unal.edu.co", "12345678", "Física")
+    GruposViewModel(service).crear_grupo("Club Cine", "", "Cultura", ["ana@unal.edu.co"])
+
+    resultado = EventosViewModel(service).crear_evento("club_cine", "2999-01-01", "10:00", "Función", "ana@unal.edu.co")
+    assert resultado["evento"]["creado_por_nombre"] == "Ana Pérez"
+
+    service.eliminar_datos("nombres")
+    assert UsuarioViewModel(service).reconstruir_directorio_nombres() == 1
+    assert service.obtener_datos("nombres") == {"ana_at_unal_dot_edu_dot_co": "Ana Pérez"}
+
+
+def test_detalle_muestra_el_nombre_nuevo_con_el_etag_nuevo():
+    import app as aplicacion
+
+    cliente = aplicacion.app.test_client()
+    cliente.post("/registro", data={"name": "Rosa", "correo": "rosa@unal.edu.co",
+                                    "password": "12345678", "carrera": "Química"})
+    cliente.post("/clubes/crear", data={"nombre": "Club Nombres", "categoria": "Ciencia"})
+    antes = cliente.get("/grupos/club_nombres")
+    assert antes.status_code == 200 and "Rosa" in antes.get_data(as_text=True)
+
+    # Otro proceso (otro worker) cambia el nombre: este proceso no recibe el aviso de la escritura
+    otro_proceso = FirebaseService(aplicacion.firebase_global.backend)
+    UsuarioViewModel(otro_proceso).actualizar_usuario("rosa@unal.edu.co", nombre_completo="Rosa María")
+
+    despues = cliente.get("/grupos/club_nombres", headers={"If-None-Match": antes.headers["ETag"]})
+    assert despues.status_code == 200
+    assert despues.headers["ETag"] != antes.headers["ETag"]
+    assert "Rosa María" in despues.get_data(as_text=True)
+
+
+def test_listar_grupos_con_usuarios_desde_un_event_loop():
+    import asyncio
+
+    service = FirebaseService(BackendMemoria())
+    UsuarioAuthViewModel(service).registrar_usuario("Ana Pérez", "ana@unal.edu.co", "12345678", "Física")
+    grupos_vm = GruposViewModel(service)
+    grupos_vm.crear_grupo("Club Cine", "", "Cultura", ["ana@unal.edu.co"])
+
+    async def vista():
+        # Dentro de un loop en marcha no se puede usar la versión síncrona (asyncio.run)
+        return await grupos_vm.listar_grupos_con_usuarios_async()
+
+    assert asyncio.run(vista())[0]["nombres_integrantes"] == ["Ana Pérez"]
@@ -0,0 +1,56 @@
+# Pruebas del build de archivos estáticos con huella
+import gzip
+import os
+
+from flask import Flask, render_template_string
+
+from src.utils import estaticos
+
+
+def _app_con_estaticos(tmp_path):
+    static = tmp_path / "static"
+    (static / "img").mkdir(parents=True)
+    (static / "clubes.css").write_text("body { color: #222; }\n" * 50)
+    (static / "img" / "Logo.png").write_bytes(b"\x89PNG logo")
+    manifiesto = estaticos.construir(str(static))
+    app = Flask(__name__, static_folder=str(static))
+    estaticos.registrar_estaticos(app)
+    return app, static, manifiesto
+
+
+def test_construir_renombra_por_contenido_y_comprime(tmp_path):
+    _, static, manifiesto = _app_con_estaticos(tmp_path)
+
+    css = manifiesto["clubes.css"]
+    assert css.startswith("dist/clubes.") and css.endswith(".css")
+    assert manifiesto["img/Logo.png"].startswith("dist/img/Logo.")
+    assert gzip.decompress((static / (css + ".gz")).read_bytes()) == (static / "clubes.css").read_bytes()
+    # Las imágenes no se comprimen otra vez
+    assert not os.path.exists(static / (manifiesto["img/Logo.png"] + ".gz"))
+
+    # Mismo contenido, mismo nombre; contenido nuevo, nombre nuevo
+    assert estaticos.construir(str(static))["clubes.css"] == css
+    (static / "clubes.css").write_text("body { color: #000; }\n")
+    assert estaticos.construir(str(static))["clubes.css"] != css
+
+
+def test_url_for_y_cabeceras_inmutables(tmp_path):
+    app, _, manifiesto = _app_con_estaticos(tmp_path)
+    css = manifiesto["clubes.css"]
+
+    with app.test_request_context():
+        assert render_template_string("{{ url_for('static', filename='clubes.css') }}") == f"/static/{css}"
+        # Un archivo fuera del manifiesto conserva su nombre
+        assert render_template_string("{{ url_for('static', filename='otro.css') }}") == "/static/otro.css"
+
+    cliente = app.test_client()
+    respuesta = cliente.get(f"/static/{css}", headers={"Accept-Encoding": "gzip, deflate"})
+    assert respuesta.status_code == 200
+    assert respuesta.headers["Content-Encoding"] == "gzip"
+    assert respuesta.headers["Cache-Control"] == estaticos.CACHE_INMUTABLE
+    assert respuesta.mimetype == "text/css"
+    assert gzip.decompress(respuesta.data).startswith(b"body")
+
+    sin_compresion = cliente.get(f"/static/{css}")
+    assert "Content-Encoding" not in sin_compresion.headers
+    assert sin_compresion.data.startswith(b"body")
@@ -0,0 +1,110 @@
+# Pruebas de eventos guardados como nodos propios en eventos/{id_grupo}/{id_evento}
+from datetime import datetime
+
+from src.model.evento import Evento
+from src.services.backend_memoria import BackendMemoria
+from src.services.barrido_eventos import BarredorEventos
+from src.services.firebase import FirebaseService
+from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+
+ANA = "ana@unal.edu.co"
+
+
+def crear_vms():
+    service = FirebaseService(BackendMemoria())
+    grupos_vm = GruposViewModel(service)
+    grupos_vm.crear_grupo("Club Cine", "Películas", "Cultura", [ANA])
+    return service, grupos_vm, EventosViewModel(service)
+
+
+def test_crear_y_eliminar_evento_no_reescribe_el_grupo():
+    service, grupos_vm, eventos_vm = crear_vms()
+    service.backend.reiniciar_contadores()
+    rutas_escritas = []
+    actualizar_parcial = service.backend.actualizar_parcial
+    service.backend.actualizar_parcial = lambda ruta, campos: (rutas_escritas.extend(campos), actualizar_parcial(ruta, campos))
+
+    resultado = eventos_vm.crear_evento("club_cine", "2999-05-01", "18:00", "Función", ANA)
+    id_evento = resultado["evento"]["id"]
+    escrituras = {op for (op, ruta) in service.backend.llamadas_por_ruta if op != "obtener"}
+    assert escrituras == {"actualizar_parcial"}
+    # Solo el nodo del evento y los sellos de versión, nunca el documento del grupo
+    assert set(rutas_escritas) == {f"eventos/club_cine/{id_evento}", "versiones/grupos/club_cine", "versiones/catalogo"}
+    assert "eventos" not in service.obtener_datos("grupos/club_cine")
+
+    eventos_vm.crear_evento("club_cine", "2999-04-01", "10:00", "Foro", ANA)
+    assert [e["descripcion"] for e in eventos_vm.obtener_eventos_por_grupo("club_cine")] == ["Foro", "Función"]
+    assert [e["grupo_nombre"] for e in eventos_vm.obtener_eventos_por_usuario(ANA)] == ["Club Cine", "Club Cine"]
+
+    assert eventos_vm.eliminar_evento("club_cine", id_evento) == {"success": True}
+    assert eventos_vm.eliminar_evento("club_cine", id_evento)["success"] is False
+
+    grupos_vm.eliminar_grupo("club_cine")
+    assert service.obtener_datos("eventos") is None
+
+
+def test_migrar_eventos_embebidos():
+    service, grupos_vm, eventos_vm = crear_vms()
+    service.guardar_datos("grupos/club_cine/eventos", [
+        {"id": "e1", "fecha": "2999-01-01", "hora": "10:00", "descripcion": "Antiguo"},
+    ])
+
+    assert eventos_vm.migrar_eventos_embebidos() == 1
+    assert service.obtener_datos("grupos/club_cine/eventos") is None
+    assert service.obtener_datos("eventos/club_cine/e1/descripcion") == "Antiguo"
+
+
+def test_lecturas_no_escriben_y_el_barrido_purga_en_lotes():
+    service, grupos_vm, eventos_vm = crear_vms()
+    for i in range(5):
+        service.guardar_datos(f"eventos/club_cine/viejo{i}", {"id": f"viejo{i}", "fecha": "2000-01-01", "hora": "10:00"})
+    eventos_vm.crear_evento("club_cine", "2999-01-01", "10:00", "Futuro", ANA)
+    service.backend.reiniciar_contadores()
+
+    assert [e["descripcion"] for e in eventos_vm.obtener_eventos_por_grupo("club_cine")] == ["Futuro"]
+    assert len(eventos_vm.obtener_eventos_por_usuario(ANA)) == 1
+    assert set(service.backend.llamadas) == {"obtener"}
+
+    barredor = BarredorEventos(eventos_vm, tamano_lote=2)
+    assert barredor.barrer_una_vez() == 5
+    assert service.backend.llamadas["actualizar_parcial"] == 3
+    assert len(service.obtener_datos("eventos/club_cine")) == 1
+
+
+def test_marca_tiempo_orden_rango_y_completado():
+    service, grupos_vm, eventos_vm = crear_vms()
+    evento = Evento("2999-03-01", "09:30", "Taller", ANA)
+    assert evento.marca_tiempo == int(datetime(2999, 3, 1, 9, 30).timestamp())
+    assert Evento.from_dict(evento.to_dict()).marca_tiempo == evento.marca_tiempo
+
+    # Registro antiguo sin marca_tiempo: se sigue ordenando bien y el completado le agrega el campo
+    service.guardar_datos("eventos/club_cine/viejo", {"id": "viejo", "fecha": "2999-02-01", "hora": "08:00"})
+    eventos_vm.crear_evento("club_cine", "2999-03-01", "09:30", "Taller", ANA)
+    eventos_vm.crear_evento("club_cine", "2999-01-15", "12:00", "Charla", ANA)
+    assert [e.get("descripcion") for e in eventos_vm.obtener_eventos_por_grupo("club_cine")] == ["Charla", None, "Taller"]
+
+    assert eventos_vm.completar_marcas_tiempo() == 1
+    assert service.obtener_datos("eventos/club_cine/viejo/marca_tiempo") == int(datetime(2999, 2, 1, 8).timestamp())
+
+    desde = int(datetime(2999, 1, 20).timestamp())
+    hasta = int(datetime(2999, 2, 28).timestamp())
+    assert [e["id"] for e in eventos_vm.obtener_eventos_por_grupo("club_cine", desde, hasta)] == ["viejo"]
+
+
+def test_barrido_recorre_eventos_por_paginas_y_eliminar_valida_el_grupo():
+    service, grupos_vm, eventos_vm = crear_vms()
+    for g in range(3):
+        for i in range(2):
+            service.guardar_datos(f"eventos/grupo{g}/viejo{i}", {"id": f"viejo{i}", "fecha": "2000-01-01"})
+    eventos_vm.crear_evento("club_cine", "2999-01-01", "10:00", "Futuro", ANA)
+    service.backend.reiniciar_contadores()
+
+    assert eventos_vm.purgar_eventos_vencidos(tamano_lote=4, grupos_por_pagina=1) == 6
+    # Nunca se lee eventos/ completo: una consulta por grupo más la última página vacía
+    assert ("obtener", "eventos") not in service.backend.llamadas_por_ruta
+    assert service.backend.llamadas["consultar"] == 5
+    assert service.backend.llamadas["actualizar_parcial"] == 2
+    assert list(service.obtener_datos("eventos")) == ["club_cine"]
+
+    assert eventos_vm.eliminar_evento("club_fantasma", "viejo0") == {"success": False, "error": "Grupo no encontrado"}
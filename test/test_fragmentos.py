@@ -0,0 +1,28 @@
+# Pruebas de la caché de fragmentos HTML
+from src.services.fragmentos import CacheFragmentos
+
+
+def test_fragmento_se_renderiza_una_vez_por_version_y_rol():
+    fragmentos = CacheFragmentos()
+    grupo = {"id_grupo": "club_cine", "nombre": "Club Cine", "integrantes": ["ana@unal.edu.co"]}
+
+    def tarjeta(rol, datos, version):
+        return fragmentos.obtener("grupo", datos["id_grupo"], rol, version, lambda: f"<article>{datos['nombre']} {rol}</article>")
+
+    assert tarjeta("miembro", grupo, "s1") == "<article>Club Cine miembro</article>"
+    assert tarjeta("miembro", grupo, "s1") == "<article>Club Cine miembro</article>"
+    assert fragmentos.renderizados == 1
+
+    # Otro rol muestra otros botones: es otro fragmento
+    assert tarjeta("externo", grupo, "s1") == "<article>Club Cine externo</article>"
+    assert fragmentos.renderizados == 2
+
+    # Una escritura en el grupo cambia su sello y se vuelve a renderizar
+    assert tarjeta("miembro", {**grupo, "nombre": "Cineclub"}, "s2") == "<article>Cineclub miembro</article>"
+    assert fragmentos.renderizados == 3
+    assert fragmentos.estadisticas()["aciertos"] == 1
+
+    # Sin sello no se guarda nada
+    tarjeta("miembro", grupo, None)
+    tarjeta("miembro", grupo, None)
+    assert fragmentos.renderizados == 5
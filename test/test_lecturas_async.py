@@ -0,0 +1,52 @@
+# Pruebas de las lecturas async: las lecturas independientes se esperan juntas
+import asyncio
+import time
+
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.services.unidad_trabajo import UnidadDeTrabajo
+from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+LATENCIA = 0.05
+
+
+def _servicio():
+    backend = BackendMemoria()
+    service = FirebaseService(backend)
+    vm = GruposViewModel(service)
+    for i in range(6):
+        vm.crear_grupo(f"Club {i}", "", "Ciencia", ["ana@unal.edu.co"])
+        EventosViewModel(service).crear_evento(f"club_{i}", "2999-01-01", "10:00", f"Evento {i}", "ana@unal.edu.co")
+    backend.latencia = LATENCIA
+    return service
+
+
+def test_grupos_del_usuario_en_paralelo():
+    service = _servicio()
+    vm = UsuarioViewModel(UnidadDeTrabajo(service))
+
+    inicio = time.perf_counter()
+    usuario, grupos = asyncio.run(vm.obtener_perfil_async("ana@unal.edu.co"))
+    transcurrido = time.perf_counter() - inicio
+
+    assert usuario is None  # no está registrado, pero sus grupos sí existen
+    assert sorted(g["id_grupo"] for g in grupos) == [f"club_{i}" for i in range(6)]
+    # Índice y luego los 6 grupos a la vez: ~2 latencias en lugar de 8
+    assert transcurrido < 5 * LATENCIA
+
+
+def test_eventos_del_usuario_async_igual_que_sincrono():
+    service = _servicio()
+    vm = EventosViewModel(service)
+    # La versión síncrona tampoco lee grupo por grupo: índice y luego eventos y nombres a la vez
+    inicio = time.perf_counter()
+    esperados = vm.obtener_eventos_por_usuario("ana@unal.edu.co")
+    assert time.perf_counter() - inicio < 5 * LATENCIA
+    assert esperados
+
+    inicio = time.perf_counter()
+    eventos = asyncio.run(vm.obtener_eventos_por_usuario_async("ana@unal.edu.co"))
+    assert time.perf_counter() - inicio < 5 * LATENCIA
+    assert eventos == esperados
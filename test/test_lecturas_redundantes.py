@@ -0,0 +1,64 @@
+# Pruebas del detector de lecturas redundantes (N+1, lecturas repetidas y presupuesto)
+import asyncio
+import logging
+
+import pytest
+
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.services.lecturas_redundantes import DetectorLecturas, PresupuestoExcedido
+from src.viewmodel.auth_viewmodel import UsuarioAuthViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.perfil_viewmodel import PerfilViewModel
+
+
+def _servicio_con_grupos(cantidad):
+    service = FirebaseService(BackendMemoria())
+    detector = DetectorLecturas(umbral_hermanas=5)
+    service.observar_llamadas(detector)
+    grupos_vm = GruposViewModel(service)
+    for i in range(cantidad):
+        grupos_vm.crear_grupo(f"Club {i}", "Descripción", "Cultura", ["ana@unal.edu.co"])
+    return service, detector, grupos_vm
+
+
+def test_rafaga_de_rutas_hermanas_indica_el_metodo_del_viewmodel(caplog):
+    service, detector, grupos_vm = _servicio_con_grupos(6)
+
+    with caplog.at_level(logging.WARNING, logger="lecturas_redundantes"):
+        with detector.vigilar("N+1") as registro:
+            for i in range(6):
+                grupos_vm.obtener_grupo(f"club_{i}")
+
+    assert {"tipo": "rafaga_hermanas", "origen": "GruposViewModel.obtener_grupo",
+            "patron": "grupos/*", "lecturas": 6} in registro.avisos
+    assert '"tipo": "rafaga_hermanas"' in caplog.text
+
+
+def test_lectura_repetida_y_origen_async():
+    service, detector, _ = _servicio_con_grupos(1)
+    UsuarioAuthViewModel(service).registrar_usuario("Ana", "ana@unal.edu.co", "12345678", "Sistemas")
+    perfiles = PerfilViewModel(service)
+
+    with detector.vigilar("repetida") as registro:
+        service.obtener_datos("grupos/club_0/nombre")
+        asyncio.run(perfiles.obtener_perfil_async("ana@unal.edu.co"))
+
+    repetidas = [a for a in registro.avisos if a["tipo"] == "lectura_repetida"]
+    assert repetidas == [{
+        "tipo": "lectura_repetida", "operacion": "obtener", "ruta": "grupos/club_0/nombre", "veces": 2,
+        "origenes": ["PerfilViewModel.obtener_perfil_async", "test_lecturas_redundantes:test_lectura_repetida_y_origen_async"],
+    }]
+
+
+def test_presupuesto_excedido_falla_en_modo_estricto():
+    service, detector, grupos_vm = _servicio_con_grupos(3)
+
+    with detector.vigilar("dentro", presupuesto=1):
+        grupos_vm.obtener_grupo("club_0")
+    with pytest.raises(PresupuestoExcedido, match="3 llamadas al backend"):
+        with detector.vigilar("fuera", presupuesto=2):
+            for i in range(3):
+                grupos_vm.obtener_grupo(f"club_{i}")
+    # Fuera de un bloque vigilado no se registra nada
+    grupos_vm.obtener_grupo("club_1")
@@ -0,0 +1,54 @@
+# Pruebas del límite de tasa (cubetas de tokens) y del tope de concurrencia
+from src.services.limitador import LimiteConcurrencia, LimitadorTasa
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_cubeta_permite_rafaga_y_recupera_tokens():
+    reloj = Reloj()
+    limitador = LimitadorTasa(reloj=reloj)
+    claves = ["ip:1.2.3.4", "correo:ana@unal.edu.co"]
+
+    # Ráfaga de 3, luego 1 token cada 10 segundos
+    for _ in range(3):
+        assert limitador.permitir("auth", claves, 3, 0.1) == (True, 0)
+    assert limitador.permitir("auth", claves, 3, 0.1) == (False, 10)
+
+    reloj.ahora = 10.0
+    assert limitador.permitir("auth", claves, 3, 0.1)[0]
+    # Otra IP con el mismo correo también queda limitada por la cubeta del correo
+    assert not limitador.permitir("auth", ["ip:5.6.7.8", "correo:ana@unal.edu.co"], 3, 0.1)[0]
+    assert limitador.estadisticas()["rechazadas"] == {"auth": 2}
+
+
+def test_rechazo_no_gasta_tokens_de_las_otras_cubetas():
+    limitador = LimitadorTasa(reloj=Reloj())
+    # El correo se queda sin tokens desde otra IP
+    assert limitador.permitir("auth", ["ip:1.1.1.1", "correo:ana@unal.edu.co"], 1, 0.1)[0]
+
+    # Los rechazos por el correo no consumen la cubeta de la IP nueva
+    for _ in range(3):
+        assert not limitador.permitir("auth", ["ip:2.2.2.2", "correo:ana@unal.edu.co"], 1, 0.1)[0]
+    assert limitador.permitir("auth", ["ip:2.2.2.2", "correo:luis@unal.edu.co"], 1, 0.1) == (True, 0)
+
+
+def test_cubetas_limitadas_en_memoria():
+    limitador = LimitadorTasa(max_claves=2)
+    for i in range(5):
+        limitador.permitir("auth", [f"ip:{i}"], 1, 1.0)
+    assert limitador.estadisticas()["cubetas"] == 2
+
+
+def test_tope_de_concurrencia():
+    limite = LimiteConcurrencia(2)
+    assert limite.entrar() and limite.entrar()
+    assert not limite.entrar()
+    limite.salir()
+    assert limite.entrar()
+    assert limite.estadisticas() == {"maximo": 2, "activas": 2, "pico": 2, "admitidas": 3, "rechazadas": 1}
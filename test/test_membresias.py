@@ -0,0 +1,102 @@
+# Pruebas del índice inverso de membresías (membresias/{correo_key}/{id_grupo})
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+ANA = "ana@unal.edu.co"
+LUIS = "luis@unal.edu.co"
+
+
+def crear_vms():
+    service = FirebaseService(BackendMemoria())
+    return service, GruposViewModel(service), UsuarioViewModel(service)
+
+
+def test_indice_se_mantiene_con_las_operaciones():
+    service, grupos_vm, usuario_vm = crear_vms()
+    grupos_vm.crear_grupo("Club Ajedrez", "Partidas", "Cultura", [ANA])
+    grupos_vm.crear_grupo("Club Robótica", "Robots", "Tecnología", [ANA])
+    grupos_vm.agregar_integrante("club_ajedrez", LUIS)
+
+    assert grupos_vm.ids_grupos_de_usuario(ANA) == {"club_ajedrez": "organizador", "club_robótica": "organizador"}
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {"club_ajedrez": "miembro"}
+
+    usuario_vm.cambiar_rol_usuario(LUIS, "club_ajedrez", "organizador")
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {"club_ajedrez": "organizador"}
+
+    # consultar_grupos_usuario solo lee el índice y los grupos del usuario
+    service.backend.reiniciar_contadores()
+    nombres = [g["nombre"] for g in usuario_vm.consultar_grupos_usuario(ANA)]
+    assert sorted(nombres) == ["Club Ajedrez", "Club Robótica"]
+    assert ("obtener", "grupos") not in service.backend.llamadas_por_ruta
+
+    grupos_vm.remover_integrante("club_ajedrez", LUIS)
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {}
+
+    grupos_vm.eliminar_grupo("club_robótica")
+    assert grupos_vm.ids_grupos_de_usuario(ANA) == {"club_ajedrez": "organizador"}
+
+
+def test_reconstruir_indice_y_eliminar_usuario():
+    service, grupos_vm, usuario_vm = crear_vms()
+    # Datos anteriores al índice: grupos sin membresías registradas
+    service.guardar_datos("grupos/club_cine", {
+        "id_grupo": "club_cine", "nombre": "Club Cine", "descripcion": "", "categoria": "Cultura",
+        "organizadores": [ANA, LUIS], "integrantes": [ANA, LUIS],
+    })
+    assert grupos_vm.reconstruir_indice_membresias() == 2
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {"club_cine": "organizador"}
+    # Las listas antiguas pasan a mapas {correo_key: correo}
+    assert grupos_vm.migrar_integrantes_a_mapas() == 1
+    assert grupos_vm.migrar_integrantes_a_mapas() == 0
+
+    usuario_vm.eliminar_usuario(LUIS)
+    assert service.obtener_datos("grupos/club_cine/integrantes") == {"ana_at_unal_dot_edu_dot_co": ANA}
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {}
+
+
+def test_actualizaciones_parciales():
+    service, grupos_vm, usuario_vm = crear_vms()
+    grupos_vm.crear_grupo("Club Ajedrez", "Partidas", "Cultura", [ANA])
+    service.guardar_datos("usuarios/ana_at_unal_dot_edu_dot_co", {"correo": ANA, "nombre_completo": "Ana", "carrera": "X",
+                                                              "contraseña": "12345678", "id_usuario": "1"})
+    service.backend.reiniciar_contadores()
+
+    grupos_vm.actualizar_grupo("club_ajedrez", nombre="Club de Ajedrez", descripcion="Partidas")
+    usuario_vm.actualizar_usuario(ANA, carrera="Física")
+    grupos_vm.agregar_integrante("club_ajedrez", LUIS)
+
+    escrituras = {clave: n for clave, n in service.backend.llamadas_por_ruta.items() if clave[0] != "obtener"}
+    assert escrituras == {
+        # grupo, usuario y unión (hijo en integrantes + índice de membresías):
+        # cada uno una escritura multi-ruta con su sello de versión, sin transacciones
+        ("actualizar_parcial", ""): 3,
+    }
+    assert service.obtener_datos("grupos/club_ajedrez/nombre") == "Club de Ajedrez"
+    assert service.obtener_datos("usuarios/ana_at_unal_dot_edu_dot_co/carrera") == "Física"
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {"club_ajedrez": "miembro"}
+
+
+def test_eliminar_organizador_en_una_sola_escritura():
+    service, grupos_vm, usuario_vm = crear_vms()
+    for i in range(4):
+        grupos_vm.crear_grupo(f"Club {i}", "", "Ciencia", [ANA])
+        grupos_vm.agregar_integrante(f"club_{i}", LUIS)
+    EventosViewModel(service).crear_evento("club_0", "2999-01-01", "10:00", "Charla", ANA)
+    usuario_vm.cambiar_rol_usuario(LUIS, "club_3", "organizador")
+    service.backend.reiniciar_contadores()
+
+    resultado = usuario_vm.eliminar_usuario(ANA)
+
+    escrituras = {op: n for op, n in service.backend.llamadas.items() if op != "obtener"}
+    assert escrituras == {"actualizar_parcial": 1}
+    # El índice de membresías se lee una sola vez
+    assert service.backend.llamadas_por_ruta[("obtener", "membresias/ana_at_unal_dot_edu_dot_co")] == 1
+    assert sorted(resultado["grupos_eliminados"]) == ["club_0", "club_1", "club_2"]
+    assert resultado["grupos_actualizados"] == ["club_3"]
+    assert service.obtener_datos("eventos") is None
+    assert service.obtener_datos("grupos/club_3/organizadores") == {"luis_at_unal_dot_edu_dot_co": LUIS}
+    assert grupos_vm.ids_grupos_de_usuario(LUIS) == {"club_3": "organizador"}
+    assert grupos_vm.ids_grupos_de_usuario(ANA) == {}
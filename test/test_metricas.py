@@ -0,0 +1,58 @@
+# Pruebas del registro de métricas y de la observación de llamadas a Firebase
+import threading
+
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.services.metricas import MetricasFirebase, RegistroMetricas
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+
+
+def test_histograma_y_contadores_en_formato_texto():
+    registro = RegistroMetricas()
+    registro.describir("latencia_segundos", "histogram", "Latencia.", limites=(0.1, 1.0))
+    registro.describir("visitas_total", "counter", "Visitas.")
+
+    def trabajar():
+        for _ in range(100):
+            registro.incrementar("visitas_total", {"ruta": "clubes"})
+    hilos = [threading.Thread(target=trabajar) for _ in range(4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    for valor in (0.05, 0.5, 3.0):
+        registro.observar("latencia_segundos", valor, {"ruta": "clubes"})
+
+    texto = registro.texto()
+    assert 'visitas_total{ruta="clubes"} 400' in texto
+    assert 'latencia_segundos_bucket{ruta="clubes",le="0.1"} 1' in texto
+    assert 'latencia_segundos_bucket{ruta="clubes",le="1"} 2' in texto
+    assert 'latencia_segundos_bucket{ruta="clubes",le="+Inf"} 3' in texto
+    assert 'latencia_segundos_count{ruta="clubes"} 3' in texto
+
+
+def test_llamadas_a_firebase_por_operacion_y_prefijo():
+    registro = RegistroMetricas()
+    service = FirebaseService(BackendMemoria())
+    service.observar_llamadas(MetricasFirebase(registro), medir_bytes=True)
+
+    grupos_vm = GruposViewModel(service)
+    grupos_vm.crear_grupo("Club Cine", "Películas", "Cultura", ["ana@unal.edu.co"])
+    grupos_vm.obtener_grupo("club_cine")
+    grupos_vm.obtener_grupo("club_cine")
+
+    texto = registro.texto()
+    assert 'firebase_llamadas_segundos_count{operacion="obtener",prefijo="grupos"} 2' in texto
+    assert 'firebase_llamadas_segundos_count{operacion="actualizar_multiples",prefijo="grupos+membresias+versiones"} 1' in texto
+    assert registro.valor("firebase_bytes_total", {"operacion": "obtener", "prefijo": "grupos"}) > 0
+
+
+def test_sin_medir_bytes_no_se_serializa_nada():
+    registro = RegistroMetricas()
+    service = FirebaseService(BackendMemoria())
+    service.observar_llamadas(MetricasFirebase(registro))
+    service.guardar_datos("grupos/club_cine", {"nombre": "Club Cine"})
+    service.obtener_datos("grupos/club_cine")
+
+    assert 'firebase_llamadas_segundos_count{operacion="obtener",prefijo="grupos"} 1' in registro.texto()
+    assert registro.valor("firebase_bytes_total", {"operacion": "obtener", "prefijo": "grupos"}) == 0
@@ -0,0 +1,42 @@
+# Pruebas de los modelos compactos (__slots__ y from_dict perezoso)
+import pytest
+
+from src.model.evento import Evento
+from src.model.grupo import Grupo
+
+ANA = "ana@unal.edu.co"
+
+
+def test_grupo_from_dict_decodifica_listas_al_usarlas():
+    datos = {"id_grupo": "club_cine", "nombre": "Club Cine", "categoria": "Cultura", "organizadores": ANA}
+    grupo = Grupo.from_dict(datos)
+    assert grupo.categoria_clave == "Cultura|club_cine"
+
+    # Un organizador suelto se vuelve lista y los integrantes parten de los organizadores
+    assert list(grupo.organizadores) == [ANA]
+    assert list(grupo.integrantes) == [ANA]
+    assert grupo.eventos == []
+    assert grupo.agregar_integrante("luis@unal.edu.co")
+    assert grupo.to_dict()["integrantes"] == [ANA, "luis@unal.edu.co"]
+    assert Grupo.from_dict(grupo.to_dict()).to_dict() == grupo.to_dict()
+
+
+def test_integrantes_como_mapa_en_firebase():
+    grupo = Grupo("Club Cine", "", "Cultura", [ANA], integrantes=[ANA, "luis@unal.edu.co"])
+    guardado = grupo.to_firebase()
+    assert guardado["integrantes"] == {"ana_at_unal_dot_edu_dot_co": ANA, "luis_at_unal_dot_edu_dot_co": "luis@unal.edu.co"}
+
+    leido = Grupo.from_dict(guardado)
+    assert "luis@unal.edu.co" in leido.integrantes and not leido.es_organizador("luis@unal.edu.co")
+    assert leido.to_dict() == grupo.to_dict()
+    # También se aceptan mapas {correo_key: true}
+    assert list(Grupo.from_dict({"nombre": "X", "organizadores": {"ana_at_unal_dot_edu_dot_co": True}}).organizadores) == [ANA]
+
+
+def test_modelos_sin_dict_por_instancia():
+    grupo = Grupo("Club Cine", "", "Cultura", [ANA])
+    evento = Evento("2999-01-01", "10:00", "Función", ANA)
+    for objeto in (grupo, evento):
+        assert not hasattr(objeto, "__dict__")
+        with pytest.raises(AttributeError):
+            objeto.campo_inexistente = 1
@@ -0,0 +1,57 @@
+# Pruebas de la paginación por cursor y el filtro por categoría del catálogo
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+
+
+def _catalogo():
+    service = FirebaseService(BackendMemoria())
+    vm = GruposViewModel(service)
+    for i in range(7):
+        categoria = "Ciencia" if i % 2 else "Deportes"
+        vm.crear_grupo(f"Club {i}", "", categoria, ["ana@unal.edu.co"])
+    service.backend.reiniciar_contadores()
+    return service, vm
+
+
+def test_paginas_por_cursor_sin_repetir_ni_saltar():
+    service, vm = _catalogo()
+    vistos, cursor = [], None
+    while True:
+        pagina = vm.listar_grupos_pagina(cursor=cursor, tamano=3)
+        vistos += [g["id_grupo"] for g in pagina["grupos"]]
+        cursor = pagina["siguiente"]
+        if not cursor:
+            break
+    assert vistos == [f"club_{i}" for i in range(7)]
+    # Tres páginas, una consulta cada una y ninguna lectura completa de grupos/
+    assert service.backend.llamadas == {"consultar": 3}
+
+
+def test_filtro_por_categoria():
+    _, vm = _catalogo()
+    primera = vm.listar_grupos_pagina("Ciencia", tamano=2)
+    assert [g["id_grupo"] for g in primera["grupos"]] == ["club_1", "club_3"]
+    segunda = vm.listar_grupos_pagina("Ciencia", primera["siguiente"], tamano=2)
+    assert [g["id_grupo"] for g in segunda["grupos"]] == ["club_5"]
+    assert segunda["siguiente"] is None
+
+    # Al cambiar la categoría, el grupo pasa al otro listado
+    vm.actualizar_grupo("club_1", categoria="Deportes")
+    assert "club_1" in [g["id_grupo"] for g in vm.listar_grupos_pagina("Deportes")["grupos"]]
+
+
+def test_completar_categoria_clave_en_grupos_antiguos():
+    service, vm = _catalogo()
+    service.eliminar_datos("grupos/club_0/categoria_clave")
+    assert vm.completar_categoria_clave() == 1
+    assert service.obtener_datos("grupos/club_0/categoria_clave") == "Deportes|club_0"
+
+
+def test_pagina_lista_resumenes_sin_integrantes():
+    _, vm = _catalogo()
+    vm.agregar_integrante("club_0", "luis@unal.edu.co")
+    grupo = vm.listar_grupos_pagina(tamano=1)["grupos"][0]
+    # El listado solo necesita el número de integrantes: no se decodifican ni copian las listas
+    assert "integrantes" not in grupo and "organizadores" not in grupo
+    assert grupo["num_integrantes"] == 2
@@ -0,0 +1,74 @@
+# Pruebas de la vista de perfil en memoria y su invalidación
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.utils.claves import clave_correo
+from src.viewmodel.auth_viewmodel import UsuarioAuthViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.perfil_viewmodel import PerfilViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+ANA = "ana@unal.edu.co"
+
+
+def _preparar():
+    service = FirebaseService(BackendMemoria())
+    UsuarioAuthViewModel(service).registrar_usuario("Ana Pérez", ANA, "12345678", "Física")
+    grupos_vm = GruposViewModel(service)
+    grupos_vm.crear_grupo("Club Cine", "", "Cultura", [ANA])
+    grupos_vm.crear_grupo("Club Coro", "", "Cultura", ["otro@unal.edu.co"])
+    return service, grupos_vm, PerfilViewModel(service)
+
+
+def _lecturas(service):
+    return service.backend.llamadas["obtener"]
+
+
+def test_perfil_repetido_no_lee_la_base_de_datos():
+    service, _, perfiles = _preparar()
+    perfil = perfiles.obtener_perfil(ANA)
+    assert perfil["nombre_completo"] == "Ana Pérez"
+    assert perfil["grupos"] == [{"id_grupo": "club_cine", "nombre": "Club Cine"}]
+    assert "contraseña" not in perfil
+
+    service.backend.reiniciar_contadores()
+    assert perfiles.obtener_perfil(ANA) == perfil
+    assert service.backend.total_llamadas() == 0
+
+
+def test_invalidacion_precisa():
+    service, grupos_vm, perfiles = _preparar()
+    perfiles.obtener_perfil(ANA)
+
+    # Renombrar un grupo que no está en el perfil, o que otro estudiante se una a él, no lo invalida
+    grupos_vm.actualizar_grupo("club_coro", nombre="Coro UNAL")
+    grupos_vm.agregar_integrante("club_coro", "luis@unal.edu.co")
+    service.backend.reiniciar_contadores()
+    perfiles.obtener_perfil(ANA)
+    assert _lecturas(service) == 0
+
+    grupos_vm.actualizar_grupo("club_cine", nombre="Cineclub")
+    assert perfiles.obtener_perfil(ANA)["grupos"][0]["nombre"] == "Cineclub"
+
+    grupos_vm.agregar_integrante("club_coro", ANA)
+    assert len(perfiles.obtener_perfil(ANA)["grupos"]) == 2
+
+    UsuarioViewModel(service).actualizar_usuario(ANA, carrera="Matemáticas")
+    assert perfiles.obtener_perfil(ANA)["carrera"] == "Matemáticas"
+
+
+def test_sello_por_usuario_solo_cambia_para_los_afectados():
+    service, grupos_vm, _ = _preparar()
+
+    def sello(correo):
+        return service.obtener_datos(f"versiones/usuarios/{clave_correo(correo)}")
+
+    antes = sello(ANA)
+    grupos_vm.agregar_integrante("club_coro", "luis@unal.edu.co")
+    grupos_vm.actualizar_grupo("club_coro", descripcion="Canto")
+    assert sello(ANA) == antes
+
+    grupos_vm.actualizar_grupo("club_cine", nombre="Cineclub")
+    assert sello(ANA) != antes
+    antes = sello(ANA)
+    grupos_vm.agregar_integrante("club_coro", ANA)
+    assert sello(ANA) != antes
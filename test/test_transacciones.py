@@ -0,0 +1,85 @@
+# Pruebas de concurrencia: las uniones simultáneas a un grupo no deben perderse
+import threading
+
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+ORGANIZADOR = "org@unal.edu.co"
+
+
+def test_uniones_concurrentes_no_se_pierden():
+    # La latencia hace que las lecturas y escrituras de los hilos se intercalen
+    service = FirebaseService(BackendMemoria(latencia=0.002, jitter=0.003, semilla=7))
+    grupos_vm = GruposViewModel(service)
+    grupos_vm.crear_grupo("Club Popular", "Todos quieren entrar", "Cultura", [ORGANIZADOR])
+
+    correos = [f"estudiante{i}@unal.edu.co" for i in range(20)]
+    barrera = threading.Barrier(len(correos))
+    resultados = []
+
+    def unirse(correo):
+        barrera.wait()
+        resultados.append(GruposViewModel(service).agregar_integrante("club_popular", correo))
+
+    hilos = [threading.Thread(target=unirse, args=(c,)) for c in correos]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    integrantes = service.obtener_datos("grupos/club_popular/integrantes")
+    assert all(resultados)
+    assert sorted(integrantes.values()) == sorted(correos + [ORGANIZADOR])
+    assert all(grupos_vm.ids_grupos_de_usuario(c) == {"club_popular": "miembro"} for c in correos)
+    # Cada unión escribe su propio hijo integrantes/{correo_key}: no hace falta transacción
+    assert service.estadisticas_transacciones() == {}
+
+
+def test_cambio_de_rol_y_salida_concurrentes():
+    service = FirebaseService(BackendMemoria(latencia=0.002, jitter=0.003, semilla=3))
+    grupos_vm = GruposViewModel(service)
+    correos = [f"org{i}@unal.edu.co" for i in range(8)]
+    grupos_vm.crear_grupo("Club Mixto", "", "Ciencia", [ORGANIZADOR])
+    for correo in correos:
+        grupos_vm.agregar_integrante("club_mixto", correo)
+
+    hilos = [threading.Thread(target=UsuarioViewModel(service).cambiar_rol_usuario,
+                              args=(c, "club_mixto", "organizador")) for c in correos]
+    hilos.append(threading.Thread(target=grupos_vm.remover_integrante, args=("club_mixto", "nadie@unal.edu.co")))
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert sorted(service.obtener_datos("grupos/club_mixto/organizadores").values()) == sorted(correos + [ORGANIZADOR])
+    # Los cambios de rol pasan por la transacción sobre organizadores
+    assert service.estadisticas_transacciones()["grupos/club_mixto/organizadores"]["confirmadas"] == len(correos)
+
+
+def test_salidas_concurrentes_no_dejan_el_grupo_sin_organizadores():
+    service = FirebaseService(BackendMemoria(latencia=0.002, jitter=0.003, semilla=5))
+    correos = [f"org{i}@unal.edu.co" for i in range(5)]
+    GruposViewModel(service).crear_grupo("Club Directivo", "", "Ciencia", correos)
+
+    barrera = threading.Barrier(len(correos))
+    resultados = []
+
+    def salir(correo):
+        barrera.wait()
+        resultados.append(GruposViewModel(service).remover_integrante("club_directivo", correo))
+
+    hilos = [threading.Thread(target=salir, args=(c,)) for c in correos]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    # Todos leyeron cinco organizadores, pero solo cuatro pudieron salir
+    assert sorted(resultados) == [False] + [True] * 4
+    quedan = list(service.obtener_datos("grupos/club_directivo/organizadores").values())
+    assert len(quedan) == 1
+    assert list(service.obtener_datos("grupos/club_directivo/integrantes").values()) == quedan
+    estadisticas = service.estadisticas_transacciones()["grupos/club_directivo/organizadores"]
+    assert estadisticas["confirmadas"] == 4 and estadisticas["conflictos"] >= 1
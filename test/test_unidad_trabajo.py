@@ -0,0 +1,88 @@
+# Pruebas de la unidad de trabajo por request (lecturas deduplicadas, escrituras agrupadas)
+from src.model.grupo import Grupo
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.services.unidad_trabajo import UnidadDeTrabajo
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+
+def _servicio():
+    service = FirebaseService(BackendMemoria())
+    GruposViewModel(service).crear_grupo("Club Ajedrez", "Partidas", "Cultura", ["ana@unal.edu.co"])
+    service.backend.reiniciar_contadores()
+    return service
+
+
+def test_lecturas_deduplicadas_y_objeto_compartido():
+    service = _servicio()
+    unidad = UnidadDeTrabajo(service)
+
+    grupo = GruposViewModel(unidad).obtener_grupo("club_ajedrez")
+    assert GruposViewModel(unidad).obtener_grupo("club_ajedrez") is grupo
+    # Las rutas hijas se sirven desde la lectura del grupo
+    assert unidad.obtener_datos("grupos/club_ajedrez/nombre") == "Club Ajedrez"
+    assert service.backend.llamadas["obtener"] == 1
+
+
+def test_escrituras_se_confirman_juntas():
+    service = _servicio()
+    unidad = UnidadDeTrabajo(service)
+    vm = GruposViewModel(unidad)
+
+    vm.actualizar_grupo("club_ajedrez", nombre="Club de Ajedrez")
+    unidad.guardar_datos("usuarios/x", {"correo": "x@unal.edu.co"})
+    # Se leen los valores escritos aunque aún no estén en el backend
+    assert vm.obtener_grupo("club_ajedrez").nombre == "Club de Ajedrez"
+    assert service.backend.exportar()["grupos"]["club_ajedrez"]["nombre"] == "Club Ajedrez"
+
+    unidad.confirmar()
+    assert service.backend.llamadas["actualizar_parcial"] == 1
+    assert service.obtener_datos("grupos/club_ajedrez/nombre") == "Club de Ajedrez"
+    assert not unidad.hay_pendientes()
+
+
+def test_transaccion_envia_lo_pendiente_antes():
+    service = _servicio()
+    unidad = UnidadDeTrabajo(service)
+    GruposViewModel(unidad).agregar_integrante("club_ajedrez", "beto@unal.edu.co")
+    # El cambio de rol es una transacción: ve a beto aunque su unión aún estaba pendiente
+    UsuarioViewModel(unidad).cambiar_rol_usuario("beto@unal.edu.co", "club_ajedrez", "organizador")
+    UsuarioViewModel(unidad).cambiar_rol_usuario("ana@unal.edu.co", "club_ajedrez", "miembro")
+    unidad.guardar_datos("grupos/club_ajedrez/descripcion", "Torneos")
+    # La transacción trabaja sobre lo ya escrito en el request
+    unidad.transaccion("grupos/club_ajedrez/descripcion", lambda descripcion: descripcion + " semanales")
+    assert not unidad.hay_pendientes()
+
+    grupo = Grupo.from_dict(service.obtener_datos("grupos/club_ajedrez"))
+    assert grupo.descripcion == "Torneos semanales"
+    assert list(grupo.integrantes) == ["ana@unal.edu.co", "beto@unal.edu.co"]
+    assert list(grupo.organizadores) == ["beto@unal.edu.co"]
+
+    # Descartar no envía nada
+    unidad.guardar_datos("grupos/club_ajedrez/descripcion", "Otra")
+    unidad.descartar()
+    assert service.obtener_datos("grupos/club_ajedrez/descripcion") == "Torneos semanales"
+
+
+def test_fallo_al_escribir_se_informa_sin_error_500(monkeypatch):
+    import app as aplicacion
+
+    def falla(cambios):
+        raise ConnectionError("Firebase no responde")
+
+    cliente = aplicacion.app.test_client()
+    assert cliente.post("/registro", data={"name": "Eva", "correo": "eva@unal.edu.co",
+                                           "password": "12345678", "carrera": "Física"}).status_code == 302
+    monkeypatch.setattr(aplicacion.firebase_global, "actualizar_multiples", falla)
+
+    respuesta = cliente.post("/clubes/crear", data={"nombre": "Club Fallido", "categoria": "Cultura"})
+    assert respuesta.status_code == 302
+    with cliente.session_transaction() as sesion:
+        mensajes = [mensaje for _, mensaje in sesion.get("_flashes", [])]
+    assert any("No se pudo crear el grupo" in m for m in mensajes)
+    assert "Grupo creado." not in mensajes
+
+    # Lo que no se pudo escribir no queda pendiente ni llega a la base
+    monkeypatch.undo()
+    assert aplicacion.firebase_global.obtener_datos("grupos/club_fallido") is None
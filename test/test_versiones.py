@@ -0,0 +1,36 @@
+# Pruebas de los sellos de versión usados para los ETag de las páginas
+from src.services.backend_memoria import BackendMemoria
+from src.services.firebase import FirebaseService
+from src.services.versiones import leer_versiones
+from src.viewmodel.eventos_viewmodel import EventosViewModel
+from src.viewmodel.grupos_viewmodel import GruposViewModel
+from src.viewmodel.usuarios_viewmodel import UsuarioViewModel
+
+ANA = "ana@unal.edu.co"
+
+
+def test_cada_escritura_cambia_la_version():
+    service = FirebaseService(BackendMemoria())
+    grupos_vm = GruposViewModel(service)
+    grupos_vm.crear_grupo("Club Cine", "", "Cultura", [ANA])
+    grupos_vm.crear_grupo("Club Coro", "", "Cultura", [ANA])
+
+    def versiones():
+        return leer_versiones(service, "catalogo", "grupos/club_cine", "grupos/club_coro")
+
+    operaciones = [
+        lambda: grupos_vm.actualizar_grupo("club_cine", descripcion="Películas"),
+        lambda: grupos_vm.agregar_integrante("club_cine", "luis@unal.edu.co"),
+        lambda: UsuarioViewModel(service).cambiar_rol_usuario("luis@unal.edu.co", "club_cine", "organizador"),
+        lambda: EventosViewModel(service).crear_evento("club_cine", "2999-01-01", "10:00", "Función", ANA),
+        lambda: grupos_vm.remover_integrante("club_cine", "luis@unal.edu.co"),
+    ]
+    for operacion in operaciones:
+        catalogo, cine, coro = versiones()
+        operacion()
+        nuevo_catalogo, nuevo_cine, nuevo_coro = versiones()
+        assert nuevo_catalogo != catalogo and nuevo_cine != cine
+        assert nuevo_coro == coro  # los demás grupos conservan su versión
+
+    grupos_vm.eliminar_grupo("club_cine")
+    assert leer_versiones(service, "grupos/club_cine") == [None]